@@ -0,0 +1,76 @@
+"""
+Sessions per GB Benchmark
+
+Opens N concurrent sessions on the base URL, once as one browser per session and once as browser contexts of a
+single browser, and reports the resident memory of the whole chromedriver process tree for each layout.
+
+Usage: python benchmarks/bench_sessions_per_gb.py [--sessions 8] [--local-site]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.memory_watchdog import MemoryWatchdog
+from utils.webdriver_manager import WebDriverManager
+
+
+def load_config():
+    with open(Path(__file__).resolve().parent.parent / 'config' / 'config.json') as f:
+        return json.load(f)
+
+
+def measure(config, sessions, url, contexts):
+    config = dict(config, browser_contexts={'enabled': contexts, 'contexts_per_browser': sessions})
+    manager = WebDriverManager(config)
+    started_at = time.perf_counter()
+    drivers = []
+    try:
+        for _ in range(sessions):
+            driver = manager.contexts.acquire() if contexts else manager.acquire_driver()
+            driver.get(url)
+            drivers.append(driver)
+        startup_s = time.perf_counter() - started_at
+        # Give renderers a moment to settle before sampling
+        time.sleep(2)
+        rss_mb = MemoryWatchdog(config).process_tree_mb(manager.chromedriver_pid)
+    finally:
+        for driver in drivers:
+            if contexts:
+                driver.quit()
+            else:
+                manager.retire_driver(driver)
+        manager.shutdown()
+    return rss_mb, startup_s
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, default=8, help='concurrent sessions per layout')
+    parser.add_argument('--local-site', action='store_true', help='use the local SauceDemo stand-in')
+    args = parser.parse_args()
+
+    config = load_config()
+    site = None
+    if args.local_site:
+        from utils.local_site import LocalSite
+        site = LocalSite(config['users']).start()
+    url = site.url if site else config['base_url']
+
+    try:
+        print(f"{'layout':<24} {'RSS (MB)':>10} {'MB/session':>11} {'sessions/GB':>12} {'startup (s)':>12}")
+        for label, contexts in (('browser per session', False), ('contexts in one browser', True)):
+            rss_mb, startup_s = measure(config, args.sessions, url, contexts)
+            per_session = rss_mb / args.sessions
+            print(f"{label:<24} {rss_mb:>10.0f} {per_session:>11.1f} {1024 / per_session:>12.1f} {startup_s:>12.1f}")
+    finally:
+        if site:
+            site.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Startup Benchmark
+
+Measures what every pytest process (the controller and each xdist worker) pays before the first test:
+  - import time of conftest and the utils/pages packages, in a fresh interpreter
+  - `pytest --collect-only` wall time, with N collections running side by side like N xdist workers
+
+Usage: python benchmarks/bench_startup.py [--workers 4] [--repeat 3] [--budget-ms 2000]
+Exits non-zero when the median collection time exceeds --budget-ms, so it can guard against regressions.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+IMPORTED_MODULES = ('conftest', 'utils', 'pages', 'tests.test_form_submission')
+
+# addopts is cleared to skip the HTML report; the plugins pytest.ini disables are disabled here too
+COLLECT_COMMAND = [
+    sys.executable, '-m', 'pytest', '--collect-only', '-q',
+    '-p', 'no:cacheprovider', '-p', 'no:faker', '-o', 'addopts=',
+]
+
+
+def import_times(module):
+    # -X importtime reports cumulative microseconds per module on stderr
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line.split('|')
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+def collect_ms():
+    started_at = time.perf_counter()
+    subprocess.run(COLLECT_COMMAND, cwd=PROJECT_ROOT, capture_output=True, check=True)
+    return (time.perf_counter() - started_at) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=4, help='collections run concurrently')
+    parser.add_argument('--repeat', type=int, default=3, help='rounds of concurrent collections')
+    parser.add_argument('--budget-ms', type=float, default=None, help='fail when median collection exceeds this')
+    args = parser.parse_args()
+
+    print("import time (ms, cumulative):")
+    for module in IMPORTED_MODULES:
+        times = import_times(module)
+        # A package's cost is its most expensive entry, e.g. selenium.webdriver rather than selenium itself
+        heavy = {}
+        for package in ('selenium', 'PIL', 'numpy', 'faker'):
+            costs = [ms for name, ms in times.items() if name == package or name.startswith(package + '.')]
+            if costs:
+                heavy[package] = max(costs)
+        loaded = ', '.join(f"{name} {ms:.0f}" for name, ms in sorted(heavy.items(), key=lambda item: -item[1]))
+        loaded = loaded or 'none'
+        print(f"  {module:<28} {times.get(module, 0.0):>7.1f}   heavy dependencies loaded: {loaded}")
+
+    samples = []
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        for _ in range(args.repeat):
+            samples.extend(executor.map(lambda _: collect_ms(), range(args.workers)))
+
+    median = statistics.median(samples)
+    print(f"collection per worker (ms, {args.workers} concurrent x {args.repeat}): "
+          f"median={median:.0f} min={min(samples):.0f} max={max(samples):.0f}")
+
+    if args.budget_ms is not None and median > args.budget_ms:
+        print(f"collection median {median:.0f} ms exceeds budget {args.budget_ms:.0f} ms")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Step Log Benchmark
+
+Per-step overhead of the page-object logging, with the INFO level enabled as in a verbose run:
+  - logger    an f-string logger.info per step through a formatted StreamHandler (the previous behaviour)
+  - step log  step_log.record into the ring buffer, formatted only when emitted
+  - none      no logging at all (baseline)
+
+The cost of emitting the buffer for a failed test is reported separately.
+
+Usage: python benchmarks/bench_step_log.py [--steps 100000]
+"""
+
+import argparse
+import io
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.step_log import StepLog
+
+
+LOCATOR = ('id', 'add-to-cart-sauce-labs-backpack')
+
+
+def with_logger(steps, logger, step_log):
+    for _ in range(steps):
+        started_at = time.perf_counter()
+        logger.info(f"Clicked element: {LOCATOR}")
+        time.perf_counter() - started_at
+
+
+def with_step_log(steps, logger, step_log):
+    for _ in range(steps):
+        started_at = time.perf_counter()
+        step_log.record('ProductsPage', 'click', LOCATOR, None, (time.perf_counter() - started_at) * 1000)
+
+
+def without_logging(steps, logger, step_log):
+    for _ in range(steps):
+        started_at = time.perf_counter()
+        time.perf_counter() - started_at
+
+
+def measure(mode, steps, logger, step_log):
+    started_at = time.perf_counter()
+    mode(steps, logger, step_log)
+    return (time.perf_counter() - started_at) / steps * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--steps', type=int, default=100000, help='simulated page-object steps')
+    args = parser.parse_args()
+
+    handler = logging.StreamHandler(io.StringIO())
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    logger = logging.getLogger('bench.pages')
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    step_log = StepLog()
+    step_log.logger = logger
+
+    print(f"{'mode':<10} {'ns per step':>12}")
+    for name, mode in (('logger', with_logger), ('step log', with_step_log), ('none', without_logging)):
+        print(f"{name:<10} {measure(mode, args.steps, logger, step_log):>12.0f}")
+
+    # A failed test formats its buffer once
+    started_at = time.perf_counter()
+    lines = step_log.emit('Steps of failed test')
+    print(f"emit {len(lines)} buffered steps: {(time.perf_counter() - started_at) * 1000:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
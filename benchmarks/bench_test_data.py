@@ -0,0 +1,64 @@
+"""
+Test Data Generation Benchmark
+
+Compares the cost per record of generate_checkout_data and generate_person_data for:
+  - per-test    a new TestDataGenerator with its own Faker for every test (the previous behaviour)
+  - cached      the locale's shared Faker, reseeded per test through a random.Random of the test's own
+  - pooled      records handed out from the pre-generated columnar pool
+
+Usage: python benchmarks/bench_test_data.py [--tests 50] [--records 4]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from faker import Faker
+from utils.test_data_generator import TestDataGenerator
+
+
+def per_test(data_type, nodeid):
+    generator = TestDataGenerator(faker=Faker('en_US'))
+    return getattr(generator, f'generate_{data_type}_data')
+
+
+def cached(data_type, nodeid):
+    return getattr(TestDataGenerator.for_test(nodeid), f'generate_{data_type}_data')
+
+
+def pooled(data_type, nodeid):
+    return getattr(TestDataGenerator.for_test(nodeid, pooled=True), f'generate_{data_type}_data')
+
+
+def measure(mode, data_type, tests, records):
+    started_at = time.perf_counter()
+    for test in range(tests):
+        generate = mode(data_type, f"tests/test_bench.py::test_{test}")
+        for _ in range(records):
+            generate()
+    return (time.perf_counter() - started_at) / (tests * records) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tests', type=int, default=50, help='simulated tests')
+    parser.add_argument('--records', type=int, default=4, help='records generated per test')
+    args = parser.parse_args()
+
+    # Pool fill is a once-per-worker cost; reported separately from the per-record figures
+    for data_type in ('checkout', 'person'):
+        started_at = time.perf_counter()
+        TestDataGenerator(pooled=True).iter_bulk_data(data_type, 1).__next__()
+        print(f"{data_type} pool fill: {(time.perf_counter() - started_at) * 1000:.0f} ms")
+
+    print(f"{'data type':<10} {'per-test':>12} {'cached':>12} {'pooled':>12}   (us per record)")
+    for data_type in ('checkout', 'person'):
+        timings = [measure(mode, data_type, args.tests, args.records) for mode in (per_test, cached, pooled)]
+        print(f"{data_type:<10} " + ' '.join(f"{timing:>12.1f}" for timing in timings))
+
+
+if __name__ == '__main__':
+    main()
@@ -3,9 +3,11 @@ Pytest Configuration and Fixtures
 """
 
 import pytest
+import base64
 import json
 import os
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
 
@@ -14,8 +16,31 @@ project_root = Path(__file__).parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
-from utils.webdriver_manager import WebDriverManager
-from utils.screenshot_helper import ScreenshotHelper
+# Selenium, Pillow, NumPy and the browser launch code are imported by the fixtures that need them, so the xdist
+# controller loads none of them; collecting the test modules still imports the page objects and selenium.webdriver
+from utils.command_counter import CommandCounter
+from utils.driver_profiler import DriverProfiler
+from utils.wait_timings import wait_timings, ready_timings
+from utils.session_stats import SessionStats
+
+
+# Statistics collected during the session and reported in the terminal summary
+session_stats = SessionStats()
+
+driver_manager_key = pytest.StashKey()
+screenshot_writer_key = pytest.StashKey()
+failure_collector_key = pytest.StashKey()
+lpt_scheduler_key = pytest.StashKey()
+impact_recorder_key = pytest.StashKey()
+impact_summary_key = pytest.StashKey()
+
+# Setup + call + teardown seconds per test of this run, folded into the duration history at session end
+test_durations = {}
+
+# Project functions and constants each test ran through (with --record-impact), saved to the test impact index
+impact_records = {}
+# Files whose code ran while setting up fixtures shared between tests; a change to one of them runs every test
+impact_shared = set()
 
 
 def load_config():
@@ -24,43 +49,421 @@ def load_config():
         return json.load(f)
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        '--local-site',
+        action='store_true',
+        default=False,
+        help='Run against a local SauceDemo stand-in server instead of base_url from config.json'
+    )
+    parser.addoption(
+        '--update-baselines',
+        action='store_true',
+        default=False,
+        help='Overwrite visual baselines with the screenshots taken in this run'
+    )
+    parser.addoption(
+        '--step-log',
+        action='store_true',
+        default=False,
+        help='Emit the page-object step log for every test, not only for failed ones'
+    )
+    parser.addoption(
+        '--lpt-schedule',
+        action='store_true',
+        default=False,
+        help='With -n, hand out tests longest first based on the duration history'
+    )
+    parser.addoption(
+        '--affected-since',
+        metavar='REF',
+        default=None,
+        help='Run only the tests affected by changes since the git ref, according to the test impact index'
+    )
+    parser.addoption(
+        '--record-impact',
+        action='store_true',
+        default=False,
+        help='Record which page objects, locators and utils each test uses into the test impact index'
+    )
+
+
 @pytest.fixture(scope='session')
-def config():
-    return load_config()
+def local_site():
+    from utils.local_site import LocalSite
+    site = LocalSite(load_config()['users']).start()
+    yield site
+    site.stop()
+
+
+@pytest.fixture(scope='session')
+def config(request):
+    config = load_config()
+    if request.config.getoption('local_site'):
+        config['base_url'] = request.getfixturevalue('local_site').url
+    return config
+
+
+def _runs_tests(config):
+    # The xdist controller and --collect-only runs never need a browser
+    if config.option.collectonly:
+        return False
+    return hasattr(config, 'workerinput') or not getattr(config.option, 'numprocesses', None)
+
+
+def pytest_collection(session):
+    # Warm browsers start while the tests are still being collected
+    if _runs_tests(session.config):
+        from utils.webdriver_manager import WebDriverManager
+        manager = WebDriverManager(load_config(), session_stats)
+        manager.start_prespawn()
+        session.config.stash[driver_manager_key] = manager
+
+
+def pytest_collection_modifyitems(config, items):
+    ref = config.getoption('affected_since')
+    if ref:
+        from utils.test_impact import ImpactSelector
+        selected, deselected, summary = ImpactSelector.from_config(project_root, load_config()).select(items, ref)
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+        config.stash[impact_summary_key] = summary
+
+    # Only workers see markers; one of them passes the estimates to the controller's scheduler through the cache
+    workerinput = getattr(config, 'workerinput', None)
+    if config.getoption('lpt_schedule') and workerinput and workerinput['workerid'] == 'gw0':
+        from utils.duration_history import DurationHistory
+        history = DurationHistory.from_config(project_root, load_config())
+        config.cache.set('duration_history/estimates', history.estimates(items))
+
+
+def pytest_report_collectionfinish(config, items):
+    summary = config.stash.get(impact_summary_key, None)
+    return f"test impact: {summary}" if summary else None
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    recorder = item.config.stash.get(impact_recorder_key, None)
+    if recorder is None:
+        yield
+        return
+    recorder.start()
+    try:
+        yield
+    finally:
+        impact_records[item.nodeid] = recorder.stop()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_setup(fixturedef, request):
+    recorder = request.config.stash.get(impact_recorder_key, None)
+    if recorder is None or fixturedef.scope == 'function':
+        yield
+        return
+    recorder.start_shared()
+    try:
+        yield
+    finally:
+        impact_shared.update(recorder.stop_shared())
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    if not config.getoption('lpt_schedule'):
+        return None
+    from utils.duration_history import DurationHistory
+    from utils.lpt_scheduling import LPTScheduling
+
+    def load_estimates(nodeids):
+        history = DurationHistory.from_config(project_root, load_config())
+        cached = config.cache.get('duration_history/estimates', {})
+        return {nodeid: cached.get(nodeid, history.estimate(nodeid)) for nodeid in nodeids}
+
+    scheduler = LPTScheduling(config, log, load_estimates=load_estimates)
+    config.stash[lpt_scheduler_key] = scheduler
+    return scheduler
+
+
+@pytest.fixture(scope='session')
+def driver_manager(request, config):
+    manager = request.config.stash.get(driver_manager_key, None)
+    if manager is None:
+        from utils.webdriver_manager import WebDriverManager
+        manager = WebDriverManager(config, session_stats)
+    yield manager
+    manager.shutdown()
+
+
+@pytest.fixture(scope='session')
+def driver_pool(config, driver_manager):
+    pool_config = config.get('driver_pool', {})
+    if not pool_config.get('enabled', False):
+        yield None
+        return
+
+    from utils.driver_pool import DriverPool
+    pool = DriverPool(
+        driver_manager.acquire_driver,
+        config['base_url'],
+        session_stats,
+        max_tests_per_driver=pool_config.get('max_tests_per_driver', 25),
+        retire_driver=driver_manager.retire_driver,
+        recycle_check=driver_manager.recycle_reason if driver_manager.watchdog is not None else None
+    )
+    yield pool
+    pool.close()
+
+
+def _test_failed(item):
+    reports = (getattr(item, f'rep_{when}', None) for when in ('setup', 'call'))
+    return any(report is not None and report.failed for report in reports)
 
 
 @pytest.fixture(scope='function')
-def driver(config):
+def driver(request, config, driver_manager, driver_pool):
+    acquire_started = time.perf_counter()
+    # @pytest.mark.full_profile opts a test out of the lean profile (e.g. visual checks that need images)
+    full_profile = driver_manager.lean_enabled and request.node.get_closest_marker('full_profile') is not None
+    if driver_pool is not None and not full_profile:
+        driver = driver_pool.acquire()
+        request.node.driver_acquire_ms = (time.perf_counter() - acquire_started) * 1000
+        yield driver
+        driver_manager.record_page_load(driver)
+        # needs_recycle: the failure artifact collector found the browser hung
+        driver_pool.release(driver, failed=_test_failed(request.node) or getattr(driver, 'needs_recycle', False))
+        return
+
     # Initialize WebDriver
-    driver_manager = WebDriverManager(config)
-    driver = driver_manager.get_driver()
+    driver = driver_manager.acquire_driver(lean=False if full_profile else None)
     
     # Maximize window
     driver.maximize_window()
     
     # Navigate to base URL
     driver.get(config['base_url'])
+    request.node.driver_acquire_ms = (time.perf_counter() - acquire_started) * 1000
     
     yield driver
+    driver_manager.record_page_load(driver)
     
-    # Teardown - quit driver
-    driver.quit()
+    # Teardown - quit driver (and start a replacement when pre-spawning)
+    driver_manager.retire_driver(driver)
+
+
+@pytest.fixture(autouse=True)
+def webdriver_command_count(request):
+    # Counts the WebDriver round-trips of every test that uses a browser
+    if 'driver' not in request.fixturenames:
+        yield None
+        return
+
+    counter = CommandCounter(request.getfixturevalue('driver'))
+    yield counter
+    counter.detach()
+
+    request.node.user_properties.append(('webdriver_commands', counter.total))
+    session_stats.record(CommandCounter.STATS_SECTION, 'per_test', counter.total)
+    for command, count in counter.counts.items():
+        session_stats.increment(CommandCounter.STATS_SECTION, command, count)
+
+
+def _command_timings_path(profiler_config):
+    # One file per xdist worker, so workers never write to the same file
+    worker = os.environ.get('PYTEST_XDIST_WORKER')
+    jsonl_path = Path(profiler_config.get('jsonl_path', 'reports/command_timings.jsonl'))
+    if worker:
+        jsonl_path = jsonl_path.with_name(f"{jsonl_path.stem}-{worker}{jsonl_path.suffix}")
+    return jsonl_path
+
+
+@pytest.fixture(autouse=True)
+def command_profile(request, config):
+    # Not attached at all when disabled, so the driver keeps its plain execute()
+    profiler_config = config.get('profiler', {})
+    if not profiler_config.get('enabled', False) or 'driver' not in request.fixturenames:
+        yield None
+        return
+
+    profiler = DriverProfiler(request.getfixturevalue('driver'), request.node.nodeid)
+    yield profiler
+    profiler.detach()
+
+    for command, _, _, duration_ms, _ in profiler.records:
+        session_stats.record(DriverProfiler.STATS_SECTION, command, duration_ms)
+    acquire_ms = getattr(request.node, 'driver_acquire_ms', None)
+    if acquire_ms is not None:
+        session_stats.record(DriverProfiler.STATS_SECTION, 'driver acquisition', acquire_ms)
+
+    profiler.export_jsonl(_command_timings_path(profiler_config))
+    request.node.command_profile_html = profiler.flame_html()
+
+
+@pytest.fixture(autouse=True)
+def browser_memory(request, config):
+    # Memory of the browser process tree and JS heap before and after each test
+    if not config.get('memory_watchdog', {}).get('enabled', False) or 'driver' not in request.fixturenames:
+        yield None
+        return
+
+    driver = request.getfixturevalue('driver')
+    driver_manager = request.getfixturevalue('driver_manager')
+    before = driver_manager.sample_memory(driver)
+    yield before
+    after = driver_manager.sample_memory(driver)
+
+    deltas = driver_manager.watchdog.record_delta(before, after)
+    for field, delta in deltas.items():
+        request.node.user_properties.append((f"{field}_delta", round(delta, 1)))
+    if deltas:
+        cells = ''.join(f"<td>{field}: {delta:+.1f} MB</td>" for field, delta in deltas.items())
+        request.node.memory_html = f'<table class="memory-delta"><tr>{cells}</tr></table>'
+
+
+@pytest.fixture(autouse=True)
+def page_steps(request):
+    # Steps are buffered as raw records and only formatted for failed tests (or everywhere with --step-log)
+    from utils.step_log import step_log
+    step_log.reset()
+    yield step_log
+    if _test_failed(request.node) or request.config.getoption('step_log'):
+        lines = step_log.emit(f"Steps of {request.node.nodeid}")
+        if lines:
+            request.node.step_log_text = '\n'.join(lines)
+
+
+@pytest.fixture(scope='session')
+def login_state_cache(config):
+    from utils.login_state_cache import LoginStateCache
+    return LoginStateCache(config, session_stats)
+
+
+@pytest.fixture(scope='function')
+def logged_in(request, driver, login_state_cache):
+    # The user key can be overridden with indirect parametrization; @pytest.mark.ui_login forces a real UI login
+    user_key = getattr(request, 'param', 'standard_user')
+    force_ui = request.node.get_closest_marker('ui_login') is not None
+    return login_state_cache.login(driver, user_key, force_ui=force_ui)
+
+
+@pytest.fixture(scope='function')
+def state_seeder(driver, config):
+    from utils.state_seeder import StateSeeder
+    return StateSeeder(driver, config, session_stats)
+
+
+@pytest.fixture(scope='function')
+def test_data(request, config):
+    # Seeded from the node id; the seed is recorded so a failing run can be reproduced
+    from utils.test_data_generator import TestDataGenerator
+    data_config = config.get('test_data', {})
+    generator = TestDataGenerator.for_test(
+        request.node.nodeid,
+        locale=data_config.get('locale', 'en_US'),
+        pooled=data_config.get('pooled', False),
+        pool_size=data_config.get('pool_size', 500)
+    )
+    request.node.user_properties.append(('test_data_seed', generator.seed))
+    return generator
 
 
 @pytest.fixture(scope='function')
-def screenshot_helper(driver, config):
-    return ScreenshotHelper(driver, config)
+def screenshot_helper(request, driver, config):
+    from utils.screenshot_helper import ScreenshotHelper
+    return ScreenshotHelper(driver, config, writer=request.config.stash.get(screenshot_writer_key, None))
+
+
+@pytest.fixture(scope='session')
+def visual_comparer(config):
+    from utils.visual_regression import VisualComparer
+    return VisualComparer.from_config(config, session_stats)
+
+
+@pytest.fixture(scope='function')
+def visual_regression(request, driver, config, visual_comparer):
+    # Comparisons need the capture on disk right away, so they bypass the async screenshot writer
+    from utils.screenshot_helper import ScreenshotHelper
+    update = request.config.getoption('update_baselines')
+    capture_config = dict(config, screenshots=dict(
+        config.get('screenshots', {}), enabled=True, path=str(Path(visual_comparer.diff_dir) / 'actual')
+    ))
+    helper = ScreenshotHelper(driver, capture_config)
+
+    def check(name, create_missing=True, ignore_regions=(), record=False):
+        # record=True always (re)writes the baseline, for tests that capture their own reference first
+        capture_path = helper.capture_full_page_screenshot(name)
+        assert capture_path, f"Could not capture a screenshot for visual check '{name}'"
+        result = visual_comparer.compare(
+            name, capture_path, update=update or record, create_missing=create_missing, ignore_regions=ignore_regions
+        )
+        if result.diff_path:
+            request.node.visual_diffs = getattr(request.node, 'visual_diffs', []) + [result.diff_path]
+        return result
+
+    return check
+
+
+def _report_relative(config, path):
+    # Links in the HTML report are resolved relative to the report file
+    html_path = getattr(config.option, 'htmlpath', None)
+    if not html_path:
+        return str(path)
+    return Path(os.path.relpath(Path(path).resolve(), Path(html_path).resolve().parent)).as_posix()
+
+
+def _attach_extra(report, kind, content):
+    # pytest-html is optional; without it there is nowhere to attach extras
+    try:
+        from pytest_html import extras
+    except ImportError:
+        return
+    report.extras = getattr(report, 'extras', []) + [getattr(extras, kind)(content)]
 
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     outcome = yield
     report = outcome.get_result()
+
+    # Expose the phase result to fixtures (used to recycle pooled drivers after failures)
+    setattr(item, f'rep_{report.when}', report)
+    acquire_ms = getattr(item, 'driver_acquire_ms', None)
+    if report.when == 'setup' and acquire_ms is not None:
+        # Carried on the report so the duration history also sees it under xdist
+        report.user_properties = list(report.user_properties) + [('driver_acquire_ms', round(acquire_ms, 1))]
+
+    # The command profile is complete once fixtures are torn down
+    profile_html = getattr(item, 'command_profile_html', None)
+    if report.when == 'teardown' and profile_html:
+        _attach_extra(report, 'html', profile_html)
+    memory_html = getattr(item, 'memory_html', None)
+    if report.when == 'teardown' and memory_html:
+        _attach_extra(report, 'html', memory_html)
+    step_log_text = getattr(item, 'step_log_text', None)
+    if report.when == 'teardown' and step_log_text:
+        _attach_extra(report, 'text', step_log_text)
+
+    # Visual diffs are embedded, so self-contained reports keep them
+    if report.when == 'call':
+        for diff_path in getattr(item, 'visual_diffs', []):
+            _attach_extra(report, 'png', base64.b64encode(Path(diff_path).read_bytes()).decode('ascii'))
     
     if report.when == 'call' and report.failed:
         # Get the driver fixture
         driver = item.funcargs.get('driver')
-        if driver:
+        collector = item.config.stash.get(failure_collector_key, None)
+        if driver and collector is not None:
+            # Screenshot, DOM, console log, URL and network timings in one bundle, bounded by a timeout
+            try:
+                bundle_path, screenshot = collector.collect(driver, item.name)
+                print(f"\nFailure artifacts saved: {bundle_path}")
+                if screenshot:
+                    _attach_extra(report, 'png', screenshot)
+                _attach_extra(report, 'url', _report_relative(item.config, bundle_path))
+            except Exception as e:
+                print(f"\n Failed to collect failure artifacts: {e}")
+        elif driver:
             # Create screenshots directory if it doesn't exist
             screenshot_dir = Path(__file__).parent / 'reports' / 'screenshots'
             screenshot_dir.mkdir(parents=True, exist_ok=True)
@@ -72,12 +475,19 @@ def pytest_runtest_makereport(item, call):
             
             # Capture screenshot
             try:
-                driver.save_screenshot(str(screenshot_path))
-                print(f"\nScreenshot saved: {screenshot_path}")
-                
-                # Attach screenshot to HTML report
-                if hasattr(report, 'extra'):
-                    report.extra.append(pytest.html.extras.image(str(screenshot_path)))
+                writer = item.config.stash.get(screenshot_writer_key, None)
+                if writer is not None:
+                    # Encoded and written in the background; the report embeds the base64 frame directly
+                    screenshot = driver.get_screenshot_as_base64()
+                    pending = writer.submit(screenshot, screenshot_path)
+                    print(f"\nScreenshot queued: {pending.path}")
+                    _attach_extra(report, 'png', screenshot)
+                else:
+                    driver.save_screenshot(str(screenshot_path))
+                    print(f"\nScreenshot saved: {screenshot_path}")
+                    
+                    # Attach screenshot to HTML report
+                    _attach_extra(report, 'image', str(screenshot_path))
             except Exception as e:
                 print(f"\n Failed to capture screenshot: {e}")
 
@@ -89,3 +499,108 @@ def pytest_configure(config):
         'Browser': 'Chrome',
         'Platform': os.name
     }
+
+
+def pytest_sessionstart(session):
+    screenshots = load_config().get('screenshots', {})
+    if _runs_tests(session.config) and screenshots.get('enabled', True) and screenshots.get('async', False):
+        from utils.screenshot_writer import ScreenshotWriter
+        session.config.stash[screenshot_writer_key] = ScreenshotWriter.from_config(load_config(), session_stats)
+    if _runs_tests(session.config) and load_config().get('failure_artifacts', {}).get('enabled', False):
+        from utils.failure_artifacts import FailureArtifactCollector
+        session.config.stash[failure_collector_key] = FailureArtifactCollector(load_config(), session_stats)
+    profiler_config = load_config().get('profiler', {})
+    if _runs_tests(session.config) and profiler_config.get('enabled', False):
+        # Tests append their timings; the file only holds this run's
+        _command_timings_path(profiler_config).unlink(missing_ok=True)
+    if _runs_tests(session.config) and session.config.getoption('record_impact'):
+        from utils.test_impact import ImpactRecorder
+        session.config.stash[impact_recorder_key] = ImpactRecorder(project_root)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_sessionfinish(session):
+    # Pending screenshots must be on disk before the HTML report is generated
+    writer = session.config.stash.get(screenshot_writer_key, None)
+    if writer is not None:
+        writer.close()
+
+    session_stats.merge({
+        'wait time per locator (ms)': dict(wait_timings),
+        'page ready time (ms)': dict(ready_timings),
+    })
+
+    _update_duration_history(session.config)
+    _update_impact_index(session.config)
+
+    # xdist workers hand their statistics to the controller
+    workeroutput = getattr(session.config, 'workeroutput', None)
+    if workeroutput is not None:
+        workeroutput['session_stats'] = session_stats.sections
+        workeroutput['impact_records'] = impact_records
+        workeroutput['impact_shared'] = sorted(impact_shared)
+
+
+def pytest_runtest_logreport(report):
+    entry = test_durations.setdefault(report.nodeid, {'duration': 0.0, 'skipped': False, 'driver_acquire': None})
+    entry['duration'] += report.duration
+    entry['skipped'] = entry['skipped'] or report.skipped
+    acquire_ms = dict(report.user_properties).get('driver_acquire_ms')
+    if acquire_ms is not None:
+        entry['driver_acquire'] = acquire_ms / 1000
+
+
+def _update_duration_history(config):
+    # Recorded by the process that sees every report: the xdist controller or the only process
+    if config.option.collectonly or hasattr(config, 'workerinput') or not test_durations:
+        return
+    from utils.duration_history import DurationHistory
+    history = DurationHistory.from_config(project_root, load_config())
+    for nodeid, entry in test_durations.items():
+        # Skipped tests say nothing about how long the test takes
+        if not entry['skipped']:
+            history.update(nodeid, entry['duration'], entry['driver_acquire'])
+    history.save()
+
+
+def _update_impact_index(config):
+    if hasattr(config, 'workerinput') or not impact_records:
+        return
+    from utils.test_impact import ImpactIndex, head_commit
+    index_path = project_root / load_config().get('test_impact', {}).get('index_path', '.test_impact.json')
+    index = ImpactIndex(index_path)
+    index.update(impact_records, head_commit(project_root), impact_shared)
+    index.save()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    session_stats.merge(getattr(node, 'workeroutput', {}).get('session_stats', {}))
+    impact_records.update(getattr(node, 'workeroutput', {}).get('impact_records', {}))
+    impact_shared.update(getattr(node, 'workeroutput', {}).get('impact_shared', []))
+
+
+def _profile_comparison_lines():
+    lean = session_stats.sections.get('page load (lean profile)')
+    full = session_stats.sections.get('page load (full profile)')
+    if not lean or not full:
+        return []
+    lines = ["lean vs full profile (mean):"]
+    for key in ('dom_ready_ms', 'load_ms', 'transferred_kb'):
+        lean_mean = sum(lean[key]) / len(lean[key])
+        full_mean = sum(full[key]) / len(full[key])
+        change = f" ({(lean_mean - full_mean) / full_mean:+.0%})" if full_mean else ''
+        lines.append(f"  {key}: {lean_mean:.1f} vs {full_mean:.1f}{change}")
+    return lines
+
+
+def pytest_terminal_summary(terminalreporter):
+    if session_stats.sections:
+        terminalreporter.write_sep('-', 'session statistics')
+        for line in session_stats.summary_lines() + _profile_comparison_lines():
+            terminalreporter.write_line(line)
+    scheduler = terminalreporter.config.stash.get(lpt_scheduler_key, None)
+    if scheduler is not None and scheduler.summary_lines():
+        terminalreporter.write_sep('-', 'test scheduling')
+        for line in scheduler.summary_lines():
+            terminalreporter.write_line(line)
@@ -2,9 +2,26 @@
 Package initialization for pages module
 """
 
-from pages.base_page import BasePage
-from pages.login_page import LoginPage
-from pages.products_page import ProductsPage
-from pages.cart_page import CartPage
+import importlib
+
+# Page objects are imported on first access
+_exports = {
+    'BasePage': 'pages.base_page',
+    'LoginPage': 'pages.login_page',
+    'ProductsPage': 'pages.products_page',
+    'CartPage': 'pages.cart_page',
+}
 
 __all__ = ['BasePage', 'LoginPage', 'ProductsPage', 'CartPage']
+
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_exports[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
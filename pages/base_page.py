@@ -2,76 +2,521 @@
 Base Page Class
 """
 
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+from utils.wait_engine import AdaptiveWait
+from utils.wait_timings import record_wait, ready_timings
+from utils.step_log import step_log
+from collections import namedtuple
+import time
 import logging
 
 
+ReadyResult = namedtuple('ReadyResult', ['ready', 'conditions', 'elapsed_ms'])
+
+
 class BasePage:
 
+    # Resolves Selenium (by, value) locators in the browser; prefixed to the scripts below
+    LOCATOR_JS = """
+        function quote(value) {
+            return '"' + String(value).replace(/\\\\/g, '\\\\\\\\').replace(/"/g, '\\\\"') + '"';
+        }
+
+        function find(by, value) {
+            var nodes;
+            if (by === 'xpath') {
+                var snapshot = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+                nodes = [];
+                for (var i = 0; i < snapshot.snapshotLength; i++) {
+                    nodes.push(snapshot.snapshotItem(i));
+                }
+                return nodes;
+            }
+            if (by === 'link text' || by === 'partial link text') {
+                return Array.prototype.filter.call(document.querySelectorAll('a'), function (link) {
+                    var text = link.innerText.trim();
+                    return by === 'link text' ? text === value : text.indexOf(value) !== -1;
+                });
+            }
+            var selectors = {
+                'id': '[id=' + quote(value) + ']',
+                'name': '[name=' + quote(value) + ']',
+                'class name': '.' + CSS.escape(value),
+                'tag name': value,
+                'css selector': value
+            };
+            return Array.prototype.slice.call(document.querySelectorAll(selectors[by]));
+        }
+
+        function isVisible(el) {
+            if (!el.getClientRects().length) {
+                return false;
+            }
+            var style = window.getComputedStyle(el);
+            return style.visibility !== 'hidden' && style.opacity !== '0';
+        }
+    """
+
+    # Reads fields of every element matching each locator in one round-trip.
+    # arguments[0]: list of [by, value] pairs, arguments[1]: fields, arguments[2]: attribute names
+    READ_ELEMENTS_SCRIPT = LOCATOR_JS + """
+        var locators = arguments[0], fields = arguments[1], attributes = arguments[2];
+
+        return locators.map(function (locator) {
+            return find(locator[0], locator[1]).map(function (el) {
+                var item = {}, visible = isVisible(el);
+                if (fields.indexOf('text') !== -1) {
+                    item.text = visible ? el.innerText.trim() : '';
+                }
+                if (fields.indexOf('visible') !== -1) {
+                    item.visible = visible;
+                }
+                if (fields.indexOf('rect') !== -1) {
+                    var rect = el.getBoundingClientRect();
+                    item.rect = {x: rect.x, y: rect.y, width: rect.width, height: rect.height};
+                }
+                if (attributes.length) {
+                    item.attributes = {};
+                    attributes.forEach(function (name) {
+                        var property = el[name];
+                        var primitive = property !== undefined && property !== null && typeof property !== 'object'
+                            && typeof property !== 'function';
+                        item.attributes[name] = primitive ? property : el.getAttribute(name);
+                    });
+                }
+                return item;
+            });
+        });
+    """
+
+    # Resolves true as soon as a MutationObserver sees the locator reach the requested state, false on timeout.
+    # arguments: by, value, state ('present' | 'visible' | 'clickable'), timeout in ms, callback
+    OBSERVE_LOCATOR_SCRIPT = LOCATOR_JS + """
+        var by = arguments[0], value = arguments[1], state = arguments[2], timeoutMs = arguments[3];
+        var done = arguments[arguments.length - 1];
+
+        function satisfied() {
+            return find(by, value).some(function (el) {
+                if (state === 'present') {
+                    return true;
+                }
+                return isVisible(el) && (state !== 'clickable' || !el.disabled);
+            });
+        }
+
+        if (satisfied()) {
+            return done(true);
+        }
+        var observer = new MutationObserver(function () {
+            if (satisfied()) {
+                observer.disconnect();
+                clearTimeout(timer);
+                done(true);
+            }
+        });
+        var timer = setTimeout(function () {
+            observer.disconnect();
+            done(false);
+        }, timeoutMs);
+        observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+    """
+
+    # Waits until every field is present, sets all values through the native value setter and dispatches the
+    # input/change events React-controlled inputs listen for, then reads the values back after a render tick.
+    # arguments: list of [by, value, text], timeout in ms, callback. Result: {missing: [...], values: [...]}
+    FILL_FORM_SCRIPT = LOCATOR_JS + """
+        var fields = arguments[0], timeoutMs = arguments[1];
+        var done = arguments[arguments.length - 1];
+        var deadline = Date.now() + timeoutMs;
+
+        function setValue(el, text) {
+            var prototype = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype
+                : el instanceof HTMLSelectElement ? HTMLSelectElement.prototype : HTMLInputElement.prototype;
+            // The native setter bypasses React's value tracking, so React sees the change in the input event
+            Object.getOwnPropertyDescriptor(prototype, 'value').set.call(el, text);
+            el.dispatchEvent(new Event('input', {bubbles: true}));
+            el.dispatchEvent(new Event('change', {bubbles: true}));
+        }
+
+        function attempt() {
+            var elements = fields.map(function (field) { return find(field[0], field[1])[0] || null; });
+            var missing = [];
+            elements.forEach(function (el, index) { if (!el) { missing.push(index); } });
+            if (missing.length && Date.now() < deadline) {
+                return setTimeout(attempt, 20);
+            }
+            if (missing.length) {
+                return done({missing: missing, values: []});
+            }
+            elements.forEach(function (el, index) { setValue(el, fields[index][2]); });
+            setTimeout(function () {
+                done({missing: [], values: elements.map(function (el) { return el.value; })});
+            }, 0);
+        }
+
+        attempt();
+    """
+
+    # Counts fetch/XHR requests in flight and flags a document that is being navigated away from.
+    # Registered to run before page scripts in every new document; the settled-state check installs it as a fallback.
+    REQUEST_TRACKING_JS = """
+        if (!window.__pendingRequests) {
+            var pending = window.__pendingRequests = {count: 0, navigating: false};
+            var done = function () { pending.count = Math.max(0, pending.count - 1); };
+            if (window.fetch) {
+                var originalFetch = window.fetch;
+                window.fetch = function () {
+                    pending.count++;
+                    return originalFetch.apply(this, arguments).finally(done);
+                };
+            }
+            var originalSend = XMLHttpRequest.prototype.send;
+            XMLHttpRequest.prototype.send = function () {
+                pending.count++;
+                this.addEventListener('loadend', done);
+                return originalSend.apply(this, arguments);
+            };
+            // A navigation started by the last action leaves this document 'complete' until the next one commits
+            var leaving = function () { pending.navigating = true; };
+            window.addEventListener('beforeunload', leaving);
+            window.addEventListener('pagehide', leaving);
+            window.addEventListener('pageshow', function () { pending.navigating = false; });
+        }
+    """
+
+    # Reports whether the page has settled (loaded, not navigating away, primary container present, no fetch/XHR in
+    # flight) and which of the target locators are currently visible.
+    # arguments: primary container [by, value] or null, list of target [by, value] pairs
+    SETTLED_STATE_SCRIPT = LOCATOR_JS + REQUEST_TRACKING_JS + """
+        var container = arguments[0], targets = arguments[1];
+        var tracking = window.__pendingRequests;
+        var settled = document.readyState === 'complete' && tracking.count === 0 && !tracking.navigating
+            && (!container || find(container[0], container[1]).length > 0);
+        return {
+            settled: settled,
+            visible: targets.map(function (target) { return find(target[0], target[1]).some(isVisible); })
+        };
+    """
+
+    # Evaluates every ready condition of a page in one call and returns one boolean per condition:
+    # each locator visible, then URL fragment (if any), then title text (if any).
+    # arguments: list of [by, value] pairs, URL fragment or null, [by, value, expected text] or null
+    READY_STATE_SCRIPT = LOCATOR_JS + """
+        var locators = arguments[0], urlFragment = arguments[1], title = arguments[2];
+        var results = locators.map(function (locator) {
+            return find(locator[0], locator[1]).some(isVisible);
+        });
+        if (urlFragment !== null) {
+            results.push(window.location.href.indexOf(urlFragment) !== -1);
+        }
+        if (title !== null) {
+            var titles = find(title[0], title[1]);
+            results.push(titles.length > 0 && titles[0].innerText.trim() === title[2]);
+        }
+        return results;
+    """
+
+    # Element that is present once the page object's page has rendered; used to decide when absence is final
+    PRIMARY_CONTAINER = None
+
+    # Declarative readiness: 'locators' that must be visible, a 'url' fragment and a 'title' (locator, text) pair
+    READY_CONDITIONS = {}
+
+    # Page key or path (relative to base_url) that from_state opens
+    STATE_PAGE = None
+
     def __init__(self, driver, config):
         self.driver = driver
         self.config = config
         self.timeout = config.get('explicit_wait', 20)
         self.logger = logging.getLogger(__name__)
-    
-    def find_element(self, locator, timeout=None):
+        # Steps go to the per-test ring buffer; they are only formatted when a test fails (or with --step-log)
+        self.steps = step_log
+
+        wait_config = config.get('waits', {})
+        self.use_mutation_observer = wait_config.get('mutation_observer', False)
+        self.poll_settings = {
+            'initial_poll': wait_config.get('initial_poll', 0.005),
+            'max_poll': wait_config.get('max_poll', 0.25),
+            'backoff': wait_config.get('backoff', 1.6),
+        }
+        self._ensure_request_tracking()
+
+    @classmethod
+    def from_state(cls, driver, config, state=None, page=None, seeder=None):
+
+        # Opens the page directly with seeded session/cart state instead of navigating there through the UI
+        from utils.state_seeder import StateSeeder
+        seeder = seeder or StateSeeder(driver, config)
+        seeder.open_at(page or cls.STATE_PAGE, state)
+        instance = cls(driver, config)
+        if page is None:
+            instance.wait_until_ready()
+        return instance
+
+    def step(self, action, locator=None, detail=None, started_at=None, outcome=None):
+
+        # Cheap enough for every action: a tuple appended to a ring buffer, nothing formatted
+        duration_ms = (time.perf_counter() - started_at) * 1000 if started_at is not None else None
+        self.steps.record(type(self).__name__, action, locator, detail, duration_ms, outcome)
+
+    def wait_until(self, condition, timeout=None, key=None, message=''):
+
         timeout = timeout or self.timeout
+        started_at = time.perf_counter()
+        try:
+            return AdaptiveWait(self.driver, timeout, **self.poll_settings).until(condition, message)
+        finally:
+            if key is not None:
+                record_wait(key, started_at)
+
+    def wait_for_locator(self, locator, condition, state, timeout=None):
+
+        timeout = timeout or self.timeout
+        started_at = time.perf_counter()
+        try:
+            if self.use_mutation_observer and self._observe_locator(locator, state, timeout) is False:
+                raise TimeoutException(f"Locator {locator} not {state} after {timeout}s")
+            # After a successful observation the first poll succeeds immediately
+            return AdaptiveWait(self.driver, timeout, **self.poll_settings).until(condition)
+        finally:
+            record_wait(self._locator_key(locator), started_at)
+
+    def _observe_locator(self, locator, state, timeout):
+        # Returns None when the browser cannot observe (e.g. the page navigated), so polling takes over
         try:
-            element = WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located(locator)
+            self._ensure_script_timeout(timeout)
+            return self.driver.execute_async_script(
+                self.OBSERVE_LOCATOR_SCRIPT, locator[0], locator[1], state, int(timeout * 1000)
             )
-            return element
+        except WebDriverException as e:
+            self.logger.debug(f"Mutation observer wait unavailable for {locator}: {e}")
+            return None
+
+    def _ensure_request_tracking(self):
+        # Once per session: requests a document starts before the first settled-state check are counted too
+        if getattr(self.driver, '_request_tracking_installed', False):
+            return
+        try:
+            self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': self.REQUEST_TRACKING_JS})
+        except (AttributeError, WebDriverException) as e:
+            self.logger.debug(f"Request tracking falls back to first use: {e}")
+        self.driver._request_tracking_installed = True
+
+    def _ensure_script_timeout(self, timeout):
+        # Async scripts wait in the browser for up to `timeout`; the session limit is only raised when it changes
+        if getattr(self.driver, '_observer_script_timeout', None) != timeout:
+            self.driver.set_script_timeout(timeout + 5)
+            self.driver._observer_script_timeout = timeout
+
+    @staticmethod
+    def _locator_key(locator):
+        return f"{locator[0]}={locator[1]}"
+    
+    def find_element(self, locator, timeout=None):
+        try:
+            return self.wait_for_locator(locator, EC.presence_of_element_located(locator), 'present', timeout)
         except TimeoutException:
             self.logger.error(f"Element not found: {locator}")
             raise
     
     def find_elements(self, locator, timeout=None):
-        timeout = timeout or self.timeout
         try:
-            elements = WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_all_elements_located(locator)
-            )
-            return elements
+            return self.wait_for_locator(locator, EC.presence_of_all_elements_located(locator), 'present', timeout)
         except TimeoutException:
             self.logger.error(f"Elements not found: {locator}")
             raise
     
     def click(self, locator, timeout=None):
-        timeout = timeout or self.timeout
+        started_at = time.perf_counter()
+        # Recorded whatever happens, so a failing test's step log ends with the action that failed
+        outcome = 'error'
         try:
-            element = WebDriverWait(self.driver, timeout).until(
-                EC.element_to_be_clickable(locator)
-            )
+            element = self.wait_for_locator(locator, EC.element_to_be_clickable(locator), 'clickable', timeout)
             element.click()
-            self.logger.info(f"Clicked element: {locator}")
+            outcome = 'ok'
         except TimeoutException:
+            outcome = 'timeout'
             self.logger.error(f"Element not clickable: {locator}")
             raise
+        finally:
+            self.step('click', locator, started_at=started_at, outcome=outcome)
     
     def send_keys(self, locator, text, timeout=None):
-        timeout = timeout or self.timeout
-        element = self.find_element(locator, timeout)
-        element.clear()
-        element.send_keys(text)
-        self.logger.info(f"Entered text in element: {locator}")
+        started_at = time.perf_counter()
+        outcome = 'error'
+        try:
+            element = self.find_element(locator, timeout)
+            element.clear()
+            element.send_keys(text)
+            outcome = 'ok'
+        except TimeoutException:
+            outcome = 'timeout'
+            raise
+        finally:
+            self.step('send_keys', locator, started_at=started_at, outcome=outcome)
     
+    def fill_form(self, fields, timeout=None):
+
+        # fields: {locator: value} or {locator: {'value': value, 'typed': True}} to keep real keystrokes for a field
+        timeout = timeout or self.timeout
+        fill_started_at = time.perf_counter()
+        outcome = 'error'
+        try:
+            self._fill_fields(fields, timeout)
+            outcome = 'ok'
+        except TimeoutException:
+            outcome = 'timeout'
+            raise
+        finally:
+            self.step('fill_form', detail=f"{len(fields)} fields", started_at=fill_started_at, outcome=outcome)
+
+    def _fill_fields(self, fields, timeout):
+        scripted, typed = [], []
+        for locator, spec in fields.items():
+            if isinstance(spec, dict):
+                (typed if spec.get('typed') else scripted).append((locator, str(spec['value'])))
+            else:
+                scripted.append((locator, str(spec)))
+
+        if scripted:
+            started_at = time.perf_counter()
+            try:
+                self._ensure_script_timeout(timeout)
+                result = self.driver.execute_async_script(
+                    self.FILL_FORM_SCRIPT,
+                    [[locator[0], locator[1], value] for locator, value in scripted],
+                    int(timeout * 1000)
+                )
+            finally:
+                record_wait(f"fill_form({len(scripted)} fields)", started_at)
+            if result['missing']:
+                missing = [scripted[index][0] for index in result['missing']]
+                raise TimeoutException(f"Form fields not found after {timeout}s: {missing}")
+            # A value the app did not accept (e.g. an input that rewrites or rejects it) is typed instead
+            for (locator, value), actual in zip(scripted, result['values']):
+                if actual != value:
+                    self.logger.warning(f"Field {locator} kept {actual!r} instead of {value!r}; typing it instead")
+                    typed.append((locator, value))
+
+        for locator, value in typed:
+            self.send_keys(locator, value, timeout)
+
     def get_text(self, locator, timeout=None):
 
+        items = self.read_elements(locator, fields=('text',))
+        if items:
+            return items[0]['text']
         element = self.find_element(locator, timeout)
         return element.text
+
+    def read_elements(self, locator, fields=('text', 'visible', 'rect'), attributes=()):
+
+        return self.read_many([locator], fields, attributes)[0]
+
+    def read_many(self, locators, fields=('text', 'visible', 'rect'), attributes=()):
+        # One execute_script call for all locators; returns a list of dicts per locator
+        return self.driver.execute_script(
+            self.READ_ELEMENTS_SCRIPT,
+            [list(locator) for locator in locators],
+            list(fields),
+            list(attributes)
+        )
+
+    def get_texts(self, locator, timeout=None):
+
+        items = self.read_elements(locator, fields=('text',))
+        if not items:
+            # Nothing rendered yet: wait for presence like find_elements, then read again
+            self.find_elements(locator, timeout)
+            items = self.read_elements(locator, fields=('text',))
+        return [item['text'] for item in items]
+
+    def count_elements(self, locator):
+
+        return len(self.read_elements(locator, fields=()))
     
     def is_element_visible(self, locator, timeout=None):
-        timeout = timeout or self.timeout
         try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.visibility_of_element_located(locator)
-            )
+            self.wait_for_locator(locator, EC.visibility_of_element_located(locator), 'visible', timeout)
             return True
         except TimeoutException:
             return False
     
+    def wait_until_ready(self, conditions=None, timeout=None):
+
+        conditions = conditions if conditions is not None else self.READY_CONDITIONS
+        locators = conditions.get('locators', [])
+        url_fragment = conditions.get('url')
+        title = conditions.get('title')
+
+        names = [f"visible {self._locator_key(locator)}" for locator in locators]
+        if url_fragment is not None:
+            names.append(f"url contains {url_fragment}")
+        if title is not None:
+            names.append(f"{self._locator_key(title[0])} text == {title[1]!r}")
+
+        script_args = (
+            [list(locator) for locator in locators],
+            url_fragment,
+            [title[0][0], title[0][1], title[1]] if title is not None else None,
+        )
+        last_results = []
+
+        def all_held(driver):
+            last_results[:] = driver.execute_script(self.READY_STATE_SCRIPT, *script_args)
+            return all(last_results)
+
+        started_at = time.perf_counter()
+        try:
+            self.wait_until(all_held, timeout)
+            ready = True
+        except TimeoutException:
+            ready = False
+        elapsed_ms = record_wait(type(self).__name__, started_at, ready_timings)
+
+        result = ReadyResult(ready, dict(zip(names, last_results)), elapsed_ms)
+        if not ready:
+            failed = [name for name, held in result.conditions.items() if not held]
+            self.logger.error(f"{type(self).__name__} not ready, failed conditions: {failed}")
+        return result
+
+    def get_settled_state(self, locators):
+
+        container = list(self.PRIMARY_CONTAINER) if self.PRIMARY_CONTAINER else None
+        return self.driver.execute_script(
+            self.SETTLED_STATE_SCRIPT, container, [list(locator) for locator in locators]
+        )
+
+    def expect_absent(self, locator, timeout=None):
+        # True as soon as the page has settled without the element; False as soon as it is visible
+        last_state = {}
+
+        def resolved(driver):
+            last_state.update(self.get_settled_state([locator]))
+            return last_state['settled'] or last_state['visible'][0]
+
+        try:
+            self.wait_until(resolved, timeout, key=f"absent {self._locator_key(locator)}")
+        except TimeoutException:
+            self.logger.warning(f"Page did not settle while checking absence of: {locator}")
+        return not last_state.get('visible', [False])[0]
+
+    def wait_for_either(self, success_locator, error_locator, timeout=None):
+        # Returns 'success' or 'error' for whichever becomes visible first, None on timeout
+        outcomes = ('success', 'error')
+        key = f"either {self._locator_key(success_locator)} | {self._locator_key(error_locator)}"
+
+        def first_visible(driver):
+            visible = self.get_settled_state([success_locator, error_locator])['visible']
+            return next((outcome for outcome, shown in zip(outcomes, visible) if shown), None)
+
+        try:
+            return self.wait_until(first_visible, timeout, key=key)
+        except TimeoutException:
+            return None
+    
     def is_element_present(self, locator):
 
         try:
@@ -82,11 +527,8 @@ class BasePage:
     
     def wait_for_url_contains(self, url_fragment, timeout=None):
 
-        timeout = timeout or self.timeout
         try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.url_contains(url_fragment)
-            )
+            self.wait_until(EC.url_contains(url_fragment), timeout, key=f"url contains {url_fragment}")
             return True
         except TimeoutException:
             self.logger.error(f"URL does not contain: {url_fragment}")
@@ -33,6 +33,17 @@ class CartPage(BasePage):
     
     # Error locator
     ERROR_MESSAGE = (By.CSS_SELECTOR, "h3[data-test='error']")
+
+    # Wraps the cart, checkout and confirmation pages
+    PRIMARY_CONTAINER = (By.ID, "contents_wrapper")
+
+    READY_CONDITIONS = {
+        'url': 'cart.html',
+        'title': (PAGE_TITLE, "Your Cart"),
+    }
+
+    # from_state(..., page='checkout_step_one') starts at a checkout step instead
+    STATE_PAGE = 'cart'
     
     def __init__(self, driver, config):
 
@@ -41,40 +52,42 @@ class CartPage(BasePage):
     
     def is_cart_page_loaded(self):
 
-        return (self.wait_for_url_contains("cart.html") and 
-                self.get_text(self.PAGE_TITLE) == "Your Cart")
+        return self.wait_until_ready().ready
     
     def get_cart_items_count(self):
-        if self.is_element_present(self.CART_ITEMS):
-            return len(self.find_elements(self.CART_ITEMS))
-        return 0
+        return self.count_elements(self.CART_ITEMS)
     
     def get_cart_item_names(self):
-        items = self.find_elements(self.CART_ITEM_NAMES)
-        return [item.text for item in items]
+        return self.get_texts(self.CART_ITEM_NAMES)
     
     def click_checkout(self):
         self.click(self.CHECKOUT_BUTTON)
-        self.logger.info("Clicked checkout button")
+        self.step('click_checkout')
     
     def click_continue_shopping(self):
         self.click(self.CONTINUE_SHOPPING_BUTTON)
-        self.logger.info("Clicked continue shopping")
+        self.step('click_continue_shopping')
     
-    def fill_checkout_form(self, first_name, last_name, postal_code):
+    def fill_checkout_form(self, first_name, last_name, postal_code, typed=False):
 
-        self.send_keys(self.FIRST_NAME_INPUT, first_name)
-        self.send_keys(self.LAST_NAME_INPUT, last_name)
-        self.send_keys(self.POSTAL_CODE_INPUT, postal_code)
-        self.logger.info("Filled checkout form")
+        # One browser call for all fields; typed=True keeps real keystrokes
+        values = {
+            self.FIRST_NAME_INPUT: first_name,
+            self.LAST_NAME_INPUT: last_name,
+            self.POSTAL_CODE_INPUT: postal_code,
+        }
+        if typed:
+            values = {locator: {'value': value, 'typed': True} for locator, value in values.items()}
+        self.fill_form(values)
+        self.step('fill_checkout_form', detail='typed' if typed else None)
     
     def click_continue(self):
         self.click(self.CONTINUE_BUTTON)
-        self.logger.info("Clicked continue on checkout form")
+        self.step('click_continue')
     
     def click_finish(self):
         self.click(self.FINISH_BUTTON)
-        self.logger.info("Clicked finish to complete order")
+        self.step('click_finish')
     
     def is_order_complete(self):
         return self.is_element_visible(self.CONFIRMATION_HEADER)
@@ -87,18 +100,18 @@ class CartPage(BasePage):
     
     def click_back_home(self):
         self.click(self.BACK_HOME_BUTTON)
-        self.logger.info("Clicked back to home")
+        self.step('click_back_home')
     
-    def complete_checkout(self, first_name, last_name, postal_code):
+    def complete_checkout(self, first_name, last_name, postal_code, typed=False):
 
         self.click_checkout()
-        self.fill_checkout_form(first_name, last_name, postal_code)
+        self.fill_checkout_form(first_name, last_name, postal_code, typed=typed)
         self.click_continue()
         self.click_finish()
         return self.is_order_complete()
     
     def get_error_message(self):
 
-        if self.is_element_visible(self.ERROR_MESSAGE, timeout=2):
-            return self.get_text(self.ERROR_MESSAGE)
-        return None
+        if self.expect_absent(self.ERROR_MESSAGE, timeout=2):
+            return None
+        return self.get_text(self.ERROR_MESSAGE)
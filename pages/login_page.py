@@ -15,6 +15,14 @@ class LoginPage(BasePage):
     LOGIN_BUTTON = (By.ID, "login-button")
     ERROR_MESSAGE = (By.CSS_SELECTOR, "h3[data-test='error']")
     ERROR_BUTTON = (By.CSS_SELECTOR, "button.error-button")
+    # Rendered once a login succeeds and the inventory page is shown
+    INVENTORY_CONTAINER = (By.ID, "inventory_container")
+
+    PRIMARY_CONTAINER = LOGIN_BUTTON
+
+    READY_CONDITIONS = {
+        'locators': [USERNAME_INPUT, PASSWORD_INPUT, LOGIN_BUTTON],
+    }
     
     def __init__(self, driver, config):
         super().__init__(driver, config)
@@ -22,22 +30,22 @@ class LoginPage(BasePage):
     
     def enter_username(self, username):
         self.send_keys(self.USERNAME_INPUT, username)
-        self.logger.info(f"Entered username: {username}")
+        self.step('enter_username', detail=username)
     
     def enter_password(self, password):
         self.send_keys(self.PASSWORD_INPUT, password)
-        self.logger.info("Entered password")
+        self.step('enter_password')
     
     def click_login_button(self):
         self.click(self.LOGIN_BUTTON)
-        self.logger.info("Clicked login button")
+        self.step('click_login_button')
     
     def login(self, username, password):
 
         self.enter_username(username)
         self.enter_password(password)
         self.click_login_button()
-        self.logger.info(f"Login attempted with username: {username}")
+        self.step('login', detail=username)
     
     def login_with_valid_credentials(self):
 
@@ -46,7 +54,7 @@ class LoginPage(BasePage):
     
     def is_error_message_displayed(self):
 
-        return self.is_element_visible(self.ERROR_MESSAGE, timeout=5)
+        return self.wait_for_either(self.INVENTORY_CONTAINER, self.ERROR_MESSAGE, timeout=5) == 'error'
     
     def get_error_message_text(self):
 
@@ -56,6 +64,4 @@ class LoginPage(BasePage):
     
     def is_login_page_loaded(self):
 
-        return (self.is_element_visible(self.USERNAME_INPUT) and 
-                self.is_element_visible(self.PASSWORD_INPUT) and 
-                self.is_element_visible(self.LOGIN_BUTTON))
+        return self.wait_until_ready().ready
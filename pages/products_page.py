@@ -2,37 +2,97 @@
 Products Page
 """
 
+from collections import namedtuple
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import Select
 from pages.base_page import BasePage
 import logging
 
 
+CatalogEntry = namedtuple('CatalogEntry', ['price', 'description', 'add_button_id', 'remove_button_id', 'position',
+                                           'displayed'])
+
+
 class ProductsPage(BasePage):
     
     # Locators
     PAGE_TITLE = (By.CLASS_NAME, "title")
     INVENTORY_CONTAINER = (By.ID, "inventory_container")
     INVENTORY_ITEMS = (By.CLASS_NAME, "inventory_item")
+    INVENTORY_ITEM_NAMES = (By.CLASS_NAME, "inventory_item_name")
+    INVENTORY_ITEM_PRICES = (By.CLASS_NAME, "inventory_item_price")
     SHOPPING_CART_BADGE = (By.CLASS_NAME, "shopping_cart_badge")
     SHOPPING_CART_LINK = (By.CLASS_NAME, "shopping_cart_link")
     PRODUCT_SORT_DROPDOWN = (By.CLASS_NAME, "product_sort_container")
     BURGER_MENU = (By.ID, "react-burger-menu-btn")
     LOGOUT_LINK = (By.ID, "logout_sidebar_link")
+
+    PRIMARY_CONTAINER = INVENTORY_CONTAINER
+
+    READY_CONDITIONS = {
+        'locators': [INVENTORY_CONTAINER],
+        'url': 'inventory.html',
+        'title': (PAGE_TITLE, "Products"),
+    }
+
+    STATE_PAGE = 'inventory'
     
     # Dynamic locators
     ADD_TO_CART_BUTTON_TEMPLATE = "//div[text()='{}']/ancestor::div[@class='inventory_item']//button"
     REMOVE_BUTTON_TEMPLATE = "//div[text()='{}']/ancestor::div[@class='inventory_item']//button[text()='Remove']"
     PRODUCT_NAME_TEMPLATE = "//div[text()='{}']"
     PRODUCT_PRICE_TEMPLATE = "//div[text()='{}']/ancestor::div[@class='inventory_item']//div[@class='inventory_item_price']"
+
+    # Identifies the current document: its URL plus a marker that only lives as long as the document does
+    DOCUMENT_KEY_SCRIPT = """
+        if (!window.__catalogDocumentId) {
+            window.__catalogDocumentId = Date.now().toString(36) + Math.random().toString(36).slice(2);
+        }
+        return window.location.href + '#' + window.__catalogDocumentId;
+    """
+
+    # Reads the document key and every inventory item as [name, price, description, button id, displayed] in page
+    # order; displayed follows Selenium's notion of visible: the name renders a box (no display: none on it or an
+    # ancestor) and is not visibility: hidden
+    SNAPSHOT_SCRIPT = """
+        if (!window.__catalogDocumentId) {
+            window.__catalogDocumentId = Date.now().toString(36) + Math.random().toString(36).slice(2);
+        }
+        var rows = Array.prototype.map.call(document.querySelectorAll('.inventory_item'), function (item) {
+            var field = function (selector) {
+                var el = item.querySelector(selector);
+                return el ? el.textContent.trim() : null;
+            };
+            var button = item.querySelector('button');
+            var name = item.querySelector('.inventory_item_name');
+            var displayed = !!name && name.getClientRects().length > 0 &&
+                window.getComputedStyle(name).visibility !== 'hidden';
+            return [field('.inventory_item_name'), field('.inventory_item_price'),
+                    field('.inventory_item_desc'), button ? button.id : null, displayed];
+        });
+        return [window.location.href + '#' + window.__catalogDocumentId, rows];
+    """
+
+    # Clicks buttons by id in one round-trip and returns the ids that were not found
+    CLICK_BUTTONS_SCRIPT = """
+        return arguments[0].filter(function (id) {
+            var button = document.getElementById(id);
+            if (button) {
+                button.click();
+            }
+            return !button;
+        });
+    """
     
     def __init__(self, driver, config):
         super().__init__(driver, config)
         self.logger = logging.getLogger(__name__)
+        self._catalog = None
+        self._catalog_key = None
     
-    def is_products_page_loaded(self):
+    def is_products_page_loaded(self, timeout=None):
 
-        return (self.is_element_visible(self.INVENTORY_CONTAINER) and 
-                self.get_text(self.PAGE_TITLE) == "Products")
+        return self.wait_until_ready(timeout=timeout).ready
     
     def get_page_title(self):
 
@@ -44,41 +104,113 @@ class ProductsPage(BasePage):
     
     def get_product_count(self):
 
-        return len(self.get_all_products())
+        return self.count_elements(self.INVENTORY_ITEMS) or len(self.get_all_products())
+    
+    def snapshot(self):
+
+        key, rows = self.driver.execute_script(self.SNAPSHOT_SCRIPT)
+        if not rows:
+            # Inventory not rendered yet: wait for it once, then read again
+            self.find_elements(self.INVENTORY_ITEMS)
+            key, rows = self.driver.execute_script(self.SNAPSHOT_SCRIPT)
+
+        catalog = {}
+        for position, (name, price, description, button_id, displayed) in enumerate(rows):
+            slug = button_id or ''
+            for prefix in ('add-to-cart-', 'remove-'):
+                if slug.startswith(prefix):
+                    slug = slug[len(prefix):]
+                    break
+            catalog[name] = CatalogEntry(price, description, f"add-to-cart-{slug}", f"remove-{slug}", position,
+                                         displayed)
+        self._catalog = catalog
+        self._catalog_key = key
+        return catalog
+
+    def invalidate_snapshot(self):
+        self._catalog = None
+        self._catalog_key = None
+
+    def current_catalog(self):
+
+        # The snapshot only holds for the document it was read from; any navigation since then means a fresh read
+        if self._catalog is None or self.driver.execute_script(self.DOCUMENT_KEY_SCRIPT) != self._catalog_key:
+            return self.snapshot()
+        return self._catalog
+
+    def get_catalog_entry(self, product_name):
+
+        return self.current_catalog().get(product_name)
     
     def add_product_to_cart_by_name(self, product_name):
 
-        add_button_locator = (By.XPATH, self.ADD_TO_CART_BUTTON_TEMPLATE.format(product_name))
+        entry = self.get_catalog_entry(product_name)
+        if entry is not None:
+            add_button_locator = (By.ID, entry.add_button_id)
+        else:
+            add_button_locator = (By.XPATH, self.ADD_TO_CART_BUTTON_TEMPLATE.format(product_name))
         self.click(add_button_locator)
-        self.logger.info(f"Added product to cart: {product_name}")
+        self.step('add_product_to_cart_by_name', detail=product_name)
+
+    def add_products_to_cart(self, product_names):
+
+        catalog = self.current_catalog()
+        entries = {name: catalog.get(name) for name in product_names}
+        button_ids = [entry.add_button_id for entry in entries.values() if entry is not None]
+        missing_ids = self.driver.execute_script(self.CLICK_BUTTONS_SCRIPT, button_ids) if button_ids else []
+
+        # Products that are not in the snapshot keep the original XPath lookup (and its error reporting)
+        for name, entry in entries.items():
+            if entry is None or entry.add_button_id in missing_ids:
+                self.add_product_to_cart_by_name(name)
+        self.step('add_products_to_cart', detail=list(product_names))
     
     def remove_product_from_cart_by_name(self, product_name):
 
-        remove_button_locator = (By.XPATH, self.REMOVE_BUTTON_TEMPLATE.format(product_name))
+        entry = self.get_catalog_entry(product_name)
+        if entry is not None:
+            remove_button_locator = (By.ID, entry.remove_button_id)
+        else:
+            remove_button_locator = (By.XPATH, self.REMOVE_BUTTON_TEMPLATE.format(product_name))
         self.click(remove_button_locator)
-        self.logger.info(f"Removed product from cart: {product_name}")
+        self.step('remove_product_from_cart_by_name', detail=product_name)
+
+    def sort_products(self, option_value):
+
+        Select(self.find_element(self.PRODUCT_SORT_DROPDOWN)).select_by_value(option_value)
+        self.invalidate_snapshot()
+        self.step('sort_products', detail=option_value)
     
     def get_cart_item_count(self):
 
-        if self.is_element_visible(self.SHOPPING_CART_BADGE, timeout=2):
-            return int(self.get_text(self.SHOPPING_CART_BADGE))
-        return 0
+        if self.expect_absent(self.SHOPPING_CART_BADGE, timeout=2):
+            return 0
+        return int(self.get_text(self.SHOPPING_CART_BADGE))
     
     def click_shopping_cart(self):
         self.click(self.SHOPPING_CART_LINK)
-        self.logger.info("Clicked shopping cart")
+        self.invalidate_snapshot()
+        self.step('click_shopping_cart')
     
     def get_product_price(self, product_name):
 
+        entry = self.get_catalog_entry(product_name)
+        if entry is not None:
+            return entry.price
         price_locator = (By.XPATH, self.PRODUCT_PRICE_TEMPLATE.format(product_name))
         return self.get_text(price_locator)
     
     def is_product_displayed(self, product_name):
 
+        # A product in the snapshot is answered from it; one that is listed but not displayed is not waited for
+        entry = self.get_catalog_entry(product_name)
+        if entry is not None:
+            return entry.displayed
         product_locator = (By.XPATH, self.PRODUCT_NAME_TEMPLATE.format(product_name))
         return self.is_element_visible(product_locator, timeout=5)
     
     def logout(self):
         self.click(self.BURGER_MENU)
         self.click(self.LOGOUT_LINK)
-        self.logger.info("Logged out")
+        self.invalidate_snapshot()
+        self.step('logout')
@@ -6,25 +6,23 @@ import pytest
 from pages.login_page import LoginPage
 from pages.products_page import ProductsPage
 from pages.cart_page import CartPage
-from utils.test_data_generator import TestDataGenerator
 import logging
 
 
 class TestFormSubmission:
 
     @pytest.fixture(autouse=True)
-    def setup(self, driver, config):
+    def setup(self, driver, config, logged_in, test_data):
         self.driver = driver
         self.config = config
         self.login_page = LoginPage(driver, config)
         self.products_page = ProductsPage(driver, config)
         self.cart_page = CartPage(driver, config)
-        self.test_data = TestDataGenerator()
+        self.test_data = test_data
         self.logger = logging.getLogger(__name__)
         
-        # Login before each test
-        self.login_page.login_with_valid_credentials()
-        assert self.products_page.is_products_page_loaded(), "Login should be successful"
+        # Login before each test (restored from the login state cache after the first UI login)
+        assert logged_in, "Login should be successful"
 
     def test_product_add_and_checkout(self):
         self.logger.info("Starting test: test_product_add_and_checkout")
@@ -97,3 +95,31 @@ class TestFormSubmission:
         assert "checkout-complete" in self.driver.current_url, "URL should indicate checkout complete"
 
         self.logger.info("Test passed: test_product_add_and_checkout_fail")
+
+    def test_seeded_cart_matches_ui_path(self, state_seeder):
+        self.logger.info("Starting test: test_seeded_cart_matches_ui_path")
+
+        product_names = ["Sauce Labs Backpack", "Sauce Labs Bike Light"]
+        matches, ui_state, seeded_state = state_seeder.validate_cart(product_names)
+
+        assert matches, f"Seeded cart should match the UI path: ui={ui_state} seeded={seeded_state}"
+
+        self.logger.info("Test passed: test_seeded_cart_matches_ui_path")
+
+    def test_checkout_from_seeded_cart(self, state_seeder):
+        self.logger.info("Starting test: test_checkout_from_seeded_cart")
+
+        # Starts on the cart page with the product already in it, skipping the inventory clicks
+        cart_page = CartPage.from_state(self.driver, self.config, {'cart': ["Sauce Labs Backpack"]}, seeder=state_seeder)
+        assert cart_page.get_cart_item_names() == ["Sauce Labs Backpack"], "Seeded product should be in the cart"
+
+        checkout_data = self.test_data.generate_checkout_data()
+        is_complete = cart_page.complete_checkout(
+            checkout_data['first_name'],
+            checkout_data['last_name'],
+            checkout_data['postal_code']
+        )
+
+        assert is_complete, "Checkout should be successful"
+
+        self.logger.info("Test passed: test_checkout_from_seeded_cart")
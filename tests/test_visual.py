@@ -0,0 +1,53 @@
+"""
+Visual Regression Tests
+"""
+
+import pytest
+from pages.login_page import LoginPage
+from pages.products_page import ProductsPage
+import logging
+
+
+@pytest.mark.visual
+@pytest.mark.full_profile
+class TestVisual:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, driver, config):
+        self.driver = driver
+        self.config = config
+        self.products_page = ProductsPage(driver, config)
+        self.logger = logging.getLogger(__name__)
+
+    @pytest.mark.parametrize('logged_in', ['standard_user'], indirect=True)
+    def test_inventory_matches_baseline(self, logged_in, visual_regression):
+        self.logger.info("Starting test: test_inventory_matches_baseline")
+
+        assert logged_in, "Login should be successful"
+        assert self.products_page.is_products_page_loaded(), "Products page should be loaded"
+
+        result = visual_regression('inventory')
+        assert result.passed, f"Inventory page differs from baseline: {result.mismatch_ratio:.2%} of pixels changed"
+
+        self.logger.info("Test passed: test_inventory_matches_baseline")
+
+    @pytest.mark.parametrize('logged_in', ['standard_user'], indirect=True)
+    def test_visual_user_inventory_differs_from_baseline(self, logged_in, visual_regression):
+        self.logger.info("Starting test: test_visual_user_inventory_differs_from_baseline")
+
+        assert logged_in, "Login should be successful"
+        assert self.products_page.is_products_page_loaded(), "Products page should be loaded"
+
+        # The standard_user reference is captured by this test itself, so it runs in any order and on any worker
+        reference = visual_regression('inventory_standard_reference', record=True)
+        assert reference.status == 'new', "Reference baseline should be recorded"
+
+        self.products_page.logout()
+        credentials = self.config['users']['visual_user']
+        LoginPage(self.driver, self.config).login(credentials['username'], credentials['password'])
+        assert self.products_page.is_products_page_loaded(), "Products page should be loaded for visual_user"
+
+        result = visual_regression('inventory_standard_reference', create_missing=False)
+        assert not result.passed, "visual_user rendering should be flagged as a visual regression"
+
+        self.logger.info("Test passed: test_visual_user_inventory_differs_from_baseline")
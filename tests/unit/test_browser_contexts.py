@@ -0,0 +1,142 @@
+"""
+Test cases for the browser context pool's preparation and host recycling
+"""
+
+import pytest
+from utils.browser_contexts import BrowserContextPool
+
+
+class _SwitchTo:
+
+    def __init__(self, host):
+        self.host = host
+
+    def window(self, handle):
+        self.host.current_window_handle = handle
+
+
+class _Host:
+    """Stands in for a Chrome session: answers the Target commands the pool sends"""
+
+    def __init__(self):
+        self.current_window_handle = 'home'
+        self.window_handles = ['home']
+        self.switch_to = _SwitchTo(self)
+        self.disposed = []
+        self._targets = 0
+
+    def execute_cdp_cmd(self, command, params):
+        if command == 'Target.createBrowserContext':
+            return {'browserContextId': f"context-{self._targets}"}
+        if command == 'Target.createTarget':
+            self._targets += 1
+            self.window_handles.append(f"target-{self._targets}")
+            return {'targetId': f"target-{self._targets}"}
+        if command == 'Target.disposeBrowserContext':
+            self.disposed.append(params['browserContextId'])
+        return {}
+
+
+class _Browsers:
+
+    def __init__(self):
+        self.started = []
+        self.retired = []
+
+    def acquire(self):
+        host = _Host()
+        self.started.append(host)
+        return host
+
+    def retire(self, host):
+        self.retired.append(host)
+
+
+@pytest.mark.unit
+class TestBrowserContextPool:
+
+    @pytest.fixture
+    def browsers(self):
+        return _Browsers()
+
+    def _pool(self, browsers, **kwargs):
+        return BrowserContextPool(browsers.acquire, browsers.retire, **kwargs)
+
+    def test_contexts_share_a_browser_up_to_the_cap(self, browsers):
+        pool = self._pool(browsers, contexts_per_browser=2)
+
+        first, second, third = pool.acquire(), pool.acquire(), pool.acquire()
+
+        assert first.host is second.host
+        assert third.host is not first.host
+        assert len(browsers.started) == 2
+        assert first.window_handle == 'target-1'
+
+    def test_every_context_is_prepared(self, browsers):
+        prepared = []
+        pool = self._pool(browsers, prepare_context=prepared.append)
+
+        contexts = [pool.acquire(), pool.acquire()]
+
+        assert prepared == contexts
+
+    def test_host_is_retired_after_max_contexts_once_the_last_is_closed(self, browsers):
+        pool = self._pool(browsers, max_contexts_per_browser=2)
+        first, second = pool.acquire(), pool.acquire()
+
+        first.quit()
+        assert browsers.retired == []
+        second.quit()
+        assert browsers.retired == [first.host]
+
+        assert pool.acquire().host is not first.host
+
+    def test_recycle_check_retires_the_host(self, browsers):
+        checks = []
+
+        def recycle_check(host, uses):
+            checks.append(uses)
+            return 'memory above threshold' if uses == 2 else None
+
+        pool = self._pool(browsers, recycle_check=recycle_check)
+        first = pool.acquire()
+        first.quit()
+        assert browsers.retired == []
+
+        second = pool.acquire()
+        assert second.host is first.host
+        second.quit()
+
+        assert checks == [1, 2]
+        assert browsers.retired == [first.host]
+
+    def test_retiring_host_takes_no_new_contexts(self, browsers):
+        pool = self._pool(browsers, recycle_check=lambda host, uses: 'memory above threshold')
+        first, second = pool.acquire(), pool.acquire()
+
+        first.quit()
+        third = pool.acquire()
+
+        assert third.host is not first.host
+        assert browsers.retired == []
+        second.quit()
+        assert browsers.retired == [first.host]
+
+    def test_hung_browser_is_retired_without_switching_windows(self, browsers):
+        pool = self._pool(browsers)
+        context = pool.acquire()
+        context.needs_recycle = True
+
+        context.quit()
+
+        assert browsers.retired == [context.host]
+        assert context.host.disposed == ['context-0']
+        assert context.host.current_window_handle == 'home'
+
+    def test_close_retires_every_host(self, browsers):
+        pool = self._pool(browsers, contexts_per_browser=1)
+        pool.acquire(), pool.acquire()
+
+        pool.close()
+
+        assert browsers.retired == browsers.started
@@ -0,0 +1,129 @@
+"""
+Test cases for the driver pool's reset and recycling
+"""
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+from utils.driver_pool import DriverPool
+from utils.session_stats import SessionStats
+
+
+class _Driver:
+    """Records the WebDriver calls the pool makes"""
+
+    def __init__(self, fail_reset=False):
+        self.fail_reset = fail_reset
+        self.calls = []
+        self.quit_called = False
+
+    def maximize_window(self):
+        self.calls.append('maximize_window')
+
+    def get(self, url):
+        self.calls.append(f"get {url}")
+
+    def execute_script(self, script):
+        if self.fail_reset:
+            raise WebDriverException("session deleted")
+        self.calls.append('clear storage')
+
+    def delete_all_cookies(self):
+        self.calls.append('delete_all_cookies')
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.mark.unit
+class TestDriverPool:
+
+    @pytest.fixture
+    def created(self):
+        return []
+
+    @pytest.fixture
+    def retired(self):
+        return []
+
+    def _pool(self, created, retired, **kwargs):
+        def factory():
+            driver = _Driver()
+            created.append(driver)
+            return driver
+        return DriverPool(factory, 'https://example.test', SessionStats(), retire_driver=retired.append, **kwargs)
+
+    def test_new_driver_opens_the_base_url(self, created, retired):
+        pool = self._pool(created, retired)
+
+        driver = pool.acquire()
+
+        assert driver.calls == ['maximize_window', 'get https://example.test']
+        assert pool.stats.sections['driver pool'] == {'misses': 1}
+
+    def test_released_driver_is_reset_and_reused(self, created, retired):
+        pool = self._pool(created, retired)
+        driver = pool.acquire()
+        pool.release(driver)
+        driver.calls.clear()
+
+        assert pool.acquire() is driver
+        assert driver.calls == ['clear storage', 'delete_all_cookies', 'get https://example.test']
+        assert pool.stats.sections['driver pool']['hits'] == 1
+        assert len(pool.stats.sections['driver pool']['reset_ms']) == 1
+
+    def test_driver_is_recycled_after_max_tests(self, created, retired):
+        pool = self._pool(created, retired, max_tests_per_driver=2)
+        driver = pool.acquire()
+        pool.release(driver)
+        assert pool.acquire() is driver
+        pool.release(driver)
+
+        assert retired == [driver]
+        assert pool.acquire() is not driver
+        assert pool.stats.sections['driver pool']['recycled'] == 1
+
+    def test_driver_is_recycled_after_a_failure(self, created, retired):
+        pool = self._pool(created, retired)
+        driver = pool.acquire()
+
+        pool.release(driver, failed=True)
+
+        assert retired == [driver]
+        assert pool.acquire() is not driver
+
+    def test_recycle_check_is_asked_with_the_test_count(self, created, retired):
+        checks = []
+
+        def recycle_check(driver, tests_run):
+            checks.append(tests_run)
+            return 'browser RSS 1600 MB' if tests_run == 2 else None
+
+        pool = self._pool(created, retired, recycle_check=recycle_check)
+        driver = pool.acquire()
+        pool.release(driver)
+        pool.release(pool.acquire())
+
+        assert checks == [1, 2]
+        assert retired == [driver]
+
+    def test_driver_that_fails_to_reset_is_discarded(self, created, retired):
+        pool = self._pool(created, retired)
+        driver = pool.acquire()
+        pool.release(driver)
+        driver.fail_reset = True
+
+        replacement = pool.acquire()
+
+        assert replacement is not driver
+        assert retired == [driver]
+        assert len(created) == 2
+
+    def test_close_quits_idle_drivers(self, created, retired):
+        pool = self._pool(created, retired)
+        driver = pool.acquire()
+        pool.release(driver)
+
+        pool.close()
+
+        assert driver.quit_called
+        assert retired == []
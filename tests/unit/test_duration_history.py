@@ -0,0 +1,103 @@
+"""
+Test cases for the test duration history and the LPT plan
+"""
+
+import json
+import pytest
+from utils.duration_history import DurationHistory, lpt_plan
+
+
+@pytest.mark.unit
+class TestLPTPlan:
+
+    def test_longest_tests_spread_over_workers(self):
+        plan = lpt_plan({'a': 7, 'b': 6, 'c': 5, 'd': 4, 'e': 3, 'f': 2}, 2)
+
+        assert [worker for _, worker, _ in plan] == [0, 1]
+        assert plan[0] == (14, 0, ['a', 'd', 'e'])
+        assert plan[1] == (13, 1, ['b', 'c', 'f'])
+
+    def test_more_workers_than_tests(self):
+        plan = lpt_plan({'a': 3.0}, 3)
+
+        assert plan == [(3.0, 0, ['a']), (0.0, 1, []), (0.0, 2, [])]
+
+    def test_ties_are_ordered_by_nodeid(self):
+        plan = lpt_plan({'b': 1.0, 'a': 1.0, 'c': 1.0}, 1)
+
+        assert plan == [(3.0, 0, ['a', 'b', 'c'])]
+
+
+@pytest.mark.unit
+class TestDurationHistory:
+
+    @pytest.fixture
+    def history_path(self, tmp_path):
+        return tmp_path / 'durations.json'
+
+    def _history(self, path, tests=None, **kwargs):
+        if tests is not None:
+            path.write_text(json.dumps(tests))
+        return DurationHistory(path, **kwargs)
+
+    def test_known_test_uses_its_history(self, history_path):
+        history = self._history(history_path, {'t::a': {'duration': 12.5, 'runs': 3}})
+
+        assert history.estimate('t::a', ['slow']) == 12.5
+
+    def test_new_test_uses_its_largest_marker_estimate(self, history_path):
+        history = self._history(history_path, {'t::a': {'duration': 12.5, 'runs': 3}},
+                                marker_estimates={'slow': 60.0, 'smoke': 10.0})
+
+        assert history.estimate('t::new', ['smoke']) == 10.0
+        assert history.estimate('t::new', ['smoke', 'slow', 'login']) == 60.0
+
+    def test_new_test_without_marker_estimate_uses_median(self, history_path):
+        tests = {f't::{name}': {'duration': duration, 'runs': 1} for name, duration in zip('abcd', (4.0, 1.0, 9.0, 2.0))}
+        history = self._history(history_path, tests)
+
+        # Upper median of 1, 2, 4, 9
+        assert history.estimate('t::new', ['login']) == 4.0
+
+    def test_empty_history_uses_default(self, history_path):
+        history = self._history(history_path, default_estimate=7.0)
+
+        assert history.estimate('t::new') == 7.0
+
+    def test_update_smooths_durations(self, history_path):
+        history = self._history(history_path, smoothing=0.25)
+
+        history.update('t::a', 10.0, driver_acquire=2.0)
+        assert history.tests['t::a'] == {'duration': 10.0, 'driver_acquire': 2.0, 'runs': 1}
+
+        history.update('t::a', 20.0, driver_acquire=6.0)
+        history.update('t::a', 12.5)
+        assert history.tests['t::a'] == {'duration': 12.5, 'driver_acquire': 3.0, 'runs': 3}
+
+    def test_update_fills_missing_driver_acquire(self, history_path):
+        history = self._history(history_path, {'t::a': {'duration': 5.0, 'driver_acquire': None, 'runs': 1}})
+
+        history.update('t::a', 5.0, driver_acquire=1.5)
+        assert history.tests['t::a']['driver_acquire'] == 1.5
+
+    def test_save_and_reload(self, history_path):
+        history = self._history(history_path)
+        history.update('t::a', 3.0)
+        history.save()
+
+        assert DurationHistory(history_path).tests == history.tests
+        assert not history_path.with_name(f"{history_path.name}.tmp").exists()
+
+    def test_config_path_is_relative_to_the_project_root(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        root = tmp_path / 'project'
+
+        history = DurationHistory.from_config(root, {'scheduling': {'history_path': 'durations.json'}})
+
+        assert history.path == root / 'durations.json'
+        assert DurationHistory.from_config(root, {}).path == root / '.pytest_durations.json'
+
+    def test_unreadable_history_is_ignored(self, history_path):
+        history_path.write_text('{not json')
+
+        assert DurationHistory(history_path).tests == {}
@@ -0,0 +1,143 @@
+"""
+Test cases for the failure artifact bundle's size cap and the hung-browser timeout
+"""
+
+import base64
+import json
+import os
+import socket
+import time
+import zipfile
+import pytest
+from selenium.webdriver.chrome.webdriver import WebDriver
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+from selenium.webdriver.remote.errorhandler import ErrorHandler
+from utils.failure_artifacts import FailureArtifactCollector
+from utils.session_stats import SessionStats
+
+KB = 1024
+
+
+class _Executor:
+    pass
+
+
+class _Driver:
+    """Answers the three captures at once with artifacts of the given sizes"""
+
+    def __init__(self, screenshot_bytes, dom_bytes):
+        self.command_executor = _Executor()
+        # Random bytes do not compress, so their size in the bundle is known
+        self.screenshot = base64.b64encode(os.urandom(screenshot_bytes)).decode('ascii')
+        self.dom = os.urandom(dom_bytes // 2).hex()
+
+    def get_screenshot_as_base64(self):
+        return self.screenshot
+
+    def execute_script(self, script):
+        return {'url': 'https://example.test/cart.html', 'title': 'Swag Labs', 'dom': self.dom,
+                'network': [{'name': 'https://example.test/cart.html', 'duration_ms': 12.5}]}
+
+    def get_log(self, log_type):
+        return [{'level': 'SEVERE', 'message': 'Uncaught TypeError'}]
+
+
+def _collector(tmp_path, **artifacts_config):
+    return FailureArtifactCollector({'failure_artifacts': dict(path=str(tmp_path), **artifacts_config)},
+                                    SessionStats())
+
+
+def _bundle(path):
+    with zipfile.ZipFile(path) as bundle:
+        return bundle.namelist(), json.loads(bundle.read('meta.json'))
+
+
+@pytest.mark.unit
+class TestBundleSizeCap:
+
+    def test_everything_fits(self, tmp_path):
+        bundle_path, screenshot = _collector(tmp_path).collect(_Driver(16 * KB, 16 * KB), 'test_cart')
+
+        names, meta = _bundle(bundle_path)
+        assert names == ['url.txt', 'console.json', 'network.json', 'screenshot.png', 'dom.html', 'meta.json']
+        assert meta['skipped_for_size'] == []
+        assert meta['timed_out'] == [] and meta['errors'] == {}
+        assert screenshot is not None
+
+    def test_lowest_priority_entries_are_dropped_first(self, tmp_path):
+        # 64 KB cap: the small text entries and the 40 KB screenshot fit, the DOM (about 40 KB deflated) does not
+        collector = _collector(tmp_path, max_bundle_mb=64 / 1024)
+
+        bundle_path, _ = collector.collect(_Driver(40 * KB, 80 * KB), 'test_cart')
+
+        names, meta = _bundle(bundle_path)
+        assert names == ['url.txt', 'console.json', 'network.json', 'screenshot.png', 'meta.json']
+        assert meta['skipped_for_size'] == ['dom.html']
+
+    def test_smaller_entries_still_fit_after_a_skipped_one(self, tmp_path):
+        collector = _collector(tmp_path, max_bundle_mb=64 / 1024)
+
+        bundle_path, _ = collector.collect(_Driver(80 * KB, 8 * KB), 'test_cart')
+
+        names, meta = _bundle(bundle_path)
+        assert names == ['url.txt', 'console.json', 'network.json', 'dom.html', 'meta.json']
+        assert meta['skipped_for_size'] == ['screenshot.png']
+
+    def test_nothing_but_meta_under_a_tiny_cap(self, tmp_path):
+        collector = _collector(tmp_path, max_bundle_mb=0)
+
+        bundle_path, _ = collector.collect(_Driver(1 * KB, 1 * KB), 'test_cart')
+
+        names, meta = _bundle(bundle_path)
+        assert names == ['meta.json']
+        assert meta['skipped_for_size'] == list(FailureArtifactCollector.PRIORITY)
+
+
+@pytest.mark.unit
+class TestHungBrowser:
+
+    @pytest.fixture
+    def hung_server(self):
+        # Accepts connections (through the listen backlog) but never answers, like a hung chromedriver
+        server = socket.socket()
+        server.bind(('127.0.0.1', 0))
+        server.listen(16)
+        yield f"http://127.0.0.1:{server.getsockname()[1]}"
+        server.close()
+
+    def _driver(self, url):
+        driver = object.__new__(WebDriver)
+        driver.command_executor = ChromiumRemoteConnection(url, 'goog', 'chrome', keep_alive=True, ignore_proxy=True)
+        driver.error_handler = ErrorHandler()
+        driver.session_id = 'hung-session'
+        driver.caps = {'browserName': 'chrome'}
+        driver.pinned_scripts = {}
+        return driver
+
+    def test_capture_gives_up_and_marks_the_driver_for_recycling(self, tmp_path, hung_server):
+        collector = _collector(tmp_path, timeout=1)
+        driver = self._driver(hung_server)
+
+        started_at = time.perf_counter()
+        bundle_path, screenshot = collector.collect(driver, 'test_cart')
+        elapsed = time.perf_counter() - started_at
+
+        assert elapsed < 5
+        assert driver.needs_recycle
+        assert screenshot is None
+        names, meta = _bundle(bundle_path)
+        assert names == ['meta.json']
+        assert meta['timed_out'] == ['screenshot', 'page_state', 'console']
+        assert meta['errors'] == {}
+        assert collector.stats.sections['failure artifacts']['bundles'] == 1
+
+    def test_teardown_commands_give_up_too(self, tmp_path, hung_server):
+        collector = _collector(tmp_path, timeout=1)
+        driver = self._driver(hung_server)
+        collector.collect(driver, 'test_cart')
+
+        started_at = time.perf_counter()
+        with pytest.raises(Exception):
+            driver.execute_script('return 1')
+
+        assert time.perf_counter() - started_at < 5
@@ -0,0 +1,86 @@
+"""
+Test cases for the latency histogram
+"""
+
+import pytest
+from utils.latency_histogram import LatencyHistogram
+
+
+@pytest.mark.unit
+class TestLatencyHistogram:
+
+    def test_small_values_have_exact_buckets(self):
+        histogram = LatencyHistogram()
+
+        for value_us in range(0, 128):
+            index = histogram._index(value_us)
+            assert index == value_us
+            assert histogram._bucket(index) == (value_us, 1)
+
+    @pytest.mark.parametrize('value_us', [128, 129, 255, 256, 1000, 65_537, 1_234_567, (1 << 40) - 1])
+    def test_bucket_contains_value(self, value_us):
+        histogram = LatencyHistogram()
+
+        low, width = histogram._bucket(histogram._index(value_us))
+        assert low <= value_us < low + width
+        # 64 linear sub-buckets per power of two keep the relative bucket width at most 1/64
+        assert width / value_us <= 1 / 64
+
+    def test_bucket_indexes_are_contiguous(self):
+        histogram = LatencyHistogram()
+
+        previous_end = 0
+        for index in range(len(histogram.counts)):
+            low, width = histogram._bucket(index)
+            assert low == previous_end
+            previous_end = low + width
+        assert histogram._index((1 << LatencyHistogram.MAX_BITS) - 1) < len(histogram.counts)
+
+    def test_percentiles_within_relative_error(self):
+        histogram = LatencyHistogram()
+        values_ms = [index * 0.5 for index in range(1, 2001)]
+        for value in values_ms:
+            histogram.record(value)
+
+        for percent in (50, 95, 99):
+            expected = values_ms[-(-len(values_ms) * percent // 100) - 1]
+            assert histogram.percentile(percent) == pytest.approx(expected, rel=0.01)
+        assert histogram.percentile(100) == 1000.0
+        assert histogram.count == 2000
+        assert histogram.mean == pytest.approx(500.25)
+
+    def test_percentile_capped_at_max(self):
+        histogram = LatencyHistogram()
+        histogram.record(1000.0)
+
+        assert histogram.percentile(50) == 1000.0
+
+    def test_empty_histogram(self):
+        histogram = LatencyHistogram()
+
+        assert histogram.percentile(99) == 0.0
+        assert histogram.mean == 0.0
+        assert histogram.min_us is None
+
+    def test_values_are_clamped(self):
+        histogram = LatencyHistogram()
+        histogram.record(-5)
+        histogram.record(1e12)
+
+        assert histogram.min_us == 0
+        assert histogram.max_us == (1 << LatencyHistogram.MAX_BITS) - 1
+        assert sum(histogram.counts) == 2
+
+    def test_merge(self):
+        first, second = LatencyHistogram(), LatencyHistogram()
+        for value in (1, 2, 3):
+            first.record(value)
+        for value in (10, 20):
+            second.record(value)
+
+        merged = LatencyHistogram().merge(first).merge(second)
+        assert merged.count == 5
+        assert merged.min_us == 1000
+        assert merged.max_us == 20000
+        assert merged.total_us == 36000
+        assert merged.percentile(40) == pytest.approx(2.0, rel=0.01)
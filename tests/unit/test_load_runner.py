@@ -0,0 +1,92 @@
+"""
+Test cases for the load runner's report and virtual user lifecycle
+"""
+
+import pytest
+import utils.webdriver_manager
+from utils.latency_histogram import LatencyHistogram
+from utils.load_runner import LoadReport, run_virtual_user
+
+
+def _histogram(*values_ms):
+    histogram = LatencyHistogram()
+    for value in values_ms:
+        histogram.record(value)
+    return histogram
+
+
+def _result(scenario, user, histograms, errors=None, completed=1, failed=0):
+    return {
+        'scenario': scenario, 'user': user, 'histograms': histograms, 'errors': errors or {},
+        'completed': completed, 'failed': failed, 'active_s': 10.0,
+    }
+
+
+@pytest.mark.unit
+class TestLoadReport:
+
+    def test_merges_results_per_scenario_and_persona(self):
+        report = LoadReport([
+            _result('browse', 'standard_user', {'login': _histogram(10, 20)}, {'login': 1}),
+            _result('browse', 'standard_user', {'login': _histogram(30)}, {'login': 2, 'sort': 1}),
+            _result('checkout', 'standard_user', {'login': _histogram(40)}),
+        ], elapsed_s=10)
+
+        assert report.steps[('browse', 'standard_user')]['login'].count == 3
+        assert report.steps[('checkout', 'standard_user')]['login'].count == 1
+        assert report.errors[('browse', 'standard_user')] == {'login': 3, 'sort': 1}
+
+    def test_lines(self):
+        report = LoadReport([
+            _result('browse', 'standard_user', {'login': _histogram(10, 20)}, {'sort': 1}, completed=3, failed=1),
+        ], elapsed_s=60, crashed=1)
+
+        lines = report.lines()
+        assert lines[0] == ("1 virtual users (1 crashed), 60 s, 3 iterations completed, "
+                            "1 failed (3.0 iterations/min)")
+        assert lines[1] == "browse as standard_user:"
+        login, sort = lines[3].split(), lines[4].split()
+        assert login[:3] == ['login', '2', '0']
+        assert float(login[3]) == pytest.approx(10.0, rel=0.01)
+        assert float(login[6]) == 20.0
+        # A step that only ever failed still gets a row
+        assert sort[:3] == ['sort', '0', '1']
+
+    def test_zero_elapsed_time(self):
+        report = LoadReport([], elapsed_s=0)
+
+        assert report.lines() == ["0 virtual users (0 crashed), 0 s, 0 iterations completed, 0 failed (0.0 iterations/min)"]
+
+
+class _FailingManager:
+
+    instances = []
+
+    def __init__(self, config, stats=None):
+        self.shut_down = False
+        self.retired = []
+        _FailingManager.instances.append(self)
+
+    def acquire_driver(self):
+        raise RuntimeError("browser failed to start")
+
+    def retire_driver(self, driver):
+        self.retired.append(driver)
+
+    def shutdown(self):
+        self.shut_down = True
+
+
+@pytest.mark.unit
+class TestRunVirtualUser:
+
+    def test_shuts_down_when_the_browser_fails_to_start(self, monkeypatch):
+        monkeypatch.setattr(utils.webdriver_manager, 'WebDriverManager', _FailingManager)
+        _FailingManager.instances.clear()
+
+        with pytest.raises(RuntimeError):
+            run_virtual_user(0, 'browse', 'standard_user', {'users': {'standard_user': {}}}, start_at=0, stop_at=0)
+
+        manager, = _FailingManager.instances
+        assert manager.shut_down
+        assert manager.retired == []
@@ -0,0 +1,106 @@
+"""
+Test cases for the LPT xdist scheduler
+
+LPTScheduling builds on pytest-xdist's LoadScheduling internals (pending, node2pending, _send_tests), so these
+tests run it against the installed pytest-xdist with stand-in worker nodes.
+"""
+
+import pytest
+from utils.lpt_scheduling import LPTScheduling
+
+
+class _Config:
+
+    def __init__(self, workers):
+        self.workers = workers
+
+    def getvalue(self, name):
+        return [f'{self.workers}*popen'] if name == 'tx' else None
+
+    def getoption(self, name):
+        return None
+
+
+class _Gateway:
+
+    def __init__(self, worker_id):
+        self.id = worker_id
+
+
+class _Node:
+
+    def __init__(self, worker_id):
+        self.gateway = _Gateway(worker_id)
+        self.shutting_down = False
+        self.sent = []
+
+    def send_runtest_some(self, indices):
+        self.sent.extend(indices)
+
+    def shutdown(self):
+        self.shutting_down = True
+
+
+ESTIMATES = {'t::a': 10.0, 't::b': 5.0, 't::c': 30.0, 't::d': 1.0, 't::e': 0.5, 't::f': 0.1}
+
+
+def _scheduler(estimates, workers=2):
+    scheduler = LPTScheduling(_Config(workers), load_estimates=lambda nodeids: {
+        nodeid: estimates[nodeid] for nodeid in nodeids if nodeid in estimates
+    })
+    nodes = [_Node(f'gw{index}') for index in range(workers)]
+    collection = sorted(ESTIMATES)
+    for node in nodes:
+        scheduler.add_node(node)
+        scheduler.add_node_collection(node, collection)
+    scheduler.schedule()
+    return scheduler, nodes
+
+
+def _names(scheduler, indices):
+    return [scheduler.collection[index] for index in indices]
+
+
+@pytest.mark.unit
+class TestLPTScheduling:
+
+    def test_initial_dispatch_is_longest_first(self):
+        scheduler, (first, second) = _scheduler(ESTIMATES)
+
+        # First round in order, second in reverse: the worker with the shorter first test gets the next-longest
+        assert _names(scheduler, first.sent) == ['t::c', 't::d']
+        assert _names(scheduler, second.sent) == ['t::a', 't::b']
+        assert _names(scheduler, scheduler.pending) == ['t::e', 't::f']
+        assert scheduler.predicted_makespan == 30.0
+
+    def test_completed_test_is_replaced_up_to_lookahead(self):
+        scheduler, (first, second) = _scheduler(ESTIMATES)
+        index = scheduler.collection.index
+
+        scheduler.mark_test_complete(second, index('t::a'), duration=9.0)
+        assert _names(scheduler, second.sent) == ['t::a', 't::b', 't::e']
+        assert len(scheduler.node2pending[second]) == LPTScheduling.LOOKAHEAD
+
+        scheduler.mark_test_complete(second, index('t::b'), duration=4.0)
+        scheduler.mark_test_complete(second, index('t::e'), duration=0.5)
+        assert _names(scheduler, second.sent) == ['t::a', 't::b', 't::e', 't::f']
+        assert not scheduler.pending
+
+        scheduler.mark_test_complete(second, index('t::f'), duration=0.1)
+        assert second.shutting_down
+        assert not first.shutting_down
+        assert scheduler.busy == {'gw1': pytest.approx(13.6)}
+
+    def test_unknown_tests_sort_last(self):
+        scheduler, (first, second) = _scheduler({'t::b': 2.0, 't::e': 1.0})
+
+        assert _names(scheduler, first.sent[:1] + second.sent[:1]) == ['t::b', 't::e']
+
+    def test_summary_lines(self):
+        scheduler, (first, second) = _scheduler(ESTIMATES)
+        assert scheduler.summary_lines() == []
+
+        scheduler.mark_test_complete(first, scheduler.collection.index('t::c'), duration=28.0)
+        lines = scheduler.summary_lines()
+        assert lines[0] == "LPT schedule over 1 workers:"
+        assert lines[1] == "  predicted makespan: 30.0 s"
@@ -0,0 +1,57 @@
+"""
+Test cases for the memory watchdog's recycling thresholds and per-test deltas
+"""
+
+import pytest
+from utils.memory_watchdog import MB, MemorySample, MemoryWatchdog
+from utils.session_stats import SessionStats
+
+
+class _Driver:
+
+    capabilities = {}
+
+    def __init__(self, js_heap):
+        self.js_heap = js_heap
+
+    def execute_script(self, script):
+        return self.js_heap
+
+
+@pytest.mark.unit
+class TestMemoryWatchdog:
+
+    @pytest.fixture
+    def watchdog(self):
+        return MemoryWatchdog({'memory_watchdog': {'max_browser_rss_mb': 1000, 'max_js_heap_mb': 200}}, SessionStats())
+
+    def test_below_thresholds(self, watchdog):
+        assert watchdog.recycle_reason(MemorySample(1000, 50, 200)) is None
+        assert watchdog.recycle_reason(MemorySample(None, None, None)) is None
+
+    def test_browser_rss_above_threshold(self, watchdog):
+        assert watchdog.recycle_reason(MemorySample(1000.4, 50, 10)) == "browser RSS 1000 MB"
+
+    def test_js_heap_above_threshold(self, watchdog):
+        assert watchdog.recycle_reason(MemorySample(None, None, 250)) == "JS heap 250 MB"
+
+    def test_browser_rss_is_reported_first(self, watchdog):
+        assert watchdog.recycle_reason(MemorySample(1200, 50, 250)) == "browser RSS 1200 MB"
+
+    def test_defaults(self):
+        watchdog = MemoryWatchdog({})
+
+        assert (watchdog.max_browser_rss_mb, watchdog.max_js_heap_mb) == (1500, 512)
+
+    def test_record_delta_skips_unknown_fields(self, watchdog):
+        deltas = watchdog.record_delta(MemorySample(500, None, 20), MemorySample(560, 40, 15))
+
+        assert deltas == {'browser_rss_mb': 60, 'js_heap_mb': -5}
+        assert watchdog.stats.sections['browser memory (MB)'] == {
+            'browser_rss_mb delta': [60], 'js_heap_mb delta': [-5], 'browser_rss_mb': [560],
+        }
+
+    def test_sample_without_a_known_browser_process(self, watchdog):
+        sample = watchdog.sample(_Driver(js_heap=64 * MB))
+
+        assert sample == MemorySample(None, None, 64)
@@ -0,0 +1,105 @@
+"""
+Test cases for the asynchronous screenshot writer and the streaming PNG writer
+"""
+
+import base64
+import io
+import numpy as np
+import pytest
+from PIL import Image
+from utils.screenshot_helper import StreamingPngWriter
+from utils.screenshot_writer import ScreenshotWriter
+from utils.session_stats import SessionStats
+
+
+def _png(colour, size=(16, 8)):
+    output = io.BytesIO()
+    Image.new('RGB', size, colour).save(output, format='PNG')
+    return output.getvalue()
+
+
+@pytest.mark.unit
+class TestScreenshotWriter:
+
+    @pytest.fixture
+    def writer(self):
+        writer = ScreenshotWriter(SessionStats(), workers=1)
+        yield writer
+        writer.close()
+
+    def test_identical_frames_are_written_once(self, writer, tmp_path):
+        frame = _png('red')
+
+        first = writer.submit(frame, tmp_path / 'first.png')
+        second = writer.submit(frame, tmp_path / 'second.png')
+        writer.flush()
+
+        assert second is first
+        assert first.future.result() == str(tmp_path / 'first.png')
+        assert not (tmp_path / 'second.png').exists()
+        stats = writer.stats.sections['screenshot pipeline']
+        assert stats['submitted'] == 1
+        assert stats['duplicates'] == 1
+        assert stats['bytes_saved'] == len(frame)
+
+    def test_different_frames_are_both_written(self, writer, tmp_path):
+        first = writer.submit(_png('red'), tmp_path / 'first.png')
+        second = writer.submit(_png('blue'), tmp_path / 'second.png')
+        writer.flush()
+
+        assert first.future.result() != second.future.result()
+        assert (tmp_path / 'first.png').exists() and (tmp_path / 'second.png').exists()
+
+    def test_base64_frames_are_decoded(self, writer, tmp_path):
+        frame = _png('green')
+
+        pending = writer.submit(base64.b64encode(frame).decode('ascii'), tmp_path / 'frame.png')
+
+        assert pending.future.result(timeout=5) == str(tmp_path / 'frame.png')
+        assert (tmp_path / 'frame.png').read_bytes() == frame
+
+    def test_failed_write_is_not_reused(self, writer, tmp_path):
+        frame = _png('red')
+        # A file where the directory should be makes the first write fail
+        (tmp_path / 'blocked').write_text('')
+
+        failed = writer.submit(frame, tmp_path / 'blocked' / 'frame.png')
+        with pytest.raises(OSError):
+            failed.future.result(timeout=5)
+        retried = writer.submit(frame, tmp_path / 'frame.png')
+
+        assert retried is not failed
+        assert retried.future.result(timeout=5) == str(tmp_path / 'frame.png')
+
+    def test_unsupported_format(self):
+        with pytest.raises(ValueError):
+            ScreenshotWriter(image_format='gif')
+
+
+@pytest.mark.unit
+class TestStreamingPngWriter:
+
+    def test_tiles_are_stacked_into_one_image(self, tmp_path):
+        path = tmp_path / 'page.png'
+        top = np.random.default_rng(0).integers(0, 256, (5, 7, 3), dtype=np.uint8)
+        bottom = np.random.default_rng(1).integers(0, 256, (3, 7, 3), dtype=np.uint8)
+
+        with StreamingPngWriter(path) as png:
+            png.write_tile(Image.fromarray(top))
+            png.write_tile(Image.fromarray(bottom))
+
+        with Image.open(path) as image:
+            assert image.size == (7, 8)
+            assert np.array_equal(np.asarray(image.convert('RGB')), np.concatenate([top, bottom]))
+
+    def test_wider_tiles_are_cropped_to_the_first_width(self, tmp_path):
+        path = tmp_path / 'page.png'
+
+        with StreamingPngWriter(path) as png:
+            png.write_tile(Image.new('RGBA', (4, 2), (255, 0, 0, 255)))
+            png.write_tile(Image.new('RGB', (6, 2), (0, 0, 255)))
+
+        with Image.open(path) as image:
+            pixels = np.asarray(image)
+        assert pixels.shape == (4, 4, 3)
+        assert (pixels[:2] == (255, 0, 0)).all() and (pixels[2:] == (0, 0, 255)).all()
@@ -0,0 +1,73 @@
+"""
+Test cases for the session statistics and the step log
+"""
+
+import pytest
+from utils.session_stats import SessionStats
+from utils.step_log import StepLog
+
+
+@pytest.mark.unit
+class TestSessionStats:
+
+    def test_merge_sums_counters_and_concatenates_samples(self):
+        stats = SessionStats()
+        stats.increment('driver pool', 'hits', 2)
+        stats.record('driver pool', 'reset_ms', 10.0)
+
+        stats.merge({'driver pool': {'hits': 3, 'misses': 1, 'reset_ms': [20.0, 30.0]}})
+        stats.merge({'driver pool': {'hits': 1}, 'failure artifacts': {'bundles': 1}})
+
+        assert stats.sections == {
+            'driver pool': {'hits': 6, 'misses': 1, 'reset_ms': [10.0, 20.0, 30.0]},
+            'failure artifacts': {'bundles': 1},
+        }
+
+    def test_summary_lines(self):
+        stats = SessionStats()
+        stats.increment('b', 'count')
+        stats.increment('a', 'ratio', 0.5)
+        for value in range(1, 21):
+            stats.record('a', 'ms', float(value))
+        stats.section('c')['empty'] = []
+
+        assert stats.summary_lines() == [
+            "a:",
+            "  ms: n=20 mean=10.5 p95=19.0 max=20.0",
+            "  ratio: 0.5",
+            "b:",
+            "  count: 1",
+            "c:",
+            "  empty: n=0",
+        ]
+
+
+@pytest.mark.unit
+class TestStepLog:
+
+    def test_keeps_only_the_latest_steps(self):
+        log = StepLog(capacity=3)
+        for step in range(5):
+            log.record('LoginPage', f"step{step}")
+
+        assert len(log) == 3
+        assert [line.split()[-1] for line in log.format_lines()] == ['LoginPage.step2', 'LoginPage.step3',
+                                                                     'LoginPage.step4']
+
+    def test_line_format(self):
+        log = StepLog()
+        log.record('LoginPage', 'click', locator=('id', 'login-button'), duration_ms=12.345, outcome='ok')
+        log.record('LoginPage', 'wait', locator=('css selector', '.error'), detail='visible', outcome='timeout')
+
+        first, second = log.format_lines()
+        assert first.endswith("LoginPage.click id=login-button (12.3 ms)")
+        assert second.endswith("LoginPage.wait css selector=.error visible [timeout]")
+
+    def test_reset_clears_the_buffer(self):
+        log = StepLog()
+        log.record('LoginPage', 'open')
+
+        log.reset()
+
+        assert len(log) == 0
+        assert log.emit('Steps') == []
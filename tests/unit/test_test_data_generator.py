@@ -0,0 +1,83 @@
+"""
+Test cases for the record pool and test data seeding
+"""
+
+import itertools
+import pytest
+# Imported under another name so pytest does not try to collect it as a test class
+from utils.test_data_generator import RecordPool, SeededFaker, get_faker, seed_for
+from utils.test_data_generator import TestDataGenerator as DataGenerator
+
+
+@pytest.mark.unit
+class TestRecordPool:
+
+    def test_every_record_is_handed_out_once_in_order(self):
+        pool = RecordPool(({'id': n, 'name': f"user{n}"} for n in itertools.count()), size=4)
+
+        records = [pool.take() for _ in range(6)]
+
+        assert records == [{'id': n, 'name': f"user{n}"} for n in range(6)]
+
+    def test_fills_a_chunk_at_a_time(self):
+        produced = []
+
+        def generator():
+            for n in itertools.count():
+                produced.append(n)
+                yield {'id': n}
+
+        pool = RecordPool(generator(), size=4)
+        pool.take()
+        assert pool.filled == 4 and len(produced) == 4
+
+        for _ in range(4):
+            pool.take()
+        assert pool.filled == 8 and len(produced) == 8
+
+
+@pytest.mark.unit
+class TestSeeding:
+
+    def test_same_node_id_gives_the_same_data(self):
+        first = DataGenerator.for_test('tests/test_login.py::test_valid_login')
+        second = DataGenerator.for_test('tests/test_login.py::test_valid_login')
+
+        assert first.seed == seed_for('tests/test_login.py::test_valid_login')
+        assert first.generate_person_data() == second.generate_person_data()
+        assert first.generate_random_number() == second.generate_random_number()
+
+    def test_different_node_ids_give_different_data(self):
+        first = DataGenerator.for_test('tests/test_login.py::test_valid_login')
+        second = DataGenerator.for_test('tests/test_login.py::test_locked_out')
+
+        assert first.generate_person_data() != second.generate_person_data()
+
+    def test_generators_do_not_shift_each_other(self):
+        expected = DataGenerator(seed=1).generate_bulk_data('checkout', 3)
+
+        generator = DataGenerator(seed=1)
+        other = DataGenerator(seed=2)
+        records = []
+        for _ in range(3):
+            records.append(generator.generate_checkout_data())
+            other.generate_checkout_data()
+            get_faker().name()
+
+        assert records == expected
+
+    def test_seeded_generators_share_the_locale_faker(self):
+        generator = DataGenerator.for_test('tests/test_login.py::test_valid_login')
+
+        assert isinstance(generator.faker, SeededFaker)
+        assert generator.faker.faker is get_faker('en_US')
+        assert DataGenerator().faker is get_faker('en_US')
+
+    def test_reseeding_restarts_the_sequence(self):
+        generator = DataGenerator(seed=7)
+        first = generator.generate_checkout_data()
+        generator.generate_checkout_data()
+
+        generator.reseed(7)
+
+        assert generator.generate_checkout_data() == first
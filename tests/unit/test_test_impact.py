@@ -0,0 +1,242 @@
+"""
+Test cases for test impact analysis against a temporary git repository
+"""
+
+import subprocess
+import textwrap
+from collections import namedtuple
+import pytest
+from utils.test_impact import ImpactIndex, ImpactSelector, _definitions, head_commit
+
+
+Item = namedtuple('Item', ['nodeid'])
+
+SOURCES = {
+    'pages/products_page.py': '''
+        from utils.state_seeder import seed
+
+
+        class ProductsPage:
+
+            CONTAINER = 'inventory'
+            ITEM = CONTAINER + '_item'
+            READY = [ITEM]
+            TITLE = 'title'
+
+            def open(self):
+                return seed()
+
+            def title(self):
+                return self.TITLE
+    ''',
+    'utils/catalog.py': '''
+        PRODUCTS = ['Backpack', 'Bike Light']
+
+
+        def product_names():
+            return list(PRODUCTS)
+    ''',
+    'utils/state_seeder.py': '''
+        from utils.catalog import PRODUCTS
+
+
+        def seed():
+            return PRODUCTS[0]
+    ''',
+    'utils/session_site.py': '''
+        def start():
+            return 'http://localhost'
+    ''',
+    'tests/test_products.py': '''
+        def test_open():
+            pass
+
+
+        def test_title():
+            pass
+    ''',
+    'conftest.py': '',
+    'README.md': 'docs\n',
+}
+
+RECORDS = {
+    'tests/test_products.py::test_open': [
+        'file:tests/test_products.py', 'file:pages/products_page.py', 'func:pages/products_page.py:ProductsPage.open',
+        'file:utils/state_seeder.py', 'func:utils/state_seeder.py:seed',
+    ],
+    'tests/test_products.py::test_title': [
+        'file:tests/test_products.py', 'file:pages/products_page.py', 'func:pages/products_page.py:ProductsPage.title',
+        'const:TITLE',
+    ],
+    'tests/test_other.py::test_ready': ['file:tests/test_other.py', 'const:READY'],
+}
+
+ITEMS = [Item(nodeid) for nodeid in RECORDS]
+
+
+def _git(root, *args):
+    subprocess.run(['git', *args], cwd=root, check=True, capture_output=True)
+
+
+def _write(root, path, source):
+    (root / path).parent.mkdir(parents=True, exist_ok=True)
+    (root / path).write_text(textwrap.dedent(source))
+
+
+def _edit(root, path, old, new):
+    source = (root / path).read_text()
+    assert old in source
+    (root / path).write_text(source.replace(old, new))
+
+
+@pytest.fixture
+def repo(tmp_path):
+    for path, source in SOURCES.items():
+        _write(tmp_path, path, source)
+    _git(tmp_path, 'init', '-q')
+    _git(tmp_path, 'add', '.')
+    _git(tmp_path, '-c', 'user.name=test', '-c', 'user.email=test@example.com', 'commit', '-q', '-m', 'initial')
+
+    index = ImpactIndex(tmp_path / '.test_impact.json')
+    index.update(RECORDS, head_commit(tmp_path), shared=['file:utils/session_site.py'])
+    index.save()
+    # The index itself is not a change
+    (tmp_path / '.gitignore').write_text('.test_impact.json\n')
+    _git(tmp_path, 'add', '.gitignore')
+    _git(tmp_path, '-c', 'user.name=test', '-c', 'user.email=test@example.com', 'commit', '-q', '-m', 'ignore')
+    return tmp_path
+
+
+def _select(repo, items=ITEMS):
+    selector = ImpactSelector(repo, ImpactIndex(repo / '.test_impact.json'), ignored_paths=['README.md', '.gitignore'])
+    selected, deselected, summary = selector.select(items, 'HEAD')
+    return [item.nodeid for item in selected], summary
+
+
+@pytest.mark.unit
+class TestDefinitions:
+
+    def test_splits_functions_methods_and_constants(self):
+        definitions = _definitions(textwrap.dedent(SOURCES['pages/products_page.py']))
+
+        assert set(definitions) == {
+            'func:ProductsPage.open', 'func:ProductsPage.title', 'const:ProductsPage.CONTAINER',
+            'const:ProductsPage.ITEM', 'const:ProductsPage.READY', 'const:ProductsPage.TITLE',
+            'class:ProductsPage', 'module:',
+        }
+        assert definitions['const:ProductsPage.ITEM'][1] == {'CONTAINER'}
+
+    def test_moved_code_is_unchanged(self):
+        source = textwrap.dedent(SOURCES['utils/catalog.py'])
+
+        assert _definitions(source) == _definitions('\n\n# moved down\n' + source)
+
+    def test_syntax_error(self):
+        assert _definitions('def broken(:\n') is None
+
+
+@pytest.mark.unit
+class TestChangedDefinitions:
+
+    def _changed(self, repo, path):
+        selector = ImpactSelector(repo, ImpactIndex(repo / '.test_impact.json'))
+        return selector._changed_definitions('HEAD', path)
+
+    def test_changed_method(self, repo):
+        _edit(repo, 'pages/products_page.py', 'return self.TITLE', 'return self.TITLE.upper()')
+
+        assert self._changed(repo, 'pages/products_page.py') == {'func:pages/products_page.py:ProductsPage.title'}
+
+    def test_constants_built_from_a_changed_constant_change_too(self, repo):
+        _edit(repo, 'pages/products_page.py', "CONTAINER = 'inventory'", "CONTAINER = 'inventory_list'")
+
+        assert self._changed(repo, 'pages/products_page.py') == {'const:CONTAINER', 'const:ITEM', 'const:READY'}
+
+    def test_module_level_change(self, repo):
+        _edit(repo, 'utils/catalog.py', "'Bike Light'", "'Bolt T-Shirt'")
+
+        assert self._changed(repo, 'utils/catalog.py') == {'module:utils/catalog.py'}
+
+    def test_added_file(self, repo):
+        _write(repo, 'utils/new_helper.py', 'def helper():\n    pass\n')
+
+        assert self._changed(repo, 'utils/new_helper.py') == {'module:utils/new_helper.py'}
+
+
+@pytest.mark.unit
+class TestSelect:
+
+    def test_no_changes(self, repo):
+        selected, summary = _select(repo)
+
+        assert selected == []
+        assert summary == "0 of 3 tests affected by 0 changed files since HEAD"
+
+    def test_changed_function_selects_its_tests(self, repo):
+        _edit(repo, 'pages/products_page.py', 'return self.TITLE', 'return self.TITLE.upper()')
+
+        assert _select(repo)[0] == ['tests/test_products.py::test_title']
+
+    def test_changed_constant_selects_tests_reading_dependents(self, repo):
+        _edit(repo, 'pages/products_page.py', "CONTAINER = 'inventory'", "CONTAINER = 'inventory_list'")
+
+        assert _select(repo)[0] == ['tests/test_other.py::test_ready']
+
+    def test_module_level_change_selects_tests_using_importers(self, repo):
+        # PRODUCTS is read by utils/state_seeder.py, which pages/products_page.py imports in turn
+        _edit(repo, 'utils/catalog.py', "'Bike Light'", "'Bolt T-Shirt'")
+
+        assert _select(repo)[0] == ['tests/test_products.py::test_open', 'tests/test_products.py::test_title']
+
+    def test_changed_test_file_selects_its_tests(self, repo):
+        _edit(repo, 'tests/test_products.py', 'def test_title():\n    pass', 'def test_title():\n    assert True')
+
+        assert _select(repo)[0] == ['tests/test_products.py::test_open', 'tests/test_products.py::test_title']
+
+    def test_tests_missing_from_the_index_run(self, repo):
+        selected, _ = _select(repo, ITEMS + [Item('tests/test_new.py::test_new')])
+
+        assert selected == ['tests/test_new.py::test_new']
+
+    def test_ignored_paths(self, repo):
+        _edit(repo, 'README.md', 'docs', 'more docs')
+
+        assert _select(repo)[0] == []
+
+    @pytest.mark.parametrize('path, reason', [
+        ('utils/session_site.py', 'utils/session_site.py (used by shared fixtures) changed'),
+        ('conftest.py', 'conftest.py changed'),
+    ])
+    def test_shared_and_untracked_changes_run_everything(self, repo, path, reason):
+        _write(repo, path, 'def start():\n    return None\n')
+
+        selected, summary = _select(repo)
+        assert selected == [item.nodeid for item in ITEMS]
+        assert summary == f"running all tests: {reason}"
+
+    def test_generated_output_is_ignored_by_default(self, repo):
+        # Every run rewrites the HTML report and may add failure bundles and baselines, none of them committed
+        _write(repo, 'reports/report.html', '<html></html>')
+        _write(repo, 'reports/failures/test_open_20240101_000000.zip', 'zip')
+        _write(repo, 'visual_baselines/inventory.png', 'png')
+
+        selector = ImpactSelector.from_config(repo, {})
+        selected, _, summary = selector.select(ITEMS, 'HEAD')
+        assert selected == []
+        assert summary == "0 of 3 tests affected by 3 changed files since HEAD"
+
+    def test_shared_paths_run_everything(self, repo):
+        _write(repo, 'utils/webdriver_manager.py', 'def get_driver():\n    return None\n')
+
+        selected, _, summary = ImpactSelector.from_config(repo, {}).select(ITEMS, 'HEAD')
+        assert len(selected) == len(ITEMS)
+        assert summary == "running all tests: utils/webdriver_manager.py (used by shared fixtures) changed"
+
+    def test_index_from_another_history_runs_everything(self, repo):
+        index = ImpactIndex(repo / '.test_impact.json')
+        index.commit = '0' * 40
+        index.save()
+
+        selected, summary = _select(repo)
+        assert selected == [item.nodeid for item in ITEMS]
+        assert summary.startswith("running all tests: ")
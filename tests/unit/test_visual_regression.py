@@ -0,0 +1,66 @@
+"""
+Test cases for the visual comparer
+"""
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+from utils.visual_regression import VisualBaselineStore, VisualComparer
+
+
+def _page(price, shade=0):
+    image = Image.new('RGB', (256, 128), (240, 240, 240))
+    draw = ImageDraw.Draw(image)
+    draw.text((20, 20), "Sauce Labs Backpack", fill=(20, 20, 20))
+    draw.text((20, 60), price, fill=(20, 20, 20))
+    pixels = np.asarray(image).astype(np.int16) + shade
+    return Image.fromarray(pixels.clip(0, 255).astype(np.uint8))
+
+
+@pytest.mark.unit
+class TestVisualComparer:
+
+    @pytest.fixture
+    def compare(self, tmp_path):
+        comparer = VisualComparer(VisualBaselineStore(tmp_path / 'baselines'), tmp_path / 'diffs')
+
+        def compare(image, name='inventory', **kwargs):
+            path = tmp_path / f'{name}_actual.png'
+            image.save(path)
+            return comparer.compare(name, path, **kwargs)
+
+        assert compare(_page('$29.99')).status == 'new'
+        return compare
+
+    def test_unchanged_page_matches(self, compare):
+        result = compare(_page('$29.99'))
+
+        assert result.status == 'match'
+        assert result.changed_tiles == 0
+
+    def test_changed_text_is_a_mismatch(self, compare):
+        result = compare(_page('$81.32'))
+
+        assert result.status == 'mismatch'
+        assert result.changed_tiles > 0
+        assert result.diff_path
+
+    def test_brightness_shift_within_tolerance_matches(self, compare):
+        result = compare(_page('$29.99', shade=-8))
+
+        # The tiles changed and were diffed, but no channel moved by more than the tolerance
+        assert result.status == 'match'
+        assert result.changed_tiles > 0
+        assert result.mismatch_ratio == 0.0
+
+    def test_brightness_shift_beyond_tolerance_is_a_mismatch(self, compare):
+        result = compare(_page('$29.99', shade=-40))
+
+        assert result.status == 'mismatch'
+        assert result.mismatch_ratio == 1.0
+
+    def test_missing_baseline_is_not_created_on_request(self, compare):
+        result = compare(_page('$29.99'), name='other', create_missing=False)
+
+        assert result.status == 'missing'
+        assert not result.passed
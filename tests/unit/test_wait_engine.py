@@ -0,0 +1,64 @@
+"""
+Test cases for the adaptive wait's polling backoff
+"""
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+import utils.wait_engine
+from utils.wait_engine import AdaptiveWait
+
+
+class _Clock:
+    """Stands in for the time module: sleeping only advances the clock"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.mark.unit
+class TestAdaptiveWait:
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        clock = _Clock()
+        monkeypatch.setattr(utils.wait_engine, 'time', clock)
+        return clock
+
+    def test_returns_at_once_when_the_condition_holds(self, clock):
+        assert AdaptiveWait(None, timeout=1).until(lambda driver: 'ready') == 'ready'
+        assert clock.sleeps == []
+
+    def test_poll_interval_backs_off_up_to_the_maximum(self, clock):
+        results = iter([False] * 6 + ['ready'])
+        wait = AdaptiveWait(None, timeout=10, initial_poll=0.01, max_poll=0.05, backoff=2)
+
+        assert wait.until(lambda driver: next(results)) == 'ready'
+        assert clock.sleeps == pytest.approx([0.01, 0.02, 0.04, 0.05, 0.05, 0.05])
+
+    def test_missing_elements_are_retried(self, clock):
+        attempts = []
+
+        def condition(driver):
+            attempts.append(driver)
+            if len(attempts) < 3:
+                raise NoSuchElementException()
+            return True
+
+        assert AdaptiveWait('driver', timeout=1).until(condition)
+        assert attempts == ['driver'] * 3
+
+    def test_times_out_without_sleeping_past_the_deadline(self, clock):
+        wait = AdaptiveWait(None, timeout=0.1, initial_poll=0.04, max_poll=0.25, backoff=2)
+
+        with pytest.raises(TimeoutException, match='never ready'):
+            wait.until(lambda driver: False, 'never ready')
+        assert clock.sleeps == pytest.approx([0.04, 0.06])
+        assert clock.now == pytest.approx(0.1)
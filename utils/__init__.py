@@ -2,8 +2,25 @@
 Package initialization for utils module
 """
 
-from utils.webdriver_manager import WebDriverManager
-from utils.screenshot_helper import ScreenshotHelper
-from utils.test_data_generator import TestDataGenerator
+import importlib
+
+# Exports are imported on first access, so importing one utility does not pull in Selenium, Pillow and Faker
+_exports = {
+    'WebDriverManager': 'utils.webdriver_manager',
+    'ScreenshotHelper': 'utils.screenshot_helper',
+    'TestDataGenerator': 'utils.test_data_generator',
+}
 
 __all__ = ['WebDriverManager', 'ScreenshotHelper', 'TestDataGenerator']
+
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_exports[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
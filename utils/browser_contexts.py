@@ -0,0 +1,179 @@
+"""
+Isolated Browser Contexts
+"""
+
+import threading
+import time
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.mobile import Mobile
+from selenium.webdriver.remote.switch_to import SwitchTo
+from utils.webdriver_manager import SharedServiceChrome
+import logging
+
+
+class _SessionState:
+    """Serialises commands on a shared WebDriver session and tracks which window it is focused on"""
+
+    def __init__(self, home_handle=None):
+        self.lock = threading.RLock()
+        # The host's original window; DevTools commands are sent from it once a context window is gone
+        self.home_handle = home_handle
+        self.current_handle = home_handle
+
+
+class ContextDriver(SharedServiceChrome):
+    """Driver handle for one isolated browser context (own cookies and storage) of a shared Chrome session"""
+
+    def __init__(self, host, pool, context_id, window_handle):
+        # Reuses the host's session and connection instead of starting a new session
+        self.__dict__.update(host.__dict__)
+        self.__dict__.pop('execute', None)
+        # New-document scripts are registered per target, so the context's window needs its own
+        self.__dict__.pop('_request_tracking_installed', None)
+        self._switch_to = SwitchTo(self)
+        self._mobile = Mobile(self)
+        self.pinned_scripts = {}
+        self.host = host
+        self.pool = pool
+        self.context_id = context_id
+        self.window_handle = window_handle
+
+    def execute(self, driver_command, params=None):
+        state = self.pool.session_state(self.host)
+        with state.lock:
+            if driver_command == Command.SWITCH_TO_WINDOW:
+                response = super().execute(driver_command, params)
+                state.current_handle = (params or {}).get('handle')
+                return response
+            if state.current_handle != self.window_handle:
+                super().execute(Command.SWITCH_TO_WINDOW, {'handle': self.window_handle})
+                state.current_handle = self.window_handle
+            return super().execute(driver_command, params)
+
+    def quit(self):
+        # Closes this context only; the browser stays up for other contexts
+        self.pool.release(self)
+
+
+class BrowserContextPool:
+
+    STATS_SECTION = 'browser contexts'
+
+    def __init__(self, acquire_browser, retire_browser, contexts_per_browser=8, max_contexts_per_browser=25,
+                 recycle_check=None, prepare_context=None, stats=None):
+        self.acquire_browser = acquire_browser
+        self.retire_browser = retire_browser
+        self.contexts_per_browser = contexts_per_browser
+        # A browser is retired once it has served this many contexts, like a pooled driver after N tests
+        self.max_contexts_per_browser = max_contexts_per_browser
+        # Optional callable(host, contexts_served) returning a reason to recycle (e.g. memory thresholds) or None
+        self.recycle_check = recycle_check
+        # Optional callable(context) run on every new context, e.g. to apply per-target resource blocking
+        self.prepare_context = prepare_context
+        self.stats = stats
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._hosts = {}
+        self._states = {}
+        self._uses = {}
+        # Hosts that take no new contexts and are retired once their last context is released
+        self._retiring = set()
+
+    def session_state(self, host):
+
+        with self._lock:
+            return self._states.setdefault(id(host), _SessionState())
+
+    def acquire(self):
+
+        started_at = time.perf_counter()
+        host = self._host_with_capacity()
+        state = self.session_state(host)
+        with state.lock:
+            context_id = host.execute_cdp_cmd(
+                'Target.createBrowserContext', {'disposeOnDetach': False}
+            )['browserContextId']
+            target_id = host.execute_cdp_cmd('Target.createTarget', {
+                'url': 'about:blank', 'browserContextId': context_id, 'newWindow': True,
+            })['targetId']
+            # chromedriver derives window handles from DevTools target ids (older versions add a prefix)
+            handle = next((handle for handle in host.window_handles if handle.endswith(target_id)), target_id)
+        context = ContextDriver(host, self, context_id, handle)
+        if self.prepare_context is not None:
+            self.prepare_context(context)
+        self._increment('created')
+        self._record('create_ms', (time.perf_counter() - started_at) * 1000)
+        return context
+
+    def release(self, context):
+
+        state = self.session_state(context.host)
+        with state.lock:
+            try:
+                context.host.execute_cdp_cmd('Target.disposeBrowserContext', {'browserContextId': context.context_id})
+            except Exception as e:
+                self.logger.warning(f"Failed to dispose browser context {context.context_id}: {e}")
+            recycle = getattr(context, 'needs_recycle', False)
+            # A hung browser is about to be retired, so it is not asked to switch windows first
+            if not recycle and state.current_handle == context.window_handle and state.home_handle is not None:
+                context.host.switch_to.window(state.home_handle)
+                state.current_handle = state.home_handle
+        with self._lock:
+            self._hosts[context.host] -= 1
+            uses = self._uses[context.host] = self._uses.get(context.host, 0) + 1
+        # needs_recycle is set by the failure artifact collector when the browser stopped answering
+        reason = 'a hung browser' if recycle else self._recycle_reason(context.host, uses)
+        with self._lock:
+            if reason:
+                if context.host not in self._retiring:
+                    self.logger.info(f"Recycling context host after {reason}")
+                self._retiring.add(context.host)
+            retire = context.host in self._retiring and not self._hosts[context.host]
+            if retire:
+                del self._hosts[context.host]
+                self._states.pop(id(context.host), None)
+                self._uses.pop(context.host, None)
+                self._retiring.discard(context.host)
+        if retire:
+            self._increment('recycled')
+            self.retire_browser(context.host)
+
+    def close(self):
+
+        with self._lock:
+            hosts = list(self._hosts)
+            self._hosts.clear()
+            self._states.clear()
+            self._uses.clear()
+            self._retiring.clear()
+        for host in hosts:
+            self.retire_browser(host)
+
+    def _recycle_reason(self, host, uses):
+        if uses >= self.max_contexts_per_browser:
+            return f"{uses} contexts"
+        if self.recycle_check is not None:
+            return self.recycle_check(host, uses)
+        return None
+
+    def _host_with_capacity(self):
+        with self._lock:
+            for host, open_contexts in self._hosts.items():
+                if open_contexts < self.contexts_per_browser and host not in self._retiring:
+                    self._hosts[host] += 1
+                    return host
+        host = self.acquire_browser()
+        self._increment('browsers')
+        state = _SessionState(host.current_window_handle)
+        with self._lock:
+            self._hosts[host] = 1
+            self._states[id(host)] = state
+        return host
+
+    def _increment(self, key):
+        if self.stats is not None:
+            self.stats.increment(self.STATS_SECTION, key)
+
+    def _record(self, key, value):
+        if self.stats is not None:
+            self.stats.record(self.STATS_SECTION, key, value)
@@ -0,0 +1,33 @@
+"""
+WebDriver Command Counter
+"""
+
+from collections import Counter
+
+
+class CommandCounter:
+
+    STATS_SECTION = 'webdriver commands'
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.counts = Counter()
+        self._original_execute = driver.execute
+        self._shadowed = 'execute' in driver.__dict__
+        # Shadow the bound method on this instance; WebElements send their commands through it too
+        driver.execute = self._execute
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+    def detach(self):
+        if self.driver.__dict__.get('execute') == self._execute:
+            if self._shadowed:
+                self.driver.execute = self._original_execute
+            else:
+                del self.driver.execute
+
+    def _execute(self, driver_command, params=None):
+        self.counts[driver_command] += 1
+        return self._original_execute(driver_command, params)
@@ -0,0 +1,89 @@
+"""
+WebDriver Pool
+"""
+
+import time
+import logging
+from selenium.common.exceptions import WebDriverException
+
+
+class DriverPool:
+
+    STATS_SECTION = 'driver pool'
+
+    CLEAR_STORAGE_SCRIPT = """
+        try { window.localStorage.clear(); } catch (e) {}
+        try { window.sessionStorage.clear(); } catch (e) {}
+    """
+
+    def __init__(self, driver_factory, base_url, stats, max_tests_per_driver=25, retire_driver=None,
+                 recycle_check=None):
+        self.driver_factory = driver_factory
+        self.retire_driver = retire_driver
+        # Optional callable(driver, tests_run) returning a reason to recycle (e.g. memory thresholds) or None
+        self.recycle_check = recycle_check
+        self.base_url = base_url
+        self.stats = stats
+        self.max_tests_per_driver = max_tests_per_driver
+        self.logger = logging.getLogger(__name__)
+        self._idle = []
+        self._uses = {}
+
+    def acquire(self):
+        while self._idle:
+            driver = self._idle.pop()
+            start = time.perf_counter()
+            try:
+                self.reset(driver)
+            except WebDriverException as e:
+                self.logger.warning(f"Discarding pooled driver that failed to reset: {e}")
+                self._discard(driver, retire=True)
+                continue
+            self.stats.record(self.STATS_SECTION, 'reset_ms', (time.perf_counter() - start) * 1000)
+            self.stats.increment(self.STATS_SECTION, 'hits')
+            return driver
+
+        self.stats.increment(self.STATS_SECTION, 'misses')
+        driver = self.driver_factory()
+        driver.maximize_window()
+        driver.get(self.base_url)
+        self._uses[driver] = 0
+        return driver
+
+    def release(self, driver, failed=False):
+        uses = self._uses.get(driver, 0) + 1
+        if failed:
+            reason = 'failure'
+        elif uses >= self.max_tests_per_driver:
+            reason = f'{uses} tests'
+        elif self.recycle_check is not None:
+            reason = self.recycle_check(driver, uses)
+        else:
+            reason = None
+        if reason:
+            self.logger.info(f"Recycling pooled driver after {reason}")
+            self.stats.increment(self.STATS_SECTION, 'recycled')
+            self._discard(driver, retire=True)
+            return
+        self._uses[driver] = uses
+        self._idle.append(driver)
+
+    def reset(self, driver):
+        driver.execute_script(self.CLEAR_STORAGE_SCRIPT)
+        driver.delete_all_cookies()
+        driver.get(self.base_url)
+
+    def close(self):
+        while self._idle:
+            self._discard(self._idle.pop())
+
+    def _discard(self, driver, retire=False):
+        self._uses.pop(driver, None)
+        if retire and self.retire_driver is not None:
+            # Lets the driver manager refill its pre-spawned browsers
+            self.retire_driver(driver)
+            return
+        try:
+            driver.quit()
+        except WebDriverException as e:
+            self.logger.warning(f"Failed to quit pooled driver: {e}")
@@ -0,0 +1,127 @@
+"""
+WebDriver Command Profiler
+"""
+
+import html
+import json
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+
+PAGES_DIR = str(Path(__file__).resolve().parent.parent / 'pages')
+
+OUTSIDE_COMMANDS = '(outside WebDriver commands)'
+
+
+class DriverProfiler:
+
+    STATS_SECTION = 'command latency (ms)'
+
+    def __init__(self, driver, test_id):
+        self.driver = driver
+        self.test_id = test_id
+        self.records = []
+        self.started_at = time.perf_counter()
+        self.finished_at = None
+        self._original_execute = driver.execute
+        self._shadowed = 'execute' in driver.__dict__
+        driver.execute = self._execute
+
+    def detach(self):
+        self.finished_at = time.perf_counter()
+        if self.driver.__dict__.get('execute') == self._execute:
+            if self._shadowed:
+                self.driver.execute = self._original_execute
+            else:
+                del self.driver.execute
+
+    @property
+    def wall_ms(self):
+        return ((self.finished_at or time.perf_counter()) - self.started_at) * 1000
+
+    def _execute(self, driver_command, params=None):
+        start = time.perf_counter()
+        try:
+            return self._original_execute(driver_command, params)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            self.records.append((
+                driver_command,
+                self._locator(params),
+                (start - self.started_at) * 1000,
+                duration_ms,
+                self._page_object_stack(),
+            ))
+
+    @staticmethod
+    def _locator(params):
+        if params and 'using' in params:
+            return f"{params['using']}={params.get('value')}"
+        return None
+
+    @staticmethod
+    def _page_object_stack():
+        # Page object methods on the call stack, outermost first (e.g. CartPage.complete_checkout > BasePage.click)
+        stack = []
+        frame = sys._getframe(2)
+        while frame is not None:
+            code = frame.f_code
+            if code.co_filename.startswith(PAGES_DIR):
+                name = getattr(code, 'co_qualname', code.co_name).split('.<locals>')[0]
+                if not stack or stack[-1] != name:
+                    stack.append(name)
+            frame = frame.f_back
+        stack.reverse()
+        return tuple(stack)
+
+    def command_totals(self):
+
+        totals = defaultdict(lambda: [0, 0.0])
+        for command, _, _, duration_ms, _ in self.records:
+            totals[command][0] += 1
+            totals[command][1] += duration_ms
+        return dict(totals)
+
+    def flame(self):
+        # Inclusive time per call path: every prefix of a record's stack gets the command's duration
+        paths = defaultdict(lambda: [0, 0.0])
+        for command, _, _, duration_ms, stack in self.records:
+            path = stack + (command,)
+            for depth in range(1, len(path) + 1):
+                paths[path[:depth]][0] += 1
+                paths[path[:depth]][1] += duration_ms
+        command_ms = sum(record[3] for record in self.records)
+        paths[(OUTSIDE_COMMANDS,)] = [0, max(0.0, self.wall_ms - command_ms)]
+        return dict(paths)
+
+    def flame_html(self):
+
+        wall_ms = self.wall_ms or 1.0
+        rows = []
+        for path, (count, total_ms) in sorted(self.flame().items()):
+            share = min(100.0, total_ms / wall_ms * 100)
+            indent = (len(path) - 1) * 16
+            calls = f" &times;{count}" if count else ''
+            rows.append(
+                f'<div style="margin-left:{indent}px;white-space:nowrap">'
+                f'<span style="display:inline-block;width:{share * 3:.0f}px;height:10px;background:#e07b39"></span> '
+                f'{html.escape(path[-1])} {total_ms:.1f} ms ({share:.1f}%){calls}</div>'
+            )
+        header = f"<p>WebDriver commands: {len(self.records)}, test wall time: {wall_ms:.0f} ms</p>"
+        return f'<div class="command-profile">{header}{"".join(rows)}</div>'
+
+    def export_jsonl(self, path):
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'a') as f:
+            for command, locator, start_ms, duration_ms, stack in self.records:
+                f.write(json.dumps({
+                    'test': self.test_id,
+                    'command': command,
+                    'locator': locator,
+                    'start_ms': round(start_ms, 3),
+                    'duration_ms': round(duration_ms, 3),
+                    'page_object_stack': list(stack),
+                }) + '\n')
@@ -0,0 +1,90 @@
+"""
+Test Duration History
+"""
+
+import heapq
+import json
+import os
+from pathlib import Path
+import logging
+
+
+def lpt_plan(estimates, workers):
+
+    # Longest processing time first: each test goes to the currently least-loaded worker
+    loads = [(0.0, worker, []) for worker in range(workers)]
+    for nodeid in sorted(estimates, key=lambda nodeid: (-estimates[nodeid], nodeid)):
+        load, worker, tests = heapq.heappop(loads)
+        tests.append(nodeid)
+        heapq.heappush(loads, (load + estimates[nodeid], worker, tests))
+    return sorted(loads, key=lambda entry: entry[1])
+
+
+class DurationHistory:
+
+    def __init__(self, path='.pytest_durations.json', smoothing=0.5, marker_estimates=None, default_estimate=20.0):
+        self.path = Path(path)
+        # Weight of the newest run in the moving average; 1.0 keeps only the last run
+        self.smoothing = smoothing
+        self.marker_estimates = marker_estimates if marker_estimates is not None else {'slow': 60.0, 'smoke': 10.0}
+        self.default_estimate = default_estimate
+        self.logger = logging.getLogger(__name__)
+        self.tests = self._load()
+
+    @classmethod
+    def from_config(cls, root, config):
+
+        # Relative to the project root, like the test impact index, so the history does not depend on the cwd
+        scheduling_config = config.get('scheduling', {})
+        return cls(
+            path=Path(root) / scheduling_config.get('history_path', '.pytest_durations.json'),
+            smoothing=scheduling_config.get('smoothing', 0.5),
+            marker_estimates=scheduling_config.get('marker_estimates'),
+            default_estimate=scheduling_config.get('default_estimate', 20.0),
+        )
+
+    def estimate(self, nodeid, markers=()):
+
+        if nodeid in self.tests:
+            return self.tests[nodeid]['duration']
+        # New test: the largest estimate among its markers, otherwise the typical known test
+        marked = [self.marker_estimates[marker] for marker in markers if marker in self.marker_estimates]
+        if marked:
+            return max(marked)
+        known = sorted(entry['duration'] for entry in self.tests.values())
+        return known[len(known) // 2] if known else self.default_estimate
+
+    def estimates(self, items):
+
+        return {item.nodeid: self.estimate(item.nodeid, [mark.name for mark in item.iter_markers()]) for item in items}
+
+    def update(self, nodeid, duration, driver_acquire=None):
+
+        entry = self.tests.get(nodeid)
+        if entry is None:
+            entry = self.tests[nodeid] = {'duration': duration, 'driver_acquire': driver_acquire, 'runs': 0}
+        else:
+            entry['duration'] += self.smoothing * (duration - entry['duration'])
+            if driver_acquire is not None:
+                previous = entry.get('driver_acquire')
+                entry['driver_acquire'] = driver_acquire if previous is None else (
+                    previous + self.smoothing * (driver_acquire - previous)
+                )
+        entry['runs'] += 1
+
+    def save(self):
+
+        # Written to a temporary file first, so an interrupted run never leaves a truncated history
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = self.path.with_name(f"{self.path.name}.tmp")
+        temporary_path.write_text(json.dumps(self.tests, indent=1, sort_keys=True))
+        os.replace(temporary_path, self.path)
+
+    def _load(self):
+        try:
+            return json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable duration history {self.path}: {e}")
+            return {}
@@ -0,0 +1,169 @@
+"""
+Failure Artifact Collector
+"""
+
+import base64
+import copy
+import io
+import json
+import threading
+import time
+import zipfile
+import zlib
+from datetime import datetime
+from pathlib import Path
+import urllib3
+import logging
+
+
+class FailureArtifactCollector:
+
+    STATS_SECTION = 'failure artifacts'
+
+    # DOM, URL, title and resource timings of the current document in one round-trip
+    PAGE_STATE_SCRIPT = """
+        var timing = function (entry) {
+            return {
+                name: entry.name, type: entry.initiatorType || entry.entryType,
+                start_ms: entry.startTime, duration_ms: entry.duration,
+                transfer_size: entry.transferSize, status: entry.responseStatus
+            };
+        };
+        return {
+            url: window.location.href,
+            title: document.title,
+            dom: document.documentElement.outerHTML,
+            network: performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'))
+                .map(timing)
+        };
+    """
+
+    # Written in this order; an artifact that would take the bundle past the size cap is left out, and smaller ones
+    # after it still go in
+    PRIORITY = ('url.txt', 'console.json', 'network.json', 'screenshot.png', 'dom.html')
+
+    def __init__(self, config, stats=None):
+        artifacts_config = config.get('failure_artifacts', {})
+        self.path = Path(artifacts_config.get('path', 'reports/failures'))
+        self.timeout = artifacts_config.get('timeout', 10)
+        self.max_bundle_bytes = int(artifacts_config.get('max_bundle_mb', 10) * 1024 * 1024)
+        self.stats = stats
+        self.logger = logging.getLogger(__name__)
+
+    def collect(self, driver, name):
+
+        # Each capture runs on its own daemon thread; whatever has not finished by the deadline is left behind,
+        # so a hung browser costs at most `timeout` seconds
+        started_at = time.perf_counter()
+        results, errors = {}, {}
+        capture_driver = self._bounded_copy(driver)
+        captures = {
+            'screenshot': capture_driver.get_screenshot_as_base64,
+            'page_state': lambda: capture_driver.execute_script(self.PAGE_STATE_SCRIPT),
+            'console': lambda: capture_driver.get_log('browser'),
+        }
+        threads = []
+        for key, capture in captures.items():
+            thread = threading.Thread(
+                target=self._run, args=(key, capture, results, errors), name=f'failure-{key}', daemon=True
+            )
+            thread.start()
+            threads.append(thread)
+
+        deadline = started_at + self.timeout
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.perf_counter()))
+        # Late finishers must not change what is being written
+        results, errors = dict(results), dict(errors)
+        timed_out = [key for key in captures if key not in results and key not in errors]
+        if timed_out:
+            # The browser is hung: it is recycled rather than reset for the next test, and the teardown commands
+            # (page load timing, context disposal, quit) give up after `timeout` seconds too
+            driver.needs_recycle = True
+            self._bound_connection(driver.command_executor, self.timeout)
+
+        artifacts = self._artifacts(results)
+        meta = {
+            'test': name,
+            'captured_at': datetime.now().isoformat(timespec='seconds'),
+            'timed_out': timed_out,
+            'errors': errors,
+        }
+        bundle_path = self._write_bundle(name, artifacts, meta)
+
+        capture_ms = (time.perf_counter() - started_at) * 1000
+        if self.stats is not None:
+            self.stats.record(self.STATS_SECTION, 'capture_ms', capture_ms)
+            self.stats.increment(self.STATS_SECTION, 'bundles')
+            self.stats.increment(self.STATS_SECTION, 'timed_out', len(timed_out))
+        self.logger.info(f"Failure artifacts written to {bundle_path} in {capture_ms:.0f} ms")
+        return bundle_path, results.get('screenshot')
+
+    def _bounded_copy(self, driver):
+        # Same session over a connection of its own that gives up after `timeout` seconds, so a capture stuck on
+        # a hung browser ends by itself instead of after urllib3's 120 s default. Command counting and profiling
+        # wrappers are bound to the original driver, so the copy uses the class's execute()
+        capture_driver = copy.copy(driver)
+        capture_driver.__dict__.pop('execute', None)
+        capture_driver.command_executor = self._bound_connection(copy.copy(driver.command_executor), self.timeout)
+        return capture_driver
+
+    @staticmethod
+    def _bound_connection(executor, timeout):
+        executor.keep_alive = True
+        executor._conn = urllib3.PoolManager(timeout=urllib3.Timeout(total=timeout), retries=False)
+        return executor
+
+    @staticmethod
+    def _run(key, capture, results, errors):
+        try:
+            results[key] = capture()
+        except urllib3.exceptions.TimeoutError:
+            # The bounded connection gave up: counted as timed out, like a capture still running at the deadline
+            pass
+        except Exception as e:
+            errors[key] = str(e)
+
+    @staticmethod
+    def _artifacts(results):
+        artifacts = {}
+        page_state = results.get('page_state')
+        if page_state:
+            artifacts['url.txt'] = f"{page_state['url']}\n{page_state['title']}\n".encode('utf-8')
+            artifacts['network.json'] = json.dumps(page_state['network'], indent=1).encode('utf-8')
+            artifacts['dom.html'] = page_state['dom'].encode('utf-8')
+        if 'console' in results:
+            artifacts['console.json'] = json.dumps(results['console'], indent=1).encode('utf-8')
+        if results.get('screenshot'):
+            artifacts['screenshot.png'] = base64.b64decode(results['screenshot'])
+        return artifacts
+
+    def _write_bundle(self, name, artifacts, meta):
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        safe_name = ''.join(char if char.isalnum() or char in '-_.' else '_' for char in name)
+        bundle_path = self.path / f"{safe_name}_{timestamp}.zip"
+
+        included, skipped, size = [], [], 0
+        for filename in self.PRIORITY:
+            data = artifacts.get(filename)
+            if data is None:
+                continue
+            # PNG is already compressed and is stored as is; the rest is deflated
+            compressed_size = len(data) if filename.endswith('.png') else len(zlib.compress(data, 6))
+            if size + compressed_size > self.max_bundle_bytes:
+                skipped.append(filename)
+                continue
+            included.append(filename)
+            size += compressed_size
+        meta['skipped_for_size'] = skipped
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as bundle:
+            for filename in included:
+                compression = zipfile.ZIP_STORED if filename.endswith('.png') else zipfile.ZIP_DEFLATED
+                bundle.writestr(filename, artifacts[filename], compress_type=compression)
+            bundle.writestr('meta.json', json.dumps(meta, indent=1))
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        bundle_path.write_bytes(buffer.getvalue())
+        return bundle_path
@@ -0,0 +1,73 @@
+"""
+Latency Histogram
+"""
+
+
+class LatencyHistogram:
+    """HDR-style log-linear histogram of microsecond latencies: fixed memory, under 1% relative error, mergeable"""
+
+    # 2**SUB_BUCKET_BITS linear buckets per power of two; values above 2**MAX_BITS us (~13 days) are clamped
+    SUB_BUCKET_BITS = 7
+    MAX_BITS = 40
+
+    def __init__(self):
+        half = 1 << (self.SUB_BUCKET_BITS - 1)
+        self.counts = [0] * ((self.MAX_BITS - self.SUB_BUCKET_BITS + 3) * half)
+        self.count = 0
+        self.total_us = 0
+        self.min_us = None
+        self.max_us = 0
+
+    def record(self, value_ms):
+
+        value_us = min(max(int(value_ms * 1000), 0), (1 << self.MAX_BITS) - 1)
+        self.counts[self._index(value_us)] += 1
+        self.count += 1
+        self.total_us += value_us
+        self.min_us = value_us if self.min_us is None else min(self.min_us, value_us)
+        self.max_us = max(self.max_us, value_us)
+
+    def merge(self, other):
+
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.count += other.count
+        self.total_us += other.total_us
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None else min(self.min_us, other.min_us)
+        self.max_us = max(self.max_us, other.max_us)
+        return self
+
+    def percentile(self, percent):
+
+        # In ms; the midpoint of the bucket holding the requested rank, capped at the largest value seen
+        if not self.count:
+            return 0.0
+        rank = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                low, width = self._bucket(index)
+                return min(low + (width - 1) / 2, self.max_us) / 1000
+        return self.max_us / 1000
+
+    @property
+    def mean(self):
+        return self.total_us / self.count / 1000 if self.count else 0.0
+
+    def _index(self, value_us):
+        half = 1 << (self.SUB_BUCKET_BITS - 1)
+        if value_us < 2 * half:
+            return value_us
+        # Keep the top SUB_BUCKET_BITS bits of the value; the shift picks the power-of-two range
+        shift = value_us.bit_length() - self.SUB_BUCKET_BITS
+        return shift * half + (value_us >> shift)
+
+    def _bucket(self, index):
+        half = 1 << (self.SUB_BUCKET_BITS - 1)
+        if index < 2 * half:
+            return index, 1
+        shift = index // half - 1
+        return (index - shift * half) << shift, 1 << shift
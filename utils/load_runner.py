@@ -0,0 +1,290 @@
+"""
+Browser Load Runner
+
+Drives concurrent headless browser sessions through page-object scenarios and reports per-step latency percentiles
+and throughput. Each virtual user is a separate process with its own chromedriver and browser.
+
+Usage: python -m utils.load_runner [--users 4] [--ramp-up 10] [--duration 60]
+                                   [--scenario checkout:performance_glitch_user ...] [--local-site]
+"""
+
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import logging
+
+from utils.catalog import PRODUCTS
+from utils.latency_histogram import LatencyHistogram
+
+
+def load_config():
+    with open(Path(__file__).resolve().parent.parent / 'config' / 'config.json') as f:
+        return json.load(f)
+
+
+class VirtualUser:
+    """One browser session running a scenario in a loop; every step's latency goes into its step histogram"""
+
+    def __init__(self, driver, config, user_key, index=0):
+        self.driver = driver
+        self.config = config
+        self.user_key = user_key
+        self.credentials = config['users'][user_key]
+        self.index = index
+        self.histograms = {}
+        self.errors = {}
+
+    def step(self, name, action):
+
+        started_at = time.perf_counter()
+        try:
+            result = action()
+        except Exception:
+            self.errors[name] = self.errors.get(name, 0) + 1
+            raise
+        if result is False:
+            self.errors[name] = self.errors.get(name, 0) + 1
+            raise AssertionError(f"Step {name} did not reach its expected state")
+        self.histograms.setdefault(name, LatencyHistogram()).record((time.perf_counter() - started_at) * 1000)
+        return result
+
+    def reset(self):
+
+        # Every iteration starts logged out with an empty cart
+        self.driver.get(self.config['base_url'])
+        self.driver.delete_all_cookies()
+        self.driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        self.driver.get(self.config['base_url'])
+
+    def product(self, iteration):
+
+        return PRODUCTS[(self.index + iteration) % len(PRODUCTS)]['name']
+
+
+def browse(user, iteration):
+    from pages.cart_page import CartPage
+    from pages.login_page import LoginPage
+    from pages.products_page import ProductsPage
+
+    products_page = ProductsPage(user.driver, user.config)
+    user.step('login', lambda: LoginPage(user.driver, user.config).login(
+        user.credentials['username'], user.credentials['password']
+    ))
+    user.step('inventory', products_page.is_products_page_loaded)
+    user.step('sort', lambda: products_page.sort_products('lohi'))
+    user.step('add_to_cart', lambda: products_page.add_product_to_cart_by_name(user.product(iteration)))
+    user.step('open_cart', products_page.click_shopping_cart)
+    user.step('cart', CartPage(user.driver, user.config).is_cart_page_loaded)
+
+
+def checkout(user, iteration):
+    from pages.cart_page import CartPage
+    from pages.login_page import LoginPage
+    from pages.products_page import ProductsPage
+
+    products_page = ProductsPage(user.driver, user.config)
+    cart_page = CartPage(user.driver, user.config)
+    user.step('login', lambda: LoginPage(user.driver, user.config).login(
+        user.credentials['username'], user.credentials['password']
+    ))
+    user.step('inventory', products_page.is_products_page_loaded)
+    user.step('add_to_cart', lambda: products_page.add_product_to_cart_by_name(user.product(iteration)))
+    user.step('open_cart', products_page.click_shopping_cart)
+    user.step('cart', cart_page.is_cart_page_loaded)
+    user.step('checkout', lambda: cart_page.complete_checkout('Load', f"User {user.index}", '12345'))
+    user.step('back_home', cart_page.click_back_home)
+
+
+# Scenario name -> function(user, iteration) built from page-object calls
+SCENARIOS = {
+    'browse': browse,
+    'checkout': checkout,
+}
+
+
+def run_virtual_user(index, scenario, user_key, config, start_at, stop_at, iterations=None):
+
+    # Runs in a pool process; returns plain data the parent can merge
+    from utils.webdriver_manager import WebDriverManager
+
+    logging.basicConfig(level=logging.WARNING)
+    time.sleep(max(0.0, start_at - time.time()))
+
+    manager = WebDriverManager(dict(config, headless=True, prespawn={'enabled': False}))
+    started_at = time.time()
+    completed, failed = 0, 0
+    driver = None
+    user = VirtualUser(driver, config, user_key, index)
+    try:
+        # Inside the try, so the chromedriver service is stopped even when the browser fails to start
+        driver = user.driver = manager.acquire_driver()
+        while time.time() < stop_at and (iterations is None or completed + failed < iterations):
+            try:
+                user.reset()
+                SCENARIOS[scenario](user, completed + failed)
+                completed += 1
+            except Exception as e:
+                failed += 1
+                logging.getLogger(__name__).warning(f"Virtual user {index} ({scenario}, {user_key}) failed: {e}")
+    finally:
+        if driver is not None:
+            manager.retire_driver(driver)
+        manager.shutdown()
+    return {
+        'scenario': scenario,
+        'user': user_key,
+        'histograms': user.histograms,
+        'errors': user.errors,
+        'completed': completed,
+        'failed': failed,
+        'active_s': time.time() - started_at,
+    }
+
+
+class LoadRunner:
+
+    def __init__(self, config, virtual_users=4, ramp_up_s=10, duration_s=60, scenarios=None, iterations=None):
+        self.config = config
+        self.virtual_users = virtual_users
+        self.ramp_up_s = ramp_up_s
+        self.duration_s = duration_s
+        # [(scenario, user_key)], assigned to virtual users round-robin
+        self.scenarios = scenarios or [('checkout', 'standard_user')]
+        self.iterations = iterations
+        self.logger = logging.getLogger(__name__)
+        for scenario, user_key in self.scenarios:
+            if scenario not in SCENARIOS:
+                raise ValueError(f"Unknown scenario: {scenario} (available: {', '.join(sorted(SCENARIOS))})")
+            if user_key not in config['users']:
+                raise ValueError(f"Unknown user: {user_key} (available: {', '.join(config['users'])})")
+
+    @classmethod
+    def from_config(cls, config, **overrides):
+
+        load_config_section = config.get('load', {})
+        settings = {
+            'virtual_users': load_config_section.get('virtual_users', 4),
+            'ramp_up_s': load_config_section.get('ramp_up_s', 10),
+            'duration_s': load_config_section.get('duration_s', 60),
+            'scenarios': [(entry['scenario'], entry.get('user', 'standard_user'))
+                          for entry in load_config_section.get('scenarios', [])] or None,
+        }
+        settings.update({key: value for key, value in overrides.items() if value is not None})
+        return cls(config, **settings)
+
+    def run(self):
+
+        # All virtual users stop together, duration_s after the ramp-up has ended
+        start_at = time.time() + 1
+        stop_at = start_at + self.ramp_up_s + self.duration_s
+        # Spawned, not forked: the parent may be running the local site's server thread
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=self.virtual_users, mp_context=context) as pool:
+            futures = []
+            for index in range(self.virtual_users):
+                scenario, user_key = self.scenarios[index % len(self.scenarios)]
+                # Virtual users start evenly spread over the ramp-up
+                user_start_at = start_at + self.ramp_up_s * index / self.virtual_users
+                futures.append(pool.submit(
+                    run_virtual_user, index, scenario, user_key, self.config, user_start_at, stop_at, self.iterations
+                ))
+            results, crashed = [], 0
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    crashed += 1
+                    self.logger.error(f"Virtual user crashed: {e}")
+        return LoadReport(results, time.time() - start_at, crashed)
+
+
+class LoadReport:
+
+    def __init__(self, results, elapsed_s, crashed=0):
+        self.elapsed_s = max(elapsed_s, 1e-3)
+        self.results = results
+        self.crashed = crashed
+        # (scenario, persona) -> step -> merged histogram, in step order of first appearance
+        self.steps = {}
+        self.errors = {}
+        for result in results:
+            key = (result['scenario'], result['user'])
+            steps = self.steps.setdefault(key, {})
+            for step, histogram in result['histograms'].items():
+                steps.setdefault(step, LatencyHistogram()).merge(histogram)
+            errors = self.errors.setdefault(key, {})
+            for step, count in result['errors'].items():
+                errors[step] = errors.get(step, 0) + count
+
+    def lines(self):
+
+        completed = sum(result['completed'] for result in self.results)
+        failed = sum(result['failed'] for result in self.results)
+        lines = [
+            f"{len(self.results)} virtual users ({self.crashed} crashed), {self.elapsed_s:.0f} s, "
+            f"{completed} iterations completed, "
+            f"{failed} failed ({completed / self.elapsed_s * 60:.1f} iterations/min)",
+        ]
+        header = (f"  {'step':<14} {'count':>7} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+                  f"{'max ms':>9} {'/s':>7}")
+        for (scenario, user_key), steps in sorted(self.steps.items()):
+            lines.append(f"{scenario} as {user_key}:")
+            lines.append(header)
+            errors = self.errors.get((scenario, user_key), {})
+            # Steps that only ever failed have no latencies but still get a row
+            for step in list(steps) + [step for step in errors if step not in steps]:
+                histogram = steps.get(step, LatencyHistogram())
+                percentiles = ' '.join(f"{histogram.percentile(percent):>9.1f}" for percent in (50, 95, 99))
+                lines.append(
+                    f"  {step:<14} {histogram.count:>7} {errors.get(step, 0):>7} {percentiles} "
+                    f"{histogram.max_us / 1000:>9.1f} {histogram.count / self.elapsed_s:>7.2f}"
+                )
+        return lines
+
+
+def _scenario_arg(value):
+    scenario, _, user_key = value.partition(':')
+    return scenario, user_key or 'standard_user'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, help='concurrent virtual users (browser sessions)')
+    parser.add_argument('--ramp-up', type=float, help='seconds over which the virtual users are started')
+    parser.add_argument('--duration', type=float, help='seconds to keep running after the ramp-up')
+    parser.add_argument('--iterations', type=int, help='stop each virtual user after this many iterations')
+    parser.add_argument('--scenario', type=_scenario_arg, action='append', metavar='NAME[:USER]',
+                        help=f"scenario ({', '.join(sorted(SCENARIOS))}) and persona from config users; repeatable")
+    parser.add_argument('--local-site', action='store_true', help='run against the local SauceDemo stand-in')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    config = load_config()
+    site = None
+    if args.local_site:
+        from utils.local_site import LocalSite
+        site = LocalSite(config['users']).start()
+        config['base_url'] = site.url
+
+    try:
+        runner = LoadRunner.from_config(
+            config, virtual_users=args.users, ramp_up_s=args.ramp_up, duration_s=args.duration,
+            scenarios=args.scenario, iterations=args.iterations,
+        )
+        report = runner.run()
+    except ValueError as e:
+        parser.error(str(e))
+    finally:
+        if site:
+            site.stop()
+    for line in report.lines():
+        print(line)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
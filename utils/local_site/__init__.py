@@ -0,0 +1,7 @@
+"""
+Package initialization for the local SauceDemo stand-in site
+"""
+
+from utils.local_site.server import LocalSite
+
+__all__ = ['LocalSite']
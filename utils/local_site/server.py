@@ -0,0 +1,112 @@
+"""
+Local SauceDemo Stand-in Server
+"""
+
+import json
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from utils.catalog import PRODUCTS
+import logging
+
+
+STATIC_DIR = Path(__file__).parent / 'static'
+
+# Every SauceDemo route is served the same shell; app.js renders the page for the current path
+ROUTES = (
+    '/',
+    '/index.html',
+    '/inventory.html',
+    '/inventory-item.html',
+    '/cart.html',
+    '/checkout-step-one.html',
+    '/checkout-step-two.html',
+    '/checkout-complete.html',
+)
+
+
+class _SiteServer(ThreadingHTTPServer):
+
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 512
+
+
+class _SiteRequestHandler(BaseHTTPRequestHandler):
+
+    # Keep-alive connections so each browser reuses its sockets
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        resources = self.server.resources
+        resource = resources.get(path)
+        if resource is None and path.startswith('/static/media/'):
+            resource = resources['/static/media/placeholder.svg']
+        if resource is None:
+            self.send_error(404)
+            return
+
+        content_type, body, cacheable = resource
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'public, max-age=3600' if cacheable else 'no-cache')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Access logs would dominate the output when many browsers share the server
+        pass
+
+
+class LocalSite:
+
+    def __init__(self, users, host='127.0.0.1', port=0, glitch_delay_ms=2500):
+        self.users = users
+        self.host = host
+        self.port = port
+        self.glitch_delay_ms = glitch_delay_ms
+        self.logger = logging.getLogger(__name__)
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}/"
+
+    def start(self):
+        self._server = _SiteServer((self.host, self.port), _SiteRequestHandler)
+        self._server.resources = self._build_resources()
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='local-site', daemon=True)
+        self._thread.start()
+        self.logger.info(f"Local SauceDemo site serving at {self.url}")
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def _build_resources(self):
+        # Everything is rendered to bytes once so request handling is a dictionary lookup
+        site_data = {
+            'products': PRODUCTS,
+            'users': {user['username']: user['password'] for user in self.users.values()},
+            'glitchDelayMs': self.glitch_delay_ms,
+        }
+        shell = (STATIC_DIR / 'index.html').read_bytes()
+        resources = {route: ('text/html; charset=utf-8', shell, False) for route in ROUTES}
+        resources['/static/site-data.js'] = (
+            'application/javascript',
+            f"window.SITE_DATA = {json.dumps(site_data)};".encode('utf-8'),
+            True,
+        )
+        resources['/static/app.js'] = ('application/javascript', (STATIC_DIR / 'app.js').read_bytes(), True)
+        resources['/static/style.css'] = ('text/css', (STATIC_DIR / 'style.css').read_bytes(), True)
+        resources['/static/media/placeholder.svg'] = (
+            'image/svg+xml', (STATIC_DIR / 'placeholder.svg').read_bytes(), True
+        )
+        return resources
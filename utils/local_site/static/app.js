@@ -0,0 +1,526 @@
+/* Local stand-in for https://www.saucedemo.com/ - same ids, classes and data-test attributes */
+(function () {
+  'use strict';
+
+  var data = window.SITE_DATA;
+  var CART_KEY = 'cart-contents';
+  var SESSION_COOKIE = 'session-username';
+  var LOGIN_ERROR_KEY = 'login-error';
+  var root = document.getElementById('root');
+  var sortOrder = 'az';
+
+  var ERROR_ICON = '<svg viewBox="0 0 10 10" width="10" height="10" aria-hidden="true">' +
+    '<path d="M1 1L9 9M9 1L1 9" stroke="currentColor" stroke-width="2"/></svg>';
+
+  // Persona quirks, keyed by the usernames SauceDemo uses
+  var LOCKED_OUT_USER = 'locked_out_user';
+  var PROBLEM_USER = 'problem_user';
+  var GLITCH_USER = 'performance_glitch_user';
+  var ERROR_USER = 'error_user';
+  var VISUAL_USER = 'visual_user';
+  var ERROR_USER_BROKEN_IDS = [1, 3, 5];
+
+  function escapeHtml(text) {
+    return String(text).replace(/[&<>"']/g, function (ch) {
+      return { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' }[ch];
+    });
+  }
+
+  function slug(name) {
+    return name.toLowerCase().replace(/ /g, '-');
+  }
+
+  function money(value) {
+    return '$' + value.toFixed(2);
+  }
+
+  function getSessionUser() {
+    var match = document.cookie.match(new RegExp('(?:^|; )' + SESSION_COOKIE + '=([^;]*)'));
+    return match ? decodeURIComponent(match[1]) : null;
+  }
+
+  function setSessionUser(username) {
+    document.cookie = SESSION_COOKIE + '=' + encodeURIComponent(username) + '; path=/; max-age=600';
+  }
+
+  function clearSessionUser() {
+    document.cookie = SESSION_COOKIE + '=; path=/; max-age=0';
+  }
+
+  function getCart() {
+    try {
+      var ids = JSON.parse(window.localStorage.getItem(CART_KEY));
+      return Array.isArray(ids) ? ids : [];
+    } catch (e) {
+      return [];
+    }
+  }
+
+  function setCart(ids) {
+    if (ids.length) {
+      window.localStorage.setItem(CART_KEY, JSON.stringify(ids));
+    } else {
+      window.localStorage.removeItem(CART_KEY);
+    }
+  }
+
+  function productById(id) {
+    for (var i = 0; i < data.products.length; i++) {
+      if (data.products[i].id === id) {
+        return data.products[i];
+      }
+    }
+    return null;
+  }
+
+  function productBySlug(value) {
+    for (var i = 0; i < data.products.length; i++) {
+      if (slug(data.products[i].name) === value) {
+        return data.products[i];
+      }
+    }
+    return null;
+  }
+
+  function cartProducts() {
+    return getCart().map(productById).filter(Boolean);
+  }
+
+  function navigate(path) {
+    window.location.href = path;
+  }
+
+  function imageSrc(product) {
+    var user = getSessionUser();
+    return '/static/media/' + (user === PROBLEM_USER ? 'sl-404.jpg' : product.image);
+  }
+
+  function displayedPrice(product) {
+    if (getSessionUser() === VISUAL_USER) {
+      return money(Math.round(Math.random() * 10000) / 100);
+    }
+    return money(product.price);
+  }
+
+  /* ---------- Shared layout ---------- */
+
+  function badgeHtml() {
+    var count = getCart().length;
+    return count ? '<span class="shopping_cart_badge" data-test="shopping-cart-badge">' + count + '</span>' : '';
+  }
+
+  function renderBadge() {
+    var link = document.querySelector('.shopping_cart_link');
+    if (link) {
+      link.innerHTML = badgeHtml();
+    }
+  }
+
+  function layout(title, secondaryExtra, body) {
+    var cartLinkClass = 'shopping_cart_link' + (getSessionUser() === VISUAL_USER ? ' visual_failure' : '');
+    return '' +
+      '<div id="page_wrapper" class="page_wrapper">' +
+      '<div id="contents_wrapper">' +
+      '<div class="primary_header" data-test="primary-header">' +
+      '<div id="menu_button_container">' +
+      '<div class="bm-burger-button"><button type="button" id="react-burger-menu-btn">Open Menu</button></div>' +
+      '<div class="bm-menu-wrap" aria-hidden="true"><nav class="bm-item-list">' +
+      '<a id="inventory_sidebar_link" class="bm-item menu-item" href="/inventory.html" ' +
+      'data-test="inventory-sidebar-link">All Items</a>' +
+      '<a id="about_sidebar_link" class="bm-item menu-item" href="https://saucelabs.com/" ' +
+      'data-test="about-sidebar-link">About</a>' +
+      '<a id="logout_sidebar_link" class="bm-item menu-item" href="#" data-test="logout-sidebar-link">Logout</a>' +
+      '<a id="reset_sidebar_link" class="bm-item menu-item" href="#" data-test="reset-sidebar-link">Reset App State</a>' +
+      '</nav><button type="button" id="react-burger-cross-btn">Close Menu</button></div>' +
+      '</div>' +
+      '<div class="header_label"><div class="app_logo">Swag Labs</div></div>' +
+      '<div id="shopping_cart_container" class="shopping_cart_container">' +
+      '<a class="' + cartLinkClass + '" href="/cart.html" data-test="shopping-cart-link">' + badgeHtml() + '</a>' +
+      '</div>' +
+      '</div>' +
+      '<div class="header_secondary_container" data-test="secondary-header">' +
+      '<span class="title" data-test="title">' + escapeHtml(title) + '</span>' + secondaryExtra +
+      '</div>' +
+      body +
+      '<footer class="footer" data-test="footer"><div class="footer_copy" data-test="footer-copy">' +
+      '&copy; Sauce Labs. All Rights Reserved.</div></footer>' +
+      '</div>' +
+      '</div>';
+  }
+
+  function cartButtonHtml(product, inCart, extraClass) {
+    var id = (inCart ? 'remove-' : 'add-to-cart-') + slug(product.name);
+    var classes = inCart ? 'btn btn_secondary btn_small ' + extraClass : 'btn btn_primary btn_small ' + extraClass;
+    return '<button class="' + classes + '" data-test="' + id + '" id="' + id + '" name="' + id + '">' +
+      (inCart ? 'Remove' : 'Add to cart') + '</button>';
+  }
+
+  function cartItemHtml(product, withRemoveButton) {
+    return '' +
+      '<div class="cart_item" data-test="inventory-item">' +
+      '<div class="cart_quantity" data-test="item-quantity">1</div>' +
+      '<div class="cart_item_label">' +
+      '<a href="/inventory-item.html?id=' + product.id + '" id="item_' + product.id + '_title_link">' +
+      '<div class="inventory_item_name" data-test="inventory-item-name">' + escapeHtml(product.name) + '</div></a>' +
+      '<div class="inventory_item_desc" data-test="inventory-item-desc">' + escapeHtml(product.description) + '</div>' +
+      '<div class="item_pricebar">' +
+      '<div class="inventory_item_price" data-test="inventory-item-price">' + money(product.price) + '</div>' +
+      (withRemoveButton ? cartButtonHtml(product, true, 'cart_button') : '') +
+      '</div>' +
+      '</div>' +
+      '</div>';
+  }
+
+  /* ---------- Pages ---------- */
+
+  function renderLogin() {
+    document.body.className = 'login';
+    root.innerHTML = '' +
+      '<div class="login_container">' +
+      '<div class="login_logo">Swag Labs</div>' +
+      '<div class="login_wrapper"><div class="login_wrapper-inner">' +
+      '<div id="login_button_container" class="form_column"><div class="login-box">' +
+      '<form id="login-form">' +
+      '<div class="form_group"><input class="input_error form_input" placeholder="Username" type="text" ' +
+      'data-test="username" id="user-name" name="user-name" autocorrect="off" autocapitalize="none" value=""></div>' +
+      '<div class="form_group"><input class="input_error form_input" placeholder="Password" type="password" ' +
+      'data-test="password" id="password" name="password" autocorrect="off" autocapitalize="none" value=""></div>' +
+      '<div class="error-message-container"></div>' +
+      '<input type="submit" class="submit-button btn_action" data-test="login-button" id="login-button" ' +
+      'name="login-button" value="Login">' +
+      '</form>' +
+      '</div></div>' +
+      '<div class="login_credentials_wrap"><div class="login_credentials" data-test="login-credentials">' +
+      '<h4>Accepted usernames are:</h4>' + Object.keys(data.users).map(escapeHtml).join('<br>') +
+      '</div></div>' +
+      '</div></div>' +
+      '</div>';
+
+    var pendingError = window.sessionStorage.getItem(LOGIN_ERROR_KEY);
+    if (pendingError) {
+      window.sessionStorage.removeItem(LOGIN_ERROR_KEY);
+      showError(pendingError, ['user-name', 'password']);
+    }
+
+    document.getElementById('login-form').addEventListener('submit', function (event) {
+      event.preventDefault();
+      var username = document.getElementById('user-name').value;
+      var password = document.getElementById('password').value;
+
+      if (!username) {
+        showError('Epic sadface: Username is required', ['user-name', 'password']);
+      } else if (!password) {
+        showError('Epic sadface: Password is required', ['user-name', 'password']);
+      } else if (data.users[username] !== password) {
+        showError('Epic sadface: Username and password do not match any user in this service',
+          ['user-name', 'password']);
+      } else if (username === LOCKED_OUT_USER) {
+        showError('Epic sadface: Sorry, this user has been locked out.', ['user-name', 'password']);
+      } else {
+        setSessionUser(username);
+        if (username === GLITCH_USER) {
+          window.setTimeout(function () { navigate('/inventory.html'); }, data.glitchDelayMs);
+        } else {
+          navigate('/inventory.html');
+        }
+      }
+    });
+  }
+
+  function showError(message, inputIds) {
+    var container = document.querySelector('.error-message-container');
+    container.className = 'error-message-container error';
+    container.innerHTML = '<h3 data-test="error"><button class="error-button" data-test="error-button" ' +
+      'type="button">' + ERROR_ICON + '</button>' + escapeHtml(message) + '</h3>';
+    inputIds.forEach(function (id) {
+      document.getElementById(id).classList.add('error');
+    });
+  }
+
+  function clearError() {
+    var container = document.querySelector('.error-message-container');
+    container.className = 'error-message-container';
+    container.innerHTML = '';
+    Array.prototype.forEach.call(document.querySelectorAll('input.error'), function (input) {
+      input.classList.remove('error');
+    });
+  }
+
+  function sortedProducts() {
+    var products = data.products.slice();
+    var user = getSessionUser();
+    var order = user === PROBLEM_USER ? 'az' : sortOrder;
+    products.sort(function (a, b) {
+      if (order === 'za') { return b.name.localeCompare(a.name); }
+      if (order === 'lohi') { return a.price - b.price || a.name.localeCompare(b.name); }
+      if (order === 'hilo') { return b.price - a.price || a.name.localeCompare(b.name); }
+      return a.name.localeCompare(b.name);
+    });
+    return products;
+  }
+
+  function inventoryItemHtml(product, cart) {
+    var link = '/inventory-item.html?id=' + product.id;
+    return '' +
+      '<div class="inventory_item" data-test="inventory-item">' +
+      '<div class="inventory_item_img"><a href="' + link + '" id="item_' + product.id + '_img_link">' +
+      '<img alt="' + escapeHtml(product.name) + '" class="inventory_item_img" src="' + imageSrc(product) + '">' +
+      '</a></div>' +
+      '<div class="inventory_item_description" data-test="inventory-item-description">' +
+      '<div class="inventory_item_label">' +
+      '<a href="' + link + '" id="item_' + product.id + '_title_link">' +
+      '<div class="inventory_item_name" data-test="inventory-item-name">' + escapeHtml(product.name) + '</div></a>' +
+      '<div class="inventory_item_desc" data-test="inventory-item-desc">' + escapeHtml(product.description) + '</div>' +
+      '</div>' +
+      '<div class="pricebar">' +
+      '<div class="inventory_item_price" data-test="inventory-item-price">' + displayedPrice(product) + '</div>' +
+      cartButtonHtml(product, cart.indexOf(product.id) !== -1, 'btn_inventory') +
+      '</div>' +
+      '</div>' +
+      '</div>';
+  }
+
+  function renderInventoryList() {
+    var cart = getCart();
+    document.querySelector('.inventory_list').innerHTML = sortedProducts().map(function (product) {
+      return inventoryItemHtml(product, cart);
+    }).join('');
+  }
+
+  function renderInventory() {
+    var sortOptions = [['az', 'Name (A to Z)'], ['za', 'Name (Z to A)'], ['lohi', 'Price (low to high)'],
+      ['hilo', 'Price (high to low)']];
+    var activeLabel = '';
+    var select = '<select class="product_sort_container" data-test="product-sort-container">' +
+      sortOptions.map(function (option) {
+        if (option[0] === sortOrder) { activeLabel = option[1]; }
+        return '<option value="' + option[0] + '"' + (option[0] === sortOrder ? ' selected' : '') + '>' +
+          option[1] + '</option>';
+      }).join('') + '</select>';
+    var extra = '<div class="right_component"><span class="select_container">' +
+      '<span class="active_option" data-test="active-option">' + activeLabel + '</span>' + select + '</span></div>';
+
+    root.innerHTML = layout('Products', extra,
+      '<div id="inventory_container" class="inventory_container">' +
+      '<div class="inventory_list" data-test="inventory-list"></div>' +
+      '</div>');
+    renderInventoryList();
+
+    document.querySelector('.product_sort_container').addEventListener('change', function (event) {
+      sortOrder = event.target.value;
+      document.querySelector('.active_option').textContent = event.target.selectedOptions[0].textContent;
+      renderInventoryList();
+    });
+  }
+
+  function renderInventoryItem() {
+    var id = parseInt(new URLSearchParams(window.location.search).get('id'), 10);
+    var product = productById(id);
+    var body = product ? '' +
+      '<div class="inventory_details" data-test="inventory-container"><div class="inventory_details_container">' +
+      '<img alt="' + escapeHtml(product.name) + '" class="inventory_details_img" src="' + imageSrc(product) + '">' +
+      '<div class="inventory_details_desc_container">' +
+      '<div class="inventory_details_name large_size" data-test="inventory-item-name">' +
+      escapeHtml(product.name) + '</div>' +
+      '<div class="inventory_details_desc large_size" data-test="inventory-item-desc">' +
+      escapeHtml(product.description) + '</div>' +
+      '<div class="inventory_details_price" data-test="inventory-item-price">' + money(product.price) + '</div>' +
+      cartButtonHtml(product, getCart().indexOf(product.id) !== -1, 'btn_inventory') +
+      '</div></div></div>'
+      : '<div class="inventory_details"><div class="inventory_details_name">ITEM NOT FOUND</div></div>';
+    root.innerHTML = layout('', '<button class="btn btn_secondary back btn_large inventory_details_back_button" ' +
+      'id="back-to-products" data-test="back-to-products">Back to products</button>', body);
+  }
+
+  function renderCart() {
+    var items = cartProducts().map(function (product) { return cartItemHtml(product, true); }).join('');
+    root.innerHTML = layout('Your Cart', '',
+      '<div id="cart_contents_container" class="cart_contents_container"><div>' +
+      '<div class="cart_list" data-test="cart-list">' +
+      '<div class="cart_quantity_label" data-test="cart-quantity-label">QTY</div>' +
+      '<div class="cart_desc_label" data-test="cart-desc-label">Description</div>' +
+      items +
+      '</div>' +
+      '<div class="cart_footer">' +
+      '<button class="btn btn_secondary back btn_medium" data-test="continue-shopping" id="continue-shopping" ' +
+      'name="continue-shopping">Continue Shopping</button>' +
+      '<button class="btn btn_action btn_medium checkout_button" data-test="checkout" id="checkout" ' +
+      'name="checkout">Checkout</button>' +
+      '</div>' +
+      '</div></div>');
+  }
+
+  function checkoutInputHtml(id, dataTest, placeholder) {
+    return '<div class="form_group"><input class="input_error form_input" placeholder="' + placeholder + '" ' +
+      'type="text" data-test="' + dataTest + '" id="' + id + '" name="' + dataTest + '" autocorrect="off" ' +
+      'autocapitalize="none" value=""></div>';
+  }
+
+  function renderCheckoutStepOne() {
+    root.innerHTML = layout('Checkout: Your Information', '',
+      '<div id="checkout_info_container" class="checkout_info_container">' +
+      '<div class="checkout_info_wrapper"><form id="checkout-form">' +
+      '<div class="checkout_info" data-test="checkout-info-container">' +
+      checkoutInputHtml('first-name', 'firstName', 'First Name') +
+      checkoutInputHtml('last-name', 'lastName', 'Last Name') +
+      checkoutInputHtml('postal-code', 'postalCode', 'Zip/Postal Code') +
+      '<div class="error-message-container"></div>' +
+      '</div>' +
+      '<div class="checkout_buttons">' +
+      '<button class="btn btn_secondary back btn_medium cart_cancel_link" data-test="cancel" id="cancel" ' +
+      'name="cancel" type="button">Cancel</button>' +
+      '<input type="submit" class="submit-button btn btn_primary cart_button btn_action" data-test="continue" ' +
+      'id="continue" name="continue" value="Continue">' +
+      '</div>' +
+      '</form></div>' +
+      '</div>');
+
+    document.getElementById('checkout-form').addEventListener('submit', function (event) {
+      event.preventDefault();
+      var ids = ['first-name', 'last-name', 'postal-code'];
+      var messages = ['Error: First Name is required', 'Error: Last Name is required',
+        'Error: Postal Code is required'];
+      clearError();
+      for (var i = 0; i < ids.length; i++) {
+        if (!document.getElementById(ids[i]).value) {
+          showError(messages[i], ids);
+          return;
+        }
+      }
+      navigate('/checkout-step-two.html');
+    });
+  }
+
+  function renderCheckoutStepTwo() {
+    var products = cartProducts();
+    var subtotal = products.reduce(function (sum, product) { return sum + product.price; }, 0);
+    var tax = Math.round(subtotal * 8) / 100;
+    root.innerHTML = layout('Checkout: Overview', '',
+      '<div id="checkout_summary_container" class="checkout_summary_container"><div>' +
+      '<div class="cart_list" data-test="cart-list">' +
+      '<div class="cart_quantity_label">QTY</div><div class="cart_desc_label">Description</div>' +
+      products.map(function (product) { return cartItemHtml(product, false); }).join('') +
+      '</div>' +
+      '<div class="summary_info">' +
+      '<div class="summary_info_label" data-test="payment-info-label">Payment Information:</div>' +
+      '<div class="summary_value_label" data-test="payment-info-value">SauceCard #31337</div>' +
+      '<div class="summary_info_label" data-test="shipping-info-label">Shipping Information:</div>' +
+      '<div class="summary_value_label" data-test="shipping-info-value">Free Pony Express Delivery!</div>' +
+      '<div class="summary_info_label" data-test="total-info-label">Price Total</div>' +
+      '<div class="summary_subtotal_label" data-test="subtotal-label">Item total: ' + money(subtotal) + '</div>' +
+      '<div class="summary_tax_label" data-test="tax-label">Tax: ' + money(tax) + '</div>' +
+      '<div class="summary_total_label" data-test="total-label">Total: ' + money(subtotal + tax) + '</div>' +
+      '<div class="cart_footer">' +
+      '<button class="btn btn_secondary back btn_medium cart_cancel_link" data-test="cancel" id="cancel" ' +
+      'name="cancel">Cancel</button>' +
+      '<button class="btn btn_action btn_medium cart_button" data-test="finish" id="finish" name="finish">' +
+      'Finish</button>' +
+      '</div>' +
+      '</div>' +
+      '</div></div>');
+  }
+
+  function renderCheckoutComplete() {
+    root.innerHTML = layout('Checkout: Complete!', '',
+      '<div id="checkout_complete_container" class="checkout_complete_container" ' +
+      'data-test="checkout-complete-container">' +
+      '<img alt="Pony Express" class="pony_express" data-test="pony-express" src="/static/media/pony-express.png">' +
+      '<h2 class="complete-header" data-test="complete-header">Thank you for your order!</h2>' +
+      '<div class="complete-text" data-test="complete-text">Your order has been dispatched, and will arrive ' +
+      'just as fast as the pony can get there!</div>' +
+      '<button class="btn btn_primary btn_small" data-test="back-to-products" id="back-to-products" ' +
+      'name="back-to-products">Back Home</button>' +
+      '</div>');
+  }
+
+  /* ---------- Events ---------- */
+
+  function toggleCartItem(button) {
+    var adding = button.id.indexOf('add-to-cart-') === 0;
+    var product = productBySlug(button.id.replace(/^(add-to-cart-|remove-)/, ''));
+    if (!product) {
+      return;
+    }
+    if (getSessionUser() === ERROR_USER && ERROR_USER_BROKEN_IDS.indexOf(product.id) !== -1) {
+      console.error('Failed to ' + (adding ? 'add' : 'remove') + ' item ' + product.id);
+      return;
+    }
+
+    var cart = getCart().filter(function (id) { return id !== product.id; });
+    if (adding) {
+      cart.push(product.id);
+    }
+    setCart(cart);
+
+    var cartItem = button.closest('.cart_item');
+    if (cartItem) {
+      cartItem.parentNode.removeChild(cartItem);
+    } else {
+      button.outerHTML = cartButtonHtml(product, adding, 'btn_inventory');
+    }
+    renderBadge();
+  }
+
+  root.addEventListener('click', function (event) {
+    var target = event.target.closest('button, a');
+    if (!target) {
+      return;
+    }
+    var id = target.id;
+
+    if (target.tagName === 'BUTTON' && /^(add-to-cart-|remove-)/.test(id)) {
+      toggleCartItem(target);
+    } else if (id === 'react-burger-menu-btn') {
+      document.querySelector('.bm-menu-wrap').classList.add('open');
+    } else if (id === 'react-burger-cross-btn') {
+      document.querySelector('.bm-menu-wrap').classList.remove('open');
+    } else if (id === 'logout_sidebar_link') {
+      event.preventDefault();
+      clearSessionUser();
+      navigate('/');
+    } else if (id === 'reset_sidebar_link') {
+      event.preventDefault();
+      setCart([]);
+      route();
+    } else if (id === 'continue-shopping' || id === 'back-to-products') {
+      navigate('/inventory.html');
+    } else if (id === 'checkout') {
+      navigate('/checkout-step-one.html');
+    } else if (id === 'cancel') {
+      navigate(window.location.pathname === '/checkout-step-one.html' ? '/cart.html' : '/inventory.html');
+    } else if (id === 'finish') {
+      setCart([]);
+      navigate('/checkout-complete.html');
+    }
+  });
+
+  /* ---------- Routing ---------- */
+
+  var PAGES = {
+    '/inventory.html': renderInventory,
+    '/inventory-item.html': renderInventoryItem,
+    '/cart.html': renderCart,
+    '/checkout-step-one.html': renderCheckoutStepOne,
+    '/checkout-step-two.html': renderCheckoutStepTwo,
+    '/checkout-complete.html': renderCheckoutComplete
+  };
+
+  function route() {
+    var path = window.location.pathname;
+    var render = PAGES[path];
+    if (!render) {
+      renderLogin();
+      return;
+    }
+    if (!getSessionUser()) {
+      window.sessionStorage.setItem(LOGIN_ERROR_KEY,
+        "Epic sadface: You can only access '" + path + "' when you are logged in.");
+      window.location.replace('/');
+      return;
+    }
+    document.body.className = '';
+    render();
+  }
+
+  route();
+}());
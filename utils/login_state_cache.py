@@ -0,0 +1,76 @@
+"""
+Login State Cache
+"""
+
+from urllib.parse import urljoin
+from selenium.common.exceptions import WebDriverException
+from pages.login_page import LoginPage
+from pages.products_page import ProductsPage
+import logging
+
+
+class LoginStateCache:
+
+    STATS_SECTION = 'login cache'
+
+    CLEAR_STORAGE_SCRIPT = "window.localStorage.clear(); window.sessionStorage.clear();"
+
+    CAPTURE_STORAGE_SCRIPT = """
+        return [Object.assign({}, window.localStorage), Object.assign({}, window.sessionStorage)];
+    """
+
+    RESTORE_STORAGE_SCRIPT = """
+        var local = arguments[0], session = arguments[1];
+        Object.keys(local).forEach(function (key) { window.localStorage.setItem(key, local[key]); });
+        Object.keys(session).forEach(function (key) { window.sessionStorage.setItem(key, session[key]); });
+    """
+
+    def __init__(self, config, stats):
+        self.config = config
+        self.stats = stats
+        self.verify_timeout = config.get('login_cache', {}).get('verify_timeout', 3)
+        self.logger = logging.getLogger(__name__)
+        self._states = {}
+
+    def login(self, driver, user_key='standard_user', force_ui=False):
+
+        if not force_ui and user_key in self._states:
+            if self._restore(driver, self._states[user_key]):
+                self.stats.increment(self.STATS_SECTION, 'hits')
+                return True
+            self.logger.warning(f"Cached login state rejected for {user_key}, falling back to UI login")
+            self.stats.increment(self.STATS_SECTION, 'rejected')
+            self._states.pop(user_key, None)
+            # Injected storage must not leak into the UI login
+            driver.delete_all_cookies()
+            driver.get(self.config['base_url'])
+            driver.execute_script(self.CLEAR_STORAGE_SCRIPT)
+
+        self.stats.increment(self.STATS_SECTION, 'ui_logins')
+        credentials = self.config['users'][user_key]
+        LoginPage(driver, self.config).login(credentials['username'], credentials['password'])
+        if not ProductsPage(driver, self.config).is_products_page_loaded():
+            return False
+
+        self._states[user_key] = self._capture(driver)
+        return True
+
+    def _capture(self, driver):
+        local_storage, session_storage = driver.execute_script(self.CAPTURE_STORAGE_SCRIPT)
+        return {
+            'cookies': driver.get_cookies(),
+            'local_storage': local_storage,
+            'session_storage': session_storage,
+        }
+
+    def _restore(self, driver, state):
+        # Cookies and storage can only be written for the origin currently loaded (base_url)
+        try:
+            for cookie in state['cookies']:
+                driver.add_cookie(cookie)
+            driver.execute_script(self.RESTORE_STORAGE_SCRIPT, state['local_storage'], state['session_storage'])
+            driver.get(urljoin(self.config['base_url'], 'inventory.html'))
+        except WebDriverException as e:
+            self.logger.warning(f"Failed to inject login state: {e}")
+            return False
+        return ProductsPage(driver, self.config).is_products_page_loaded(self.verify_timeout)
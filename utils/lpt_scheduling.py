@@ -0,0 +1,86 @@
+"""
+Longest-Processing-Time Scheduling for pytest-xdist
+"""
+
+import time
+from xdist.scheduler import LoadScheduling
+from utils.duration_history import lpt_plan
+
+
+class LPTScheduling(LoadScheduling):
+    """Hands out tests longest first, each to the next worker that frees up, using estimated durations"""
+
+    # Tests assigned ahead per worker; a worker needs its next test before it can finish the current one
+    LOOKAHEAD = 2
+
+    def __init__(self, config, log=None, load_estimates=None):
+        super().__init__(config, log)
+        # load_estimates(nodeids) -> {nodeid: seconds}; read once the collection is known
+        self.load_estimates = load_estimates or (lambda nodeids: {})
+        self.estimates = {}
+        self.predicted_makespan = None
+        self.started_at = None
+        self.finished_at = None
+        self.busy = {}
+
+    def schedule(self):
+
+        assert self.collection_is_completed
+        if self.collection is not None:
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        self.collection = next(iter(self.node2collection.values()))
+        if not self.collection:
+            return
+        self.estimates = self.load_estimates(self.collection)
+        self.pending[:] = sorted(
+            range(len(self.collection)), key=lambda index: -self.estimates.get(self.collection[index], 0.0)
+        )
+        plan = lpt_plan({nodeid: self.estimates.get(nodeid, 0.0) for nodeid in self.collection}, len(self.nodes))
+        self.predicted_makespan = max(load for load, _, _ in plan)
+        self.started_at = time.perf_counter()
+
+        # Second round in reverse, so the worker with the shortest first test gets the next-longest one
+        for node in self.nodes + self.nodes[::-1]:
+            self._send_tests(node, 1)
+        if not self.pending:
+            for node in self.nodes:
+                node.shutdown()
+
+    def check_schedule(self, node, duration=0):
+
+        if node.shutting_down:
+            return
+        if self.pending:
+            missing = self.LOOKAHEAD - len(self.node2pending[node])
+            if missing > 0:
+                self._send_tests(node, missing)
+        else:
+            node.shutdown()
+
+    def mark_test_complete(self, node, item_index, duration=0):
+
+        worker = node.gateway.id
+        self.busy[worker] = self.busy.get(worker, 0.0) + duration
+        self.finished_at = time.perf_counter()
+        super().mark_test_complete(node, item_index, duration)
+
+    def summary_lines(self):
+
+        if self.predicted_makespan is None or self.finished_at is None:
+            return []
+        actual = self.finished_at - self.started_at
+        lines = [
+            f"LPT schedule over {len(self.busy)} workers:",
+            f"  predicted makespan: {self.predicted_makespan:.1f} s",
+            f"  actual makespan: {actual:.1f} s",
+        ]
+        if self.busy:
+            busiest = max(self.busy.values())
+            lines.append(f"  worker busy time: max {busiest:.1f} s, min {min(self.busy.values()):.1f} s")
+        return lines
@@ -0,0 +1,162 @@
+"""
+Browser Memory Watchdog
+"""
+
+import os
+from collections import namedtuple
+import logging
+
+try:
+    import psutil
+except ImportError:
+    # Falls back to reading /proc directly (Linux only)
+    psutil = None
+
+
+MemorySample = namedtuple('MemorySample', ['browser_rss_mb', 'chromedriver_rss_mb', 'js_heap_mb'])
+
+MB = 1024 * 1024
+
+
+class MemoryWatchdog:
+
+    STATS_SECTION = 'browser memory (MB)'
+
+    JS_HEAP_SCRIPT = "return window.performance && performance.memory ? performance.memory.usedJSHeapSize : null;"
+
+    def __init__(self, config, stats=None):
+        watchdog_config = config.get('memory_watchdog', {})
+        self.max_browser_rss_mb = watchdog_config.get('max_browser_rss_mb', 1500)
+        self.max_js_heap_mb = watchdog_config.get('max_js_heap_mb', 512)
+        self.stats = stats
+        self.logger = logging.getLogger(__name__)
+        self._browser_pids = {}
+
+    def sample(self, driver, chromedriver_pid=None):
+
+        browser_pid = self.browser_pid(driver, chromedriver_pid)
+        browser_rss = self._tree_rss(browser_pid) / MB if browser_pid else None
+        chromedriver_rss = self._rss(chromedriver_pid) / MB if chromedriver_pid else None
+        try:
+            js_heap = driver.execute_script(self.JS_HEAP_SCRIPT)
+        except Exception as e:
+            self.logger.debug(f"Could not read JS heap size: {e}")
+            js_heap = None
+        return MemorySample(browser_rss, chromedriver_rss, js_heap / MB if js_heap is not None else None)
+
+    def recycle_reason(self, sample):
+
+        if sample.browser_rss_mb is not None and sample.browser_rss_mb > self.max_browser_rss_mb:
+            return f"browser RSS {sample.browser_rss_mb:.0f} MB"
+        if sample.js_heap_mb is not None and sample.js_heap_mb > self.max_js_heap_mb:
+            return f"JS heap {sample.js_heap_mb:.0f} MB"
+        return None
+
+    def record_delta(self, before, after):
+
+        # Deltas per test, so leaky flows stand out in the summary
+        deltas = {}
+        for field in MemorySample._fields:
+            if getattr(before, field) is not None and getattr(after, field) is not None:
+                deltas[field] = getattr(after, field) - getattr(before, field)
+        if self.stats is not None:
+            for field, delta in deltas.items():
+                self.stats.record(self.STATS_SECTION, f"{field} delta", delta)
+            if after.browser_rss_mb is not None:
+                self.stats.record(self.STATS_SECTION, 'browser_rss_mb', after.browser_rss_mb)
+        return deltas
+
+    def process_tree_mb(self, pid):
+
+        return self._tree_rss(pid) / MB
+
+    def forget(self, driver):
+
+        self._browser_pids.pop(id(driver), None)
+
+    def browser_pid(self, driver, chromedriver_pid=None):
+
+        pid = self._browser_pids.get(id(driver))
+        if pid is not None and self._alive(pid):
+            return pid
+        # Every browser gets its own profile directory, which identifies its process among the chromedriver's children
+        user_data_dir = driver.capabilities.get('chrome', {}).get('userDataDir')
+        if not user_data_dir:
+            return None
+        pid = self._find_browser(f"--user-data-dir={user_data_dir}", chromedriver_pid)
+        if pid is not None:
+            self._browser_pids[id(driver)] = pid
+        return pid
+
+    def _find_browser(self, marker, chromedriver_pid):
+        candidates = self._children(chromedriver_pid) if chromedriver_pid else self._all_pids()
+        for pid in candidates:
+            cmdline = self._cmdline(pid)
+            # The browser process is the one without --type=; renderers and helpers carry the flag too
+            if marker in cmdline and not any(arg.startswith('--type=') for arg in cmdline):
+                return pid
+        return None
+
+    def _tree_rss(self, pid):
+        return sum(self._rss(child) for child in [pid] + self._children(pid))
+
+    @staticmethod
+    def _alive(pid):
+        if psutil is not None:
+            return psutil.pid_exists(pid)
+        return os.path.exists(f"/proc/{pid}")
+
+    @staticmethod
+    def _all_pids():
+        if psutil is not None:
+            return psutil.pids()
+        return [int(entry) for entry in os.listdir('/proc') if entry.isdigit()]
+
+    def _children(self, pid):
+        if psutil is not None:
+            try:
+                return [child.pid for child in psutil.Process(pid).children(recursive=True)]
+            except psutil.Error:
+                return []
+
+        parents = {}
+        for candidate in self._all_pids():
+            try:
+                with open(f"/proc/{candidate}/stat") as f:
+                    # Field 4 is the parent pid; the command name in field 2 may contain spaces
+                    parents[candidate] = int(f.read().rsplit(')', 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+        children, frontier = [], [pid]
+        while frontier:
+            parent = frontier.pop()
+            found = [child for child, child_parent in parents.items() if child_parent == parent]
+            children.extend(found)
+            frontier.extend(found)
+        return children
+
+    @staticmethod
+    def _cmdline(pid):
+        if psutil is not None:
+            try:
+                return psutil.Process(pid).cmdline()
+            except psutil.Error:
+                return []
+        try:
+            with open(f"/proc/{pid}/cmdline", 'rb') as f:
+                return f.read().decode('utf-8', 'replace').split('\0')
+        except OSError:
+            return []
+
+    @staticmethod
+    def _rss(pid):
+        if psutil is not None:
+            try:
+                return psutil.Process(pid).memory_info().rss
+            except psutil.Error:
+                return 0
+        try:
+            with open(f"/proc/{pid}/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, IndexError, ValueError):
+            return 0
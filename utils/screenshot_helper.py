@@ -2,20 +2,93 @@
 Screenshot Helper
 """
 
+import base64
+import io
+import math
 import os
+import struct
+import zlib
 from datetime import datetime
 from pathlib import Path
-from PIL import Image
 import logging
 
 
+class StreamingPngWriter:
+    """Writes an RGB PNG tile by tile, so the full image never has to be held in memory"""
+
+    SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+    def __init__(self, path, compress_level=6):
+        self.path = path
+        self.compress_level = compress_level
+        self.width = None
+        self.height = 0
+        self._file = None
+        self._compressor = None
+
+    def __enter__(self):
+        self._file = open(self.path, 'wb')
+        self._file.write(self.SIGNATURE)
+        # Height is unknown until the last tile; IHDR is rewritten in place on close
+        self._write_chunk(b'IHDR', self._ihdr(0, 0))
+        self._compressor = zlib.compressobj(self.compress_level)
+        return self
+
+    def write_tile(self, image):
+
+        image = image.convert('RGB')
+        if self.width is None:
+            self.width = image.width
+        elif image.width != self.width:
+            image = image.crop((0, 0, self.width, image.height))
+
+        stride = self.width * 3
+        raw = image.tobytes()
+        # Every scanline is prefixed with filter type 0 (None)
+        scanlines = b''.join(b'\x00' + raw[row * stride:(row + 1) * stride] for row in range(image.height))
+        self._write_idat(self._compressor.compress(scanlines))
+        self.height += image.height
+
+    def __exit__(self, exc_type, exc, traceback):
+        try:
+            if exc_type is None:
+                self._write_idat(self._compressor.flush())
+                self._write_chunk(b'IEND', b'')
+                self._file.seek(len(self.SIGNATURE))
+                self._write_chunk(b'IHDR', self._ihdr(self.width or 0, self.height))
+        finally:
+            self._file.close()
+        return False
+
+    @staticmethod
+    def _ihdr(width, height):
+        # 8-bit truecolour, default compression/filter, no interlace
+        return struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+
+    def _write_idat(self, data):
+        if data:
+            self._write_chunk(b'IDAT', data)
+
+    def _write_chunk(self, chunk_type, data):
+        self._file.write(struct.pack('>I', len(data)))
+        self._file.write(chunk_type)
+        self._file.write(data)
+        self._file.write(struct.pack('>I', zlib.crc32(chunk_type + data) & 0xffffffff))
+
+
 class ScreenshotHelper:
 
-    def __init__(self, driver, config):
+    CHROMIUM_BROWSERS = ('chrome', 'chromium', 'msedge', 'microsoftedge')
+
+    def __init__(self, driver, config, writer=None):
         self.driver = driver
         self.config = config
+        # Optional ScreenshotWriter; when set, decoding and disk writes happen off the test thread
+        self.writer = writer
         self.screenshots_enabled = config.get('screenshots', {}).get('enabled', True)
         self.screenshots_path = config.get('screenshots', {}).get('path', 'reports/screenshots')
+        # Full-page captures taller than this (CSS pixels) are captured and stitched in tiles
+        self.full_page_tile_height = config.get('screenshots', {}).get('full_page_tile_height', 4096)
         self.logger = logging.getLogger(__name__)
         
         # Create screenshots directory if it doesn't exist
@@ -41,6 +114,8 @@ class ScreenshotHelper:
             filepath = os.path.join(self.screenshots_path, filename)
             
             # Capture screenshot
+            if self.writer is not None:
+                return self._submit(self.driver.get_screenshot_as_base64(), filepath)
             self.driver.save_screenshot(filepath)
             self.logger.info(f"Screenshot saved: {filepath}")
             
@@ -66,6 +141,8 @@ class ScreenshotHelper:
             filepath = os.path.join(self.screenshots_path, filename)
             
             # Capture element screenshot
+            if self.writer is not None:
+                return self._submit(element.screenshot_as_base64, filepath)
             element.screenshot(filepath)
             self.logger.info(f"Element screenshot saved: {filepath}")
             
@@ -89,6 +166,10 @@ class ScreenshotHelper:
                 filename = f"fullpage_{timestamp}.png"
             
             filepath = os.path.join(self.screenshots_path, filename)
+
+            # Chromium captures beyond the viewport through DevTools, without resizing the window
+            if self._supports_cdp():
+                return self._capture_full_page_cdp(filepath)
             
             # Get page dimensions
             original_size = self.driver.get_window_size()
@@ -99,11 +180,15 @@ class ScreenshotHelper:
             self.driver.set_window_size(required_width, required_height)
             
             # Capture screenshot
-            self.driver.save_screenshot(filepath)
+            screenshot = self.driver.get_screenshot_as_base64() if self.writer is not None else None
+            if screenshot is None:
+                self.driver.save_screenshot(filepath)
             
             # Restore original window size
             self.driver.set_window_size(original_size['width'], original_size['height'])
             
+            if screenshot is not None:
+                return self._submit(screenshot, filepath)
             self.logger.info(f"Full page screenshot saved: {filepath}")
             
             return filepath
@@ -116,3 +201,42 @@ class ScreenshotHelper:
             except:
                 pass
             return None
+
+    def _supports_cdp(self):
+        browser_name = self.driver.capabilities.get('browserName', '').lower()
+        return browser_name in self.CHROMIUM_BROWSERS and hasattr(self.driver, 'execute_cdp_cmd')
+
+    def _capture_full_page_cdp(self, filepath):
+        metrics = self.driver.execute_cdp_cmd('Page.getLayoutMetrics', {})
+        content_size = metrics.get('cssContentSize') or metrics['contentSize']
+        width = math.ceil(content_size['width'])
+        height = math.ceil(content_size['height'])
+
+        if height <= self.full_page_tile_height:
+            screenshot = self._capture_clip(0, width, height)
+            if self.writer is not None:
+                return self._submit(screenshot, filepath)
+            Path(filepath).write_bytes(base64.b64decode(screenshot))
+        else:
+            # Tall page: only one decoded tile is in memory at a time. Pillow is only needed here, so importing the
+            # helper does not load it
+            from PIL import Image
+            with StreamingPngWriter(filepath) as png:
+                for top in range(0, height, self.full_page_tile_height):
+                    tile_height = min(self.full_page_tile_height, height - top)
+                    png.write_tile(Image.open(io.BytesIO(base64.b64decode(self._capture_clip(top, width, tile_height)))))
+
+        self.logger.info(f"Full page screenshot saved: {filepath}")
+        return filepath
+
+    def _capture_clip(self, top, width, height):
+        return self.driver.execute_cdp_cmd('Page.captureScreenshot', {
+            'format': 'png',
+            'captureBeyondViewport': True,
+            'clip': {'x': 0, 'y': top, 'width': width, 'height': height, 'scale': 1},
+        })['data']
+
+    def _submit(self, screenshot, filepath):
+        pending = self.writer.submit(screenshot, filepath)
+        self.logger.info(f"Screenshot queued: {pending.path}")
+        return str(pending.path)
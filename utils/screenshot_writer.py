@@ -0,0 +1,145 @@
+"""
+Asynchronous Screenshot Writer
+"""
+
+import base64
+import hashlib
+import io
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+import logging
+
+
+PendingScreenshot = namedtuple('PendingScreenshot', ['path', 'future'])
+
+
+class ScreenshotWriter:
+
+    STATS_SECTION = 'screenshot pipeline'
+
+    EXTENSIONS = {'png': '.png', 'webp': '.webp'}
+
+    def __init__(self, stats=None, image_format='png', optimize=False, max_width=None, queue_size=16, workers=2):
+        if image_format not in self.EXTENSIONS:
+            raise ValueError(f"Unsupported screenshot format: {image_format}")
+        self.stats = stats
+        self.image_format = image_format
+        self.optimize = optimize
+        self.max_width = max_width
+        self.queue_size = queue_size
+        self.logger = logging.getLogger(__name__)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='screenshot-writer')
+        # Bounds the frames held in memory; a test thread only blocks when the writer falls this far behind
+        self._slots = threading.BoundedSemaphore(queue_size)
+        self._lock = threading.Lock()
+        self._by_digest = {}
+        self._futures = []
+        self._depth = 0
+
+    @classmethod
+    def from_config(cls, config, stats=None):
+
+        screenshots = config.get('screenshots', {})
+        return cls(
+            stats,
+            image_format=screenshots.get('format', 'png'),
+            optimize=screenshots.get('optimize', False),
+            max_width=screenshots.get('max_width'),
+            queue_size=screenshots.get('queue_size', 16),
+        )
+
+    def target_path(self, path):
+
+        return Path(path).with_suffix(self.EXTENSIONS[self.image_format])
+
+    def submit(self, data, path):
+        # data is PNG bytes or the base64 string WebDriver returns; decoding happens on the writer thread
+        digest = hashlib.blake2b(data if isinstance(data, bytes) else data.encode('ascii'), digest_size=16).digest()
+        with self._lock:
+            existing = self._by_digest.get(digest)
+            if existing is None:
+                pending = PendingScreenshot(self.target_path(path), Future())
+                self._by_digest[digest] = pending
+                self._futures.append(pending.future)
+
+        if existing is not None:
+            # Identical frame already written (or being written): hand back its path instead of writing a copy
+            self._increment('duplicates')
+            self._increment('bytes_saved', self._decoded_size(data))
+            return existing
+
+        self._slots.acquire()
+        with self._lock:
+            self._depth += 1
+            self._record('queue_depth', self._depth)
+        self._increment('submitted')
+        self._executor.submit(self._write, data, pending, digest)
+        return pending
+
+    def flush(self, timeout=None):
+
+        with self._lock:
+            futures = list(self._futures)
+        wait(futures, timeout=timeout)
+
+    def close(self):
+
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+    def _write(self, data, pending, digest):
+        started_at = time.perf_counter()
+        try:
+            png_bytes = data if isinstance(data, bytes) else base64.b64decode(data)
+            encoded = self._encode(png_bytes)
+            pending.path.parent.mkdir(parents=True, exist_ok=True)
+            pending.path.write_bytes(encoded)
+            self._increment('bytes_in', len(png_bytes))
+            self._increment('bytes_out', len(encoded))
+            self._increment('bytes_saved', max(0, len(png_bytes) - len(encoded)))
+            self._record('encode_ms', (time.perf_counter() - started_at) * 1000)
+            pending.future.set_result(str(pending.path))
+        except Exception as e:
+            self.logger.error(f"Failed to write screenshot {pending.path}: {e}")
+            # A later identical frame must be written again rather than point at a file that does not exist
+            with self._lock:
+                if self._by_digest.get(digest) is pending:
+                    del self._by_digest[digest]
+            pending.future.set_exception(e)
+        finally:
+            with self._lock:
+                self._depth -= 1
+            self._slots.release()
+
+    def _encode(self, png_bytes):
+        if self.image_format == 'png' and not self.optimize and not self.max_width:
+            return png_bytes
+
+        # The writer is built for every run, but Pillow is only needed when frames are re-encoded
+        from PIL import Image
+        image = Image.open(io.BytesIO(png_bytes))
+        if self.max_width and image.width > self.max_width:
+            height = round(image.height * self.max_width / image.width)
+            image = image.resize((self.max_width, height), Image.LANCZOS)
+
+        output = io.BytesIO()
+        if self.image_format == 'webp':
+            image.save(output, format='WEBP', quality=80, method=4)
+        else:
+            image.save(output, format='PNG', optimize=self.optimize)
+        return output.getvalue()
+
+    @staticmethod
+    def _decoded_size(data):
+        return len(data) if isinstance(data, bytes) else len(data) * 3 // 4
+
+    def _increment(self, key, amount=1):
+        if self.stats is not None:
+            self.stats.increment(self.STATS_SECTION, key, amount)
+
+    def _record(self, key, value):
+        if self.stats is not None:
+            self.stats.record(self.STATS_SECTION, key, value)
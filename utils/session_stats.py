@@ -0,0 +1,55 @@
+"""
+Session Statistics
+"""
+
+import threading
+
+
+class SessionStats:
+
+    def __init__(self):
+        self.sections = {}
+        # Background threads (pre-spawning, screenshot writer) report here too
+        self._lock = threading.RLock()
+
+    def section(self, name):
+        with self._lock:
+            return self.sections.setdefault(name, {})
+
+    def increment(self, section, key, amount=1):
+        with self._lock:
+            values = self.section(section)
+            values[key] = values.get(key, 0) + amount
+
+    def record(self, section, key, value):
+        with self._lock:
+            self.section(section).setdefault(key, []).append(value)
+
+    def merge(self, sections):
+        # Counters are summed and samples concatenated, so worker output can be folded in
+        for name, values in sections.items():
+            for key, value in values.items():
+                if isinstance(value, list):
+                    self.section(name).setdefault(key, []).extend(value)
+                else:
+                    self.increment(name, key, value)
+
+    def summary_lines(self):
+        lines = []
+        for name in sorted(self.sections):
+            lines.append(f"{name}:")
+            for key, value in sorted(self.sections[name].items()):
+                if isinstance(value, list):
+                    lines.append(f"  {key}: {self._describe_samples(value)}")
+                else:
+                    lines.append(f"  {key}: {value:g}" if isinstance(value, float) else f"  {key}: {value}")
+        return lines
+
+    @staticmethod
+    def _describe_samples(samples):
+        if not samples:
+            return "n=0"
+        ordered = sorted(samples)
+        mean = sum(ordered) / len(ordered)
+        p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+        return f"n={len(ordered)} mean={mean:.1f} p95={p95:.1f} max={ordered[-1]:.1f}"
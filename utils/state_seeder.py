@@ -0,0 +1,118 @@
+"""
+State Seeder
+"""
+
+import json
+import time
+from urllib.parse import urljoin
+from utils.catalog import PRODUCTS, PRODUCTS_BY_NAME
+from utils.step_log import step_log
+import logging
+
+
+# Pages that can be opened directly once session and cart state are in place
+PAGE_PATHS = {
+    'inventory': 'inventory.html',
+    'cart': 'cart.html',
+    'checkout_step_one': 'checkout-step-one.html',
+    'checkout_step_two': 'checkout-step-two.html',
+    'checkout_complete': 'checkout-complete.html',
+}
+
+
+class StateSeeder:
+    """Writes SauceDemo's session cookie and cart storage directly, so tests can start at the step under test"""
+
+    STATS_SECTION = 'state seeding'
+
+    # SauceDemo keeps the logged-in user in a cookie and the cart as a JSON array of product ids in localStorage
+    SESSION_COOKIE = 'session-username'
+    CART_KEY = 'cart-contents'
+
+    WRITE_CART_SCRIPT = "window.localStorage.setItem(arguments[0], JSON.stringify(arguments[1]));"
+
+    READ_CART_SCRIPT = "return window.localStorage.getItem(arguments[0]);"
+
+    CLEAR_CART_SCRIPT = "window.localStorage.removeItem(arguments[0]);"
+
+    def __init__(self, driver, config, stats=None):
+        self.driver = driver
+        self.config = config
+        self.stats = stats
+        self.logger = logging.getLogger(__name__)
+
+    def seed_session(self, user_key='standard_user'):
+
+        self._ensure_origin()
+        username = self.config['users'][user_key]['username']
+        self.driver.add_cookie({'name': self.SESSION_COOKIE, 'value': username, 'path': '/'})
+
+    def seed_cart(self, product_names):
+
+        unknown = [name for name in product_names if name not in PRODUCTS_BY_NAME]
+        if unknown:
+            raise ValueError(f"Unknown products: {', '.join(unknown)}")
+        self._ensure_origin()
+        ids = [PRODUCTS_BY_NAME[name]['id'] for name in product_names]
+        self.driver.execute_script(self.WRITE_CART_SCRIPT, self.CART_KEY, ids)
+
+    def open_at(self, page, state=None):
+
+        # page is a PAGE_PATHS key or a path relative to base_url; state may hold 'user' and 'cart' (product names)
+        started_at = time.perf_counter()
+        state = state or {}
+        self.seed_session(state.get('user', 'standard_user'))
+        if 'cart' in state:
+            self.seed_cart(state['cart'])
+        self.driver.get(urljoin(self.config['base_url'], PAGE_PATHS.get(page, page)))
+        open_ms = (time.perf_counter() - started_at) * 1000
+        if self.stats is not None:
+            self.stats.increment(self.STATS_SECTION, 'seeded')
+            self.stats.record(self.STATS_SECTION, 'open_ms', open_ms)
+        step_log.record('StateSeeder', 'open_at', detail=page, duration_ms=open_ms)
+
+    def read_state(self):
+
+        cookie = self.driver.get_cookie(self.SESSION_COOKIE)
+        raw_cart = self.driver.execute_script(self.READ_CART_SCRIPT, self.CART_KEY)
+        names_by_id = {product['id']: product['name'] for product in PRODUCTS}
+        return {
+            'user': cookie['value'] if cookie else None,
+            'cart': [names_by_id.get(product_id, product_id) for product_id in json.loads(raw_cart or '[]')],
+        }
+
+    def validate_cart(self, product_names, user_key='standard_user'):
+
+        # Builds the same cart through the UI and by seeding; both must leave identical storage and cart contents
+        from pages.cart_page import CartPage
+        from pages.products_page import ProductsPage
+
+        self.clear_cart()
+        self.open_at('inventory', {'user': user_key})
+        products_page = ProductsPage(self.driver, self.config)
+        products_page.is_products_page_loaded()
+        # One WebDriver click per product, as a user would; the bulk JS click could hide a broken button
+        for name in product_names:
+            products_page.add_product_to_cart_by_name(name)
+        products_page.click_shopping_cart()
+        ui_state = dict(self.read_state(), rendered=CartPage(self.driver, self.config).get_cart_item_names())
+
+        self.clear_cart()
+        self.open_at('cart', {'user': user_key, 'cart': product_names})
+        cart_page = CartPage(self.driver, self.config)
+        cart_page.is_cart_page_loaded()
+        seeded_state = dict(self.read_state(), rendered=cart_page.get_cart_item_names())
+
+        if ui_state != seeded_state:
+            self.logger.warning(f"Seeded state differs from UI path: ui={ui_state} seeded={seeded_state}")
+        return ui_state == seeded_state, ui_state, seeded_state
+
+    def clear_cart(self):
+
+        self._ensure_origin()
+        self.driver.execute_script(self.CLEAR_CART_SCRIPT, self.CART_KEY)
+
+    def _ensure_origin(self):
+        # Cookies and storage can only be written for the origin currently loaded
+        if not self.driver.current_url.startswith(self.config['base_url']):
+            self.driver.get(self.config['base_url'])
@@ -0,0 +1,55 @@
+"""
+Step Log
+"""
+
+import time
+from collections import deque
+import logging
+
+
+class StepLog:
+    """Ring buffer of page-object steps; records stay raw tuples until the log is actually emitted"""
+
+    def __init__(self, capacity=200):
+        self._records = deque(maxlen=capacity)
+        self._started_at = time.perf_counter()
+        self.logger = logging.getLogger(__name__)
+
+    def record(self, page, action, locator=None, detail=None, duration_ms=None, outcome=None):
+
+        # outcome: 'ok', 'timeout' or 'error' for actions that can fail, None for steps that only mark progress
+        self._records.append((time.perf_counter(), page, action, locator, detail, duration_ms, outcome))
+
+    def reset(self):
+
+        self._records.clear()
+        self._started_at = time.perf_counter()
+
+    def __len__(self):
+        return len(self._records)
+
+    def format_lines(self):
+
+        lines = []
+        for timestamp, page, action, locator, detail, duration_ms, outcome in list(self._records):
+            line = f"{(timestamp - self._started_at) * 1000:9.1f} ms  {page}.{action}"
+            if locator is not None:
+                line += f" {locator[0]}={locator[1]}"
+            if detail is not None:
+                line += f" {detail}"
+            if duration_ms is not None:
+                line += f" ({duration_ms:.1f} ms)"
+            if outcome not in (None, 'ok'):
+                line += f" [{outcome}]"
+            lines.append(line)
+        return lines
+
+    def emit(self, title):
+
+        lines = self.format_lines()
+        self.logger.info('\n'.join([f"{title} ({len(lines)} steps)"] + lines))
+        return lines
+
+
+# Tests run one at a time per process, so one buffer per process (per xdist worker) is enough
+step_log = StepLog()
@@ -2,20 +2,130 @@
 Test Data Generator
 """
 
-from faker import Faker
+import hashlib
+import itertools
+import os
 import random
+import threading
+from faker import Faker
 import logging
 
 
+# Building a Faker for a locale loads and instantiates every provider (over a millisecond), so all generators share
+# one instance per locale; seeded generators bring their own random.Random (see SeededFaker)
+_fakers = {}
+_fakers_lock = threading.Lock()
+
+# Pre-generated records per (locale, data type), filled once per process (i.e. once per xdist worker)
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_faker(locale='en_US'):
+
+    with _fakers_lock:
+        faker = _fakers.get(locale)
+        if faker is None:
+            faker = _fakers[locale] = Faker(locale)
+        return faker
+
+
+class SeededFaker:
+    """The locale's shared Faker, drawing from a random.Random of its own so seeded generators never shift each other"""
+
+    # Swapping the shared instance's random is not thread-safe on its own
+    _lock = threading.RLock()
+
+    def __init__(self, faker, seed=None):
+        self.faker = faker
+        self.random = random.Random(seed)
+
+    def seed_instance(self, seed=None):
+
+        self.random.seed(seed)
+
+    def __getattr__(self, name):
+        attribute = getattr(self.faker, name)
+        if not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            with self._lock:
+                previous = self.faker.random
+                self.faker.random = self.random
+                try:
+                    return attribute(*args, **kwargs)
+                finally:
+                    self.faker.random = previous
+        return call
+
+
+def seed_for(name):
+
+    return int.from_bytes(hashlib.blake2b(name.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class RecordPool:
+    """Columnar store of pre-generated records; every record is handed out once"""
+
+    def __init__(self, generator, size=500):
+        self.generator = generator
+        self.size = size
+        self.columns = {}
+        self.filled = 0
+        self._cursor = itertools.count()
+        self._lock = threading.Lock()
+
+    def take(self):
+
+        index = next(self._cursor)
+        if index >= self.filled:
+            self._fill(index)
+        return {key: column[index] for key, column in self.columns.items()}
+
+    def _fill(self, index):
+        with self._lock:
+            while index >= self.filled:
+                for record in itertools.islice(self.generator, self.size):
+                    for key, value in record.items():
+                        self.columns.setdefault(key, []).append(value)
+                self.filled += self.size
+
+
 class TestDataGenerator:
 
-    def __init__(self, locale='en_US'):
+    POOLED_TYPES = ('person', 'address', 'company', 'checkout', 'product')
+
+    def __init__(self, locale='en_US', seed=None, pooled=False, pool_size=500, faker=None):
 
-        self.faker = Faker(locale)
+        self.locale = locale
+        self.faker = faker or get_faker(locale)
+        self.pooled = pooled
+        self.pool_size = pool_size
         self.logger = logging.getLogger(__name__)
-    
+        self.seed = None
+        if seed is not None:
+            self.reseed(seed)
+
+    @classmethod
+    def for_test(cls, nodeid, **kwargs):
+
+        # Same node id, same data: a failing test can be rerun with exactly the values it saw
+        generator = cls(seed=seed_for(nodeid), **kwargs)
+        generator.logger.info(f"Test data seed for {nodeid}: {generator.seed}")
+        return generator
+
+    def reseed(self, seed):
+
+        self.seed = seed
+        if self.faker is get_faker(self.locale):
+            self.faker = SeededFaker(self.faker)
+        self.faker.seed_instance(seed)
+
     def generate_person_data(self):
 
+        if self.pooled:
+            return self._take('person')
         return {
             'first_name': self.faker.first_name(),
             'last_name': self.faker.last_name(),
@@ -28,6 +138,8 @@ class TestDataGenerator:
     
     def generate_address_data(self):
 
+        if self.pooled:
+            return self._take('address')
         return {
             'street_address': self.faker.street_address(),
             'city': self.faker.city(),
@@ -40,6 +152,8 @@ class TestDataGenerator:
     
     def generate_company_data(self):
 
+        if self.pooled:
+            return self._take('company')
         return {
             'company_name': self.faker.company(),
             'job_title': self.faker.job(),
@@ -49,6 +163,8 @@ class TestDataGenerator:
     
     def generate_checkout_data(self):
 
+        if self.pooled:
+            return self._take('checkout')
         return {
             'first_name': self.faker.first_name(),
             'last_name': self.faker.last_name(),
@@ -88,11 +204,11 @@ class TestDataGenerator:
     
     def generate_random_number(self, min_value=1, max_value=100):
 
-        return random.randint(min_value, max_value)
+        return self.faker.random.randint(min_value, max_value)
     
     def generate_random_choice(self, choices):
 
-        return random.choice(choices)
+        return self.faker.random.choice(choices)
     
     def generate_date_data(self):
 
@@ -115,28 +231,47 @@ class TestDataGenerator:
     
     def generate_product_data(self):
 
+        if self.pooled:
+            return self._take('product')
         return {
             'product_name': self.faker.catch_phrase(),
             'description': self.faker.text(max_nb_chars=200),
-            'price': round(random.uniform(10.0, 1000.0), 2),
-            'quantity': random.randint(1, 10),
+            'price': round(self.faker.random.uniform(10.0, 1000.0), 2),
+            'quantity': self.faker.random.randint(1, 10),
             'sku': self.faker.ean13(),
             'barcode': self.faker.ean8(),
         }
     
     def generate_bulk_data(self, data_type='person', count=10):
 
-        data_generators = {
+        return list(self.iter_bulk_data(data_type, count))
+
+    def iter_bulk_data(self, data_type='person', count=None):
+
+        # Records are built on demand; count=None streams indefinitely
+        generator = self._data_generators().get(data_type, self.generate_person_data)
+        records = iter(generator, None)
+        return records if count is None else itertools.islice(records, count)
+
+    def _data_generators(self):
+        return {
             'person': self.generate_person_data,
             'address': self.generate_address_data,
             'company': self.generate_company_data,
             'checkout': self.generate_checkout_data,
             'product': self.generate_product_data,
         }
-        
-        generator = data_generators.get(data_type, self.generate_person_data)
-        
-        return [generator() for _ in range(count)]
+
+    def _take(self, data_type):
+        key = (self.locale, data_type, self.pool_size)
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                # Filled by its own seeded generator; the worker id keeps xdist workers from handing out the same records
+                worker = os.environ.get('PYTEST_XDIST_WORKER', '')
+                source = TestDataGenerator(self.locale, seed=seed_for(f"{self.locale}:{data_type}:{worker}"))
+                pool = _pools[key] = RecordPool(source.iter_bulk_data(data_type), self.pool_size)
+        return pool.take()
     
     def get_random_user_credentials(self):
 
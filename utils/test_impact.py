@@ -0,0 +1,393 @@
+"""
+Test Impact Analysis
+"""
+
+import ast
+import json
+import os
+import subprocess
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+import logging
+
+
+class ImpactRecorder:
+    """Collects the project functions and constant names each test runs through, via sys.setprofile"""
+
+    def __init__(self, root, packages=('pages', 'utils', 'tests')):
+        self.root = str(Path(root).resolve())
+        self.prefixes = tuple(os.path.join(self.root, package) + os.sep for package in packages)
+        self._code_symbols = {}
+        self._symbols = set()
+        self._test_symbols = None
+        self._previous = None
+        self._previous_thread = None
+
+    def start(self):
+
+        self._symbols = set()
+        self._previous = sys.getprofile()
+        self._previous_thread = threading.getprofile()
+        sys.setprofile(self._profile)
+        # Threads started during the test (e.g. the local site's request handlers) are credited to it too
+        threading.setprofile(self._profile)
+
+    def stop(self):
+
+        sys.setprofile(self._previous)
+        threading.setprofile(self._previous_thread)
+        return sorted(self._symbols)
+
+    def start_shared(self):
+
+        # Setup of a session-, package-, module- or class-scoped fixture, which every later test relies on
+        self._test_symbols, self._symbols = self._symbols, set()
+
+    def stop_shared(self):
+
+        # Still credited to the running test; the files are returned so a change to them can run every test
+        shared, self._symbols = self._symbols, self._test_symbols
+        self._symbols.update(shared)
+        return sorted(symbol for symbol in shared if symbol.startswith('file:'))
+
+    def _profile(self, frame, event, arg):
+        if event != 'call':
+            return
+        # Symbols are worked out once per code object; every later call is a dict lookup
+        code = frame.f_code
+        symbols = self._code_symbols.get(code)
+        if symbols is None:
+            symbols = self._code_symbols[code] = self._symbols_for(code)
+        if symbols:
+            self._symbols.update(symbols)
+
+    def _symbols_for(self, code):
+        # The recorder's own calls (stop, start_shared) are not something the test uses
+        if not code.co_filename.startswith(self.prefixes) or code.co_filename == __file__:
+            return ()
+        path = Path(os.path.relpath(code.co_filename, self.root)).as_posix()
+        # Nested functions and lambdas count as their enclosing function, which is what a diff can see
+        qualname = getattr(code, 'co_qualname', code.co_name).split('.<locals>')[0]
+        symbols = {f"file:{path}", f"func:{path}:{qualname}"}
+        # Class-level locators are read as attributes (self.CHECKOUT_BUTTON), so they show up in co_names
+        symbols.update(f"const:{name}" for name in code.co_names if name.isupper() and len(name) > 1)
+        return tuple(symbols)
+
+
+class ImpactIndex:
+
+    VERSION = 2
+
+    def __init__(self, path='.test_impact.json'):
+        self.path = Path(path)
+        self.commit = None
+        self.recorded_at = None
+        self.tests = {}
+        # Files whose code ran while setting up fixtures shared between tests
+        self.shared = set()
+        self.logger = logging.getLogger(__name__)
+        self._load()
+
+    def update(self, records, commit, shared=()):
+
+        # Tests that did not run keep their previous entries
+        self.tests.update({nodeid: set(symbols) for nodeid, symbols in records.items()})
+        self.shared.update(shared)
+        self.commit = commit
+        self.recorded_at = datetime.now().isoformat(timespec='seconds')
+
+    def save(self):
+
+        # Symbols are stored once and tests refer to them by position
+        symbols = sorted(set().union(*self.tests.values())) if self.tests else []
+        positions = {symbol: position for position, symbol in enumerate(symbols)}
+        data = {
+            'version': self.VERSION,
+            'commit': self.commit,
+            'recorded_at': self.recorded_at,
+            'shared': sorted(self.shared),
+            'symbols': symbols,
+            'tests': {
+                nodeid: sorted(positions[symbol] for symbol in used) for nodeid, used in sorted(self.tests.items())
+            },
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = self.path.with_name(f"{self.path.name}.tmp")
+        temporary_path.write_text(json.dumps(data, separators=(',', ':')))
+        os.replace(temporary_path, self.path)
+
+    def stale_reason(self, root, max_commits_behind=50):
+
+        if not self.tests or not self.commit:
+            return f"no test impact index at {self.path}"
+        try:
+            if subprocess.run(['git', 'merge-base', '--is-ancestor', self.commit, 'HEAD'], cwd=root,
+                              capture_output=True).returncode != 0:
+                return f"index commit {self.commit[:10]} is not an ancestor of HEAD"
+            behind = int(_git(root, 'rev-list', '--count', f"{self.commit}..HEAD"))
+        except (OSError, subprocess.CalledProcessError, ValueError) as e:
+            return f"git failed: {e}"
+        if behind > max_commits_behind:
+            return f"index is {behind} commits behind HEAD"
+        return None
+
+    def _load(self):
+        try:
+            data = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable test impact index {self.path}: {e}")
+            return
+        if data.get('version') != self.VERSION:
+            return
+        symbols = data['symbols']
+        self.commit = data.get('commit')
+        self.recorded_at = data.get('recorded_at')
+        self.shared = set(data.get('shared', []))
+        self.tests = {nodeid: {symbols[position] for position in used} for nodeid, used in data['tests'].items()}
+
+
+class ImpactSelector:
+
+    # Code whose changes are narrowed down to functions and constants; tests/ changes select whole test files
+    TRACKED_PACKAGES = ('pages/', 'utils/')
+
+    def __init__(self, root, index, ignored_paths=(), shared_paths=(), max_commits_behind=50):
+        self.root = Path(root)
+        self.index = index
+        # Changes here never affect tests (docs, benchmarks); any other untracked kind of change runs everything
+        self.ignored_paths = tuple(ignored_paths)
+        # Code that runs on threads started before recording (browser pre-spawning) and is never credited to a test
+        self.shared_paths = tuple(shared_paths)
+        self.max_commits_behind = max_commits_behind
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def from_config(cls, root, config):
+
+        impact_config = config.get('test_impact', {})
+        return cls(
+            root,
+            ImpactIndex(Path(root) / impact_config.get('index_path', '.test_impact.json')),
+            ignored_paths=impact_config.get(
+                'ignored_paths', ['README.md', 'benchmarks/', '.gitignore', 'reports/', 'visual_baselines/']
+            ),
+            shared_paths=impact_config.get('shared_paths', ['utils/webdriver_manager.py', 'utils/driver_pool.py']),
+            max_commits_behind=impact_config.get('max_commits_behind', 50),
+        )
+
+    def select(self, items, ref):
+
+        # Returns (selected, deselected, reason); everything is selected when the index cannot be trusted
+        reason = self.index.stale_reason(self.root, self.max_commits_behind)
+        if reason is not None:
+            return list(items), [], f"running all tests: {reason}"
+        try:
+            changed_files = self.changed_files(ref)
+            symbols, test_files, global_change = self.changed_symbols(ref, changed_files)
+        except (OSError, subprocess.CalledProcessError) as e:
+            return list(items), [], f"running all tests: git failed: {e}"
+        if global_change is not None:
+            return list(items), [], f"running all tests: {global_change} changed"
+        symbols = self._expand_module_changes(symbols)
+
+        selected, deselected = [], []
+        for item in items:
+            used = self.index.tests.get(item.nodeid)
+            affected = (
+                used is None  # new since the index was recorded
+                or item.nodeid.split('::')[0] in test_files
+                or not used.isdisjoint(symbols)
+            )
+            (selected if affected else deselected).append(item)
+        summary = f"{len(selected)} of {len(items)} tests affected by {len(changed_files)} changed files since {ref}"
+        return selected, deselected, summary
+
+    def changed_files(self, ref):
+
+        # Committed and uncommitted changes against ref, plus files git does not track yet
+        changed = _git(self.root, 'diff', '--name-only', ref, '--').splitlines()
+        untracked = _git(self.root, 'ls-files', '--others', '--exclude-standard').splitlines()
+        return sorted(set(changed) | set(untracked))
+
+    def changed_symbols(self, ref, changed_files):
+
+        symbols, test_files = set(), set()
+        for path in changed_files:
+            if path.startswith(self.ignored_paths):
+                continue
+            if path.startswith('tests/') and path.endswith('.py') and Path(path).name.startswith('test_'):
+                test_files.add(path)
+            elif path.startswith(self.TRACKED_PACKAGES) and path.endswith('.py'):
+                if f"file:{path}" in self.index.shared or path.startswith(self.shared_paths):
+                    # Session-scoped fixtures (the local site, driver manager, pool) serve every test
+                    return symbols, test_files, f"{path} (used by shared fixtures)"
+                symbols.update(self._changed_definitions(ref, path))
+            else:
+                return symbols, test_files, path
+        return symbols, test_files, None
+
+    def _changed_definitions(self, ref, path):
+        try:
+            old = _definitions(_git(self.root, 'show', f"{ref}:{path}"))
+        except subprocess.CalledProcessError:
+            old = None  # added since ref
+        try:
+            new = _definitions((self.root / path).read_text())
+        except FileNotFoundError:
+            new = None  # deleted since ref
+        if old is None or new is None:
+            return {f"module:{path}"}
+
+        symbols, changed_constants = set(), set()
+        for key in set(old) | set(new):
+            if old.get(key) == new.get(key):
+                continue
+            kind, _, name = key.partition(':')
+            if kind == 'func':
+                symbols.add(f"func:{path}:{name}")
+            elif kind == 'const':
+                changed_constants.add(name)
+            else:
+                # Module-level code and data (e.g. PRODUCTS) is read without calling anything in the file
+                symbols.add(f"module:{path}")
+
+        # Constants built from other constants (PRIMARY_CONTAINER, READY_CONDITIONS) change with them
+        references = {key.partition(':')[2]: value[1] for key, value in new.items() if key.startswith('const:')}
+        while True:
+            dependents = {
+                name for name, names in references.items()
+                if name not in changed_constants
+                and any(f"{name.rpartition('.')[0]}.{referenced}" in changed_constants for referenced in names)
+            }
+            if not dependents:
+                break
+            changed_constants |= dependents
+        symbols.update(f"const:{name.rpartition('.')[2]}" for name in changed_constants)
+        return symbols
+
+    def _expand_module_changes(self, symbols):
+        # A module-level change affects every test that used a file importing the module, directly or not
+        changed_modules = {symbol[len('module:'):] for symbol in symbols if symbol.startswith('module:')}
+        if not changed_modules:
+            return symbols
+        importers = {}
+        for path, imported in _import_graph(self.root).items():
+            for module in imported:
+                importers.setdefault(module, set()).add(path)
+        affected, pending = set(), list(changed_modules)
+        while pending:
+            path = pending.pop()
+            if path not in affected:
+                affected.add(path)
+                pending.extend(importers.get(path, ()))
+        return (symbols - {f"module:{path}" for path in changed_modules}) | {f"file:{path}" for path in affected}
+
+
+def _definitions(source):
+    # {key: AST dump} per function, method and class-level constant (with the names it is built from); the rest of a
+    # class or module is one entry each.
+    # Line numbers are not part of the dump, so code that only moved does not count as changed.
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return None
+    definitions, module_rest = {}, []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            definitions[f"func:{node.name}"] = ast.dump(node)
+        elif isinstance(node, ast.ClassDef):
+            class_rest = []
+            for child in node.body:
+                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    definitions[f"func:{node.name}.{child.name}"] = ast.dump(child)
+                elif isinstance(child, ast.Assign) and all(
+                    isinstance(target, ast.Name) and target.id.isupper() for target in child.targets
+                ):
+                    for target in child.targets:
+                        referenced = {name.id for name in ast.walk(child.value) if isinstance(name, ast.Name)}
+                        definitions[f"const:{node.name}.{target.id}"] = (ast.dump(child.value), frozenset(referenced))
+                else:
+                    class_rest.append(ast.dump(child))
+            definitions[f"class:{node.name}"] = repr((class_rest, [ast.dump(base) for base in node.bases],
+                                                       [ast.dump(decorator) for decorator in node.decorator_list]))
+        else:
+            module_rest.append(ast.dump(node))
+    definitions['module:'] = repr(module_rest)
+    return definitions
+
+
+def _import_graph(root, packages=('pages', 'utils', 'tests')):
+    # {file: project files it imports}, including imports inside functions (fixtures and scenarios import lazily)
+    root = Path(root)
+    sources = {}
+    for package in packages:
+        for file_path in sorted((root / package).rglob('*.py')):
+            try:
+                sources[file_path.relative_to(root).as_posix()] = ast.parse(file_path.read_text())
+            except (OSError, SyntaxError, ValueError):
+                continue
+    lazy_exports = {}
+    for path, tree in sources.items():
+        if path.endswith('/__init__.py'):
+            package = path[:-len('/__init__.py')].replace('/', '.')
+            lazy_exports.update({f"{package}.{name}": module for name, module in _lazy_exports(tree).items()})
+    graph = {}
+    for path, tree in sources.items():
+        imported = {lazy_exports.get(name, name) for name in _imported_modules(tree, path)}
+        graph[path] = {module for name in imported for module in _module_paths(root, name)}
+    return graph
+
+
+def _imported_modules(tree, path):
+    package = path[:-len('.py')].split('/')[:-1]
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = package[:len(package) - node.level + 1] if node.level else []
+            module = '.'.join(base + (node.module.split('.') if node.module else []))
+            names.add(module)
+            # `from package import name` may import a submodule or a lazily exported class
+            names.update(f"{module}.{alias.name}" for alias in node.names)
+    return names
+
+
+def _lazy_exports(tree):
+    # The `_exports = {name: module}` table a package's __getattr__ imports from on first access
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id == '_exports' for target in node.targets
+        ):
+            try:
+                return ast.literal_eval(node.value)
+            except (ValueError, TypeError):
+                return {}
+    return {}
+
+
+def _module_paths(root, name):
+    # The module's file plus the packages that are imported before it
+    parts = name.split('.')
+    paths = []
+    for length in range(1, len(parts) + 1):
+        for candidate in ('/'.join(parts[:length]) + '.py', '/'.join(parts[:length]) + '/__init__.py'):
+            if (root / candidate).is_file():
+                paths.append(candidate)
+    return paths
+
+
+def _git(root, *args):
+    return subprocess.run(['git', *args], cwd=root, capture_output=True, text=True, check=True).stdout
+
+
+def head_commit(root):
+
+    try:
+        return _git(root, 'rev-parse', 'HEAD').strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
@@ -0,0 +1,224 @@
+"""
+Visual Regression
+"""
+
+import hashlib
+import time
+from collections import namedtuple
+from pathlib import Path
+import numpy as np
+from PIL import Image
+import logging
+
+
+class VisualResult(namedtuple('VisualResult', ['name', 'status', 'mismatch_ratio', 'changed_tiles',
+                                               'diff_path', 'elapsed_ms'])):
+
+    @property
+    def passed(self):
+        return self.status in ('match', 'new')
+
+
+class VisualBaselineStore:
+
+    def __init__(self, baseline_dir):
+        self.baseline_dir = Path(baseline_dir)
+
+    def image_path(self, name):
+        return self.baseline_dir / f"{name}.png"
+
+    def fingerprint_path(self, name):
+        return self.baseline_dir / f"{name}.fingerprint.npz"
+
+    def exists(self, name):
+        return self.image_path(name).exists()
+
+    def save(self, name, pixels, fingerprint):
+
+        self.baseline_dir.mkdir(parents=True, exist_ok=True)
+        Image.fromarray(pixels).save(self.image_path(name), format='PNG')
+        np.savez(self.fingerprint_path(name), **fingerprint)
+
+    def load_fingerprint(self, name):
+        # Small per-tile arrays; the baseline image itself is only decoded when a tile changed
+        path = self.fingerprint_path(name)
+        if not path.exists():
+            return None
+        with np.load(path) as data:
+            return {key: data[key] for key in data.files}
+
+    def load_pixels(self, name):
+
+        with Image.open(self.image_path(name)) as image:
+            return np.asarray(image.convert('RGB'))
+
+
+class VisualComparer:
+
+    STATS_SECTION = 'visual regression'
+
+    def __init__(self, store, diff_dir, tile_size=64, tolerance=16, max_mismatch_ratio=0.001,
+                 ignore_regions=(), phash_threshold=0, stats=None):
+        if tile_size % 8:
+            raise ValueError("tile_size must be a multiple of 8")
+        self.store = store
+        self.diff_dir = Path(diff_dir)
+        self.tile_size = tile_size
+        self.tolerance = tolerance
+        self.max_mismatch_ratio = max_mismatch_ratio
+        self.ignore_regions = [tuple(region) for region in ignore_regions]
+        # 0 (the default) pixel-diffs every tile whose checksum changed. Above 0, changed tiles whose perceptual
+        # hashes differ in fewer bits are accepted without a diff, which tolerates anti-aliasing but can hide small
+        # text changes
+        self.phash_threshold = phash_threshold
+        self.stats = stats
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def from_config(cls, config, stats=None):
+
+        visual = config.get('visual', {})
+        return cls(
+            VisualBaselineStore(visual.get('baseline_dir', 'visual_baselines')),
+            visual.get('diff_dir', 'reports/visual_diffs'),
+            tile_size=visual.get('tile_size', 64),
+            tolerance=visual.get('tolerance', 16),
+            max_mismatch_ratio=visual.get('max_mismatch_ratio', 0.001),
+            ignore_regions=visual.get('ignore_regions', []),
+            phash_threshold=visual.get('phash_threshold', 0),
+            stats=stats,
+        )
+
+    def compare(self, name, image_path, update=False, create_missing=True, ignore_regions=()):
+
+        started_at = time.perf_counter()
+        regions = self.ignore_regions + [tuple(region) for region in ignore_regions]
+        with Image.open(image_path) as image:
+            current = self._mask(np.asarray(image.convert('RGB')), regions)
+        fingerprint = self.fingerprint(current, regions)
+
+        if update or not self.store.exists(name):
+            if not update and not create_missing:
+                return self._result(name, 'missing', 0.0, 0, None, started_at)
+            self.store.save(name, current, fingerprint)
+            self.logger.info(f"Saved visual baseline: {name}")
+            return self._result(name, 'new', 0.0, 0, None, started_at)
+
+        baseline_fingerprint = self.store.load_fingerprint(name)
+        if baseline_fingerprint is None or not self._same_settings(baseline_fingerprint, fingerprint):
+            baseline_fingerprint = self.fingerprint(self._mask(self.store.load_pixels(name), regions), regions)
+
+        if tuple(baseline_fingerprint['shape']) != tuple(fingerprint['shape']):
+            return self._result(name, 'size_mismatch', 1.0, -1, None, started_at)
+
+        # Exact pre-check: tiles with an identical checksum are skipped without touching the baseline pixels
+        changed = baseline_fingerprint['checksum'] != fingerprint['checksum']
+        if not changed.any():
+            return self._result(name, 'match', 0.0, 0, None, started_at)
+        # Opt-in perceptual pre-check (phash_threshold > 0): a changed tile whose average hash and brightness barely
+        # moved is taken as a shading change and not diffed. With the default of 0 every changed tile is diffed
+        structural = changed
+        if self.phash_threshold > 0:
+            brightness_shift = np.abs(
+                baseline_fingerprint['mean'].astype(np.int16) - fingerprint['mean'].astype(np.int16)
+            )
+            structural = changed & (
+                (self._hash_distance(baseline_fingerprint['phash'], fingerprint['phash']) >= self.phash_threshold)
+                | (brightness_shift > self.tolerance)
+            )
+        self._increment('structural_tiles', int(structural.sum()))
+        self._increment('minor_tiles', int((changed & ~structural).sum()))
+        if not structural.any():
+            return self._result(name, 'match', 0.0, int(changed.sum()), None, started_at)
+
+        baseline = self._mask(self.store.load_pixels(name), regions)
+        mismatch = np.zeros(current.shape[:2], dtype=bool)
+        size = self.tile_size
+        for tile_row, tile_col in zip(*np.nonzero(structural)):
+            rows = slice(tile_row * size, (tile_row + 1) * size)
+            cols = slice(tile_col * size, (tile_col + 1) * size)
+            delta = np.abs(current[rows, cols].astype(np.int16) - baseline[rows, cols].astype(np.int16))
+            mismatch[rows, cols] = delta.max(axis=2) > self.tolerance
+
+        mismatch_ratio = float(mismatch.mean())
+        if mismatch_ratio <= self.max_mismatch_ratio:
+            return self._result(name, 'match', mismatch_ratio, int(changed.sum()), None, started_at)
+
+        diff_path = self._write_diff(name, baseline, mismatch)
+        return self._result(name, 'mismatch', mismatch_ratio, int(changed.sum()), diff_path, started_at)
+
+    def fingerprint(self, pixels, regions=()):
+
+        size = self.tile_size
+        height, width = pixels.shape[:2]
+        tiles_y, tiles_x = -(-height // size), -(-width // size)
+        padded = np.zeros((tiles_y * size, tiles_x * size, 3), dtype=np.uint8)
+        padded[:height, :width] = pixels
+
+        # Per-tile checksum: a 64-bit digest of the tile's raw pixels, so any pixel change is noticed
+        tiles = np.ascontiguousarray(padded.reshape(tiles_y, size, tiles_x, size, 3).transpose(0, 2, 1, 3, 4))
+        checksum = np.array(
+            [int.from_bytes(hashlib.blake2b(tile.data, digest_size=8).digest(), 'big')
+             for tile in tiles.reshape(tiles_y * tiles_x, -1)],
+            dtype=np.uint64
+        ).reshape(tiles_y, tiles_x)
+
+        # Per-tile average hash: 8x8 block sums of the grey tile compared with the tile mean, packed to 64 bits
+        grey = (padded[..., 0].astype(np.uint16) * 77 + padded[..., 1].astype(np.uint16) * 150 +
+                padded[..., 2].astype(np.uint16) * 29)
+        block = size // 8
+        blocks = grey.reshape(tiles_y, 8, block, tiles_x, 8, block).sum(axis=(2, 5), dtype=np.uint32)
+        blocks = blocks.transpose(0, 2, 1, 3).reshape(tiles_y, tiles_x, 64)
+        bits = blocks * 64 > blocks.sum(axis=2, keepdims=True, dtype=np.uint64)
+        phash = np.packbits(bits, axis=-1).view('>u8')[..., 0]
+        # Flat tiles hash to zero whatever their colour, so the mean grey level is kept alongside
+        mean = (blocks.sum(axis=2, dtype=np.uint64) // (size * size * 256)).astype(np.uint8)
+
+        return {
+            'shape': np.array([height, width]),
+            'tile_size': np.array(size),
+            'regions': np.array(sorted(regions), dtype=np.int64).reshape(-1, 4),
+            'checksum': checksum,
+            'phash': phash,
+            'mean': mean,
+        }
+
+    @staticmethod
+    def _hash_distance(first, second):
+        # Bits that differ between two 64-bit hashes, per tile
+        differing = np.bitwise_xor(first.astype(np.uint64), second.astype(np.uint64))
+        return np.unpackbits(differing[..., None].view(np.uint8), axis=-1).sum(axis=-1)
+
+    @staticmethod
+    def _same_settings(stored, current):
+        return ('mean' in stored and int(stored['tile_size']) == int(current['tile_size']) and
+                np.array_equal(stored['regions'], current['regions']))
+
+    @staticmethod
+    def _mask(pixels, regions):
+        if not regions:
+            return pixels
+        pixels = pixels.copy()
+        for x, y, width, height in regions:
+            pixels[y:y + height, x:x + width] = 0
+        return pixels
+
+    def _write_diff(self, name, baseline, mismatch):
+        # Dimmed baseline with mismatching pixels in red
+        diff = (baseline // 3).astype(np.uint8)
+        diff[mismatch] = (255, 0, 0)
+        self.diff_dir.mkdir(parents=True, exist_ok=True)
+        diff_path = self.diff_dir / f"{name}_diff.png"
+        Image.fromarray(diff).save(diff_path, format='PNG')
+        return str(diff_path)
+
+    def _result(self, name, status, mismatch_ratio, changed_tiles, diff_path, started_at):
+        elapsed_ms = (time.perf_counter() - started_at) * 1000
+        self._increment(status)
+        if self.stats is not None:
+            self.stats.record(self.STATS_SECTION, 'compare_ms', elapsed_ms)
+        return VisualResult(name, status, mismatch_ratio, changed_tiles, diff_path, elapsed_ms)
+
+    def _increment(self, key, amount=1):
+        if self.stats is not None:
+            self.stats.increment(self.STATS_SECTION, key, amount)
@@ -0,0 +1,39 @@
+"""
+Adaptive Wait Engine
+"""
+
+import time
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
+# The timings live in a Selenium-free module so the xdist controller can report them without importing Selenium
+from utils.wait_timings import wait_timings, ready_timings, record_wait
+
+
+class AdaptiveWait:
+
+    IGNORED_EXCEPTIONS = (NoSuchElementException, StaleElementReferenceException)
+
+    def __init__(self, driver, timeout, initial_poll=0.005, max_poll=0.25, backoff=1.6):
+        self.driver = driver
+        self.timeout = timeout
+        self.initial_poll = initial_poll
+        self.max_poll = max_poll
+        self.backoff = backoff
+
+    def until(self, condition, message=''):
+        # Same contract as WebDriverWait.until, but the poll interval starts at a few
+        # milliseconds and backs off, so fast conditions are not rounded up to a 500 ms tick
+        deadline = time.monotonic() + self.timeout
+        delay = self.initial_poll
+        while True:
+            try:
+                value = condition(self.driver)
+                if value:
+                    return value
+            except self.IGNORED_EXCEPTIONS:
+                pass
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutException(message)
+            time.sleep(min(delay, remaining))
+            delay = min(delay * self.backoff, self.max_poll)
@@ -0,0 +1,20 @@
+"""
+Wait Timings
+"""
+
+import time
+from collections import defaultdict
+
+
+# Milliseconds spent waiting, keyed by locator (or condition description); merged into the session statistics
+wait_timings = defaultdict(list)
+
+# Milliseconds until each page object's ready conditions held, keyed by page class
+ready_timings = defaultdict(list)
+
+
+def record_wait(key, started_at, timings=wait_timings):
+
+    elapsed_ms = (time.perf_counter() - started_at) * 1000
+    timings[key].append(elapsed_ms)
+    return elapsed_ms
@@ -4,21 +4,101 @@ WebDriver Manager
 
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+from selenium.common.exceptions import WebDriverException
+from concurrent.futures import ThreadPoolExecutor
+from utils.memory_watchdog import MemoryWatchdog
+import queue
+import threading
+import time
 import logging
 
 
+class SharedServiceChrome(webdriver.Remote):
+    """Chrome session attached to the worker's shared chromedriver service"""
+
+    # 'lean' when started with the lean profile (resource blocking, background subsystems off)
+    profile = 'full'
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        return self.execute("executeCdpCommand", {"cmd": cmd, "params": cmd_args})["value"]
+
+
 class WebDriverManager:
 
-    def __init__(self, config):
+    STATS_SECTION = 'driver startup'
+
+    # Intercepting by resource type (DevTools Fetch domain) needs an event stream that executeCdpCommand
+    # does not provide, so resource types are blocked through URL patterns for their usual extensions
+    RESOURCE_TYPE_PATTERNS = {
+        'image': ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico'],
+        'media': ['*.mp4', '*.webm', '*.ogg', '*.mp3', '*.wav'],
+        'font': ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot'],
+        'analytics': ['*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*segment.io*',
+                      '*hotjar.com*', '*backtrace.io*'],
+    }
+
+    # Navigation timing of the current document plus bytes transferred for it and every resource it loaded
+    PAGE_LOAD_SCRIPT = """
+        var nav = performance.getEntriesByType('navigation')[0];
+        if (!nav) { return null; }
+        var bytes = nav.transferSize || 0;
+        performance.getEntriesByType('resource').forEach(function (entry) { bytes += entry.transferSize || 0; });
+        return {
+            dom_ready_ms: nav.domContentLoadedEventEnd - nav.startTime,
+            load_ms: (nav.loadEventEnd || nav.domContentLoadedEventEnd) - nav.startTime,
+            bytes: bytes
+        };
+    """
+
+    def __init__(self, config, stats=None):
 
         self.config = config
         self.browser = config.get('browser', 'chrome').lower()
         self.headless = config.get('headless', False)
-        self.implicit_wait = config.get('implicit_wait', 10)
+        self.implicit_wait = config.get('implicit_wait', 0)
+        self.driver_path = config.get('driver_path', r'C:\chromedriver\chromedriver.exe')
+        self.stats = stats
         self.logger = logging.getLogger(__name__)
 
-    def get_chrome_options(self):
+        self.lean_config = config.get('lean_profile', {})
+        self.lean_enabled = self.lean_config.get('enabled', False)
+
+        watchdog_enabled = config.get('memory_watchdog', {}).get('enabled', False)
+        self.watchdog = MemoryWatchdog(config, stats) if watchdog_enabled else None
+        self._memory_samples = {}
+
+        # Isolated browser contexts of a shared browser, for several sessions open at once in one process
+        contexts_config = config.get('browser_contexts', {})
+        self.contexts = None
+        if contexts_config.get('enabled', False):
+            from utils.browser_contexts import BrowserContextPool
+            self.contexts = BrowserContextPool(
+                self.acquire_driver,
+                self.retire_driver,
+                contexts_per_browser=contexts_config.get('contexts_per_browser', 8),
+                max_contexts_per_browser=contexts_config.get('max_contexts_per_browser', 25),
+                recycle_check=self.recycle_reason if self.watchdog is not None else None,
+                prepare_context=self._prepare_context,
+                stats=stats,
+            )
+
+        prespawn_config = config.get('prespawn', {})
+        self.prespawn_count = prespawn_config.get('count', 2) if prespawn_config.get('enabled', False) else 0
+
+        self._service = None
+        self._service_lock = threading.Lock()
+        self._ready = queue.Queue()
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        self._executor = None
+        self._closing = False
+        self.started_at = time.perf_counter()
+        self._first_acquire_done = False
+
+    def get_chrome_options(self, lean=None):
 
+        lean = self.lean_enabled if lean is None else lean
         options = webdriver.ChromeOptions()
 
         if self.headless:
@@ -56,31 +136,211 @@ class WebDriverManager:
             'safebrowsing.enabled': False,  # Disables breach warnings
             'safebrowsing.enhanced': False,
         }
+
+        if lean:
+            # Background subsystems that compete with the page for network and CPU
+            for argument in ('--disable-background-networking', '--disable-component-update', '--disable-sync',
+                             '--disable-default-apps', '--disable-domain-reliability', '--no-first-run',
+                             '--disable-client-side-phishing-detection', '--metrics-recording-only',
+                             '--mute-audio'):
+                options.add_argument(argument)
+            if 'image' in self.lean_config.get('blocked_resource_types', []):
+                prefs['profile.managed_default_content_settings.images'] = 2
+            # 'eager' returns from get() at DOMContentLoaded; page objects wait for their own READY_CONDITIONS
+            options.page_load_strategy = self.lean_config.get('page_load_strategy', 'eager')
+
         options.add_experimental_option('prefs', prefs)
 
+        # Browser console messages are read back for failure artifacts
+        if self.config.get('failure_artifacts', {}).get('enabled', False):
+            options.set_capability('goog:loggingPrefs', {'browser': 'ALL'})
+
         options.add_experimental_option('excludeSwitches', ['enable-logging', 'enable-automation'])
         options.add_experimental_option('useAutomationExtension', False)
 
         return options
 
-    def get_driver(self):
+    def get_service(self):
 
+        # One chromedriver process per worker, shared by every browser it launches
+        with self._service_lock:
+            if self._service is None:
+                service = ChromeService(executable_path=self.driver_path)
+                service.start()
+                self._service = service
+                self.logger.info(f"ChromeDriver service started at {service.service_url}")
+            return self._service
+
+    def get_driver(self, lean=None):
+
+        lean = self.lean_enabled if lean is None else lean
         driver = None
-        driver_path = r'C:\chromedriver\chromedriver.exe'
 
         try:
             if self.browser == 'chrome':
-                service = ChromeService(executable_path=driver_path)
-                driver = webdriver.Chrome(service=service, options=self.get_chrome_options())
-                self.logger.info("Chrome WebDriver initialized")
+                executor = ChromiumRemoteConnection(
+                    remote_server_addr=self.get_service().service_url,
+                    vendor_prefix='goog',
+                    browser_name='chrome',
+                )
+                driver = SharedServiceChrome(command_executor=executor, options=self.get_chrome_options(lean))
+                if lean:
+                    self._block_resources(driver)
+                    driver.profile = 'lean'
+                self.logger.info(f"Chrome WebDriver initialized ({driver.profile} profile)")
             
             else:
                 raise ValueError(f"Unsupported browser: {self.browser}")
             
-            driver.implicitly_wait(self.implicit_wait)
+            # Implicit waits stay off (the default) unless configured; BasePage does its own adaptive waiting
+            if self.implicit_wait:
+                driver.implicitly_wait(self.implicit_wait)
             
             return driver
         
         except Exception as e:
             self.logger.error(f"Failed to initialize WebDriver: {e}")
             raise
+
+    def start_prespawn(self):
+
+        if not self.prespawn_count or self._executor is not None:
+            return
+        self._executor = ThreadPoolExecutor(max_workers=self.prespawn_count, thread_name_prefix='prespawn')
+        for _ in range(self.prespawn_count):
+            self._schedule_spawn()
+        self.logger.info(f"Pre-spawning {self.prespawn_count} browsers")
+
+    def acquire_driver(self, lean=None):
+
+        start = time.perf_counter()
+        # Pre-spawned browsers use the configured profile; asking for the other one always starts cold
+        default_profile = lean is None or lean == self.lean_enabled
+        with self._pending_lock:
+            warm = default_profile and (not self._ready.empty() or self._pending > 0)
+
+        if warm:
+            driver = self._ready.get()
+            if isinstance(driver, Exception):
+                raise driver
+        else:
+            driver = self.get_driver(lean)
+
+        acquired = time.perf_counter()
+        self._record('acquire_ms', (acquired - start) * 1000)
+        self._increment('warm_acquires' if warm else 'cold_acquires')
+        if not self._first_acquire_done:
+            self._first_acquire_done = True
+            self._record('time_to_first_test_ms', (acquired - self.started_at) * 1000)
+        return driver
+
+    def retire_driver(self, driver):
+
+        self._memory_samples.pop(id(driver), None)
+        if self.watchdog is not None:
+            self.watchdog.forget(driver)
+        try:
+            driver.quit()
+        except Exception as e:
+            self.logger.warning(f"Failed to quit WebDriver: {e}")
+        # A cold browser started with the non-default profile was never taken from the pre-spawned set
+        default_profile = 'lean' if self.lean_enabled else 'full'
+        if self._executor is not None and not self._closing and getattr(driver, 'profile', 'full') == default_profile:
+            self._schedule_spawn()
+
+    def blocked_url_patterns(self):
+
+        patterns = list(self.lean_config.get('blocked_url_patterns', []))
+        for resource_type in self.lean_config.get('blocked_resource_types', []):
+            patterns.extend(self.RESOURCE_TYPE_PATTERNS.get(resource_type.lower(), []))
+        return patterns
+
+    def record_page_load(self, driver):
+
+        # Cross-origin resources without Timing-Allow-Origin report a transfer size of 0
+        try:
+            timing = driver.execute_script(self.PAGE_LOAD_SCRIPT)
+        except WebDriverException as e:
+            self.logger.debug(f"Could not read page load timing: {e}")
+            return
+        if timing and self.stats is not None:
+            section = f"page load ({getattr(driver, 'profile', 'full')} profile)"
+            self.stats.record(section, 'dom_ready_ms', timing['dom_ready_ms'])
+            self.stats.record(section, 'load_ms', timing['load_ms'])
+            self.stats.record(section, 'transferred_kb', timing['bytes'] / 1024)
+
+    @property
+    def chromedriver_pid(self):
+        process = getattr(self._service, 'process', None)
+        return process.pid if process is not None else None
+
+    def sample_memory(self, driver):
+
+        if self.watchdog is None:
+            return None
+        sample = self.watchdog.sample(driver, self.chromedriver_pid)
+        self._memory_samples[id(driver)] = sample
+        return sample
+
+    def recycle_reason(self, driver, tests_run):
+
+        # Uses the sample taken at the end of the test when there is one
+        if self.watchdog is None:
+            return None
+        sample = self._memory_samples.get(id(driver)) or self.sample_memory(driver)
+        return self.watchdog.recycle_reason(sample)
+
+    def shutdown(self):
+
+        self._closing = True
+        if self.contexts is not None:
+            self.contexts.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        while not self._ready.empty():
+            driver = self._ready.get_nowait()
+            if not isinstance(driver, Exception):
+                driver.quit()
+        if self._service is not None:
+            self._service.stop()
+            self._service = None
+
+    def _prepare_context(self, context):
+        # Blocked URLs are set per DevTools target, so each context window needs its own; the context is only
+        # labelled lean once that is done, so page-load statistics stay per profile
+        if self.lean_enabled:
+            self._block_resources(context)
+        context.profile = 'lean' if self.lean_enabled else 'full'
+
+    def _block_resources(self, driver):
+        patterns = self.blocked_url_patterns()
+        if patterns:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+            self.logger.info(f"Blocking {len(patterns)} URL patterns")
+
+    def _schedule_spawn(self):
+        with self._pending_lock:
+            self._pending += 1
+        self._executor.submit(self._spawn)
+
+    def _spawn(self):
+        start = time.perf_counter()
+        try:
+            driver = self.get_driver()
+            self._record('spawn_ms', (time.perf_counter() - start) * 1000)
+        except Exception as e:
+            driver = e
+        # Put before decrementing so acquire_driver never sees an empty queue with nothing pending
+        self._ready.put(driver)
+        with self._pending_lock:
+            self._pending -= 1
+
+    def _record(self, key, value):
+        if self.stats is not None:
+            self.stats.record(self.STATS_SECTION, key, value)
+
+    def _increment(self, key):
+        if self.stats is not None:
+            self.stats.increment(self.STATS_SECTION, key)